@@ -0,0 +1,199 @@
+"""
+Asyncio HTTP Client for Email Sync (httpx backend)
+
+An alternative to the requests session for all archive and ingest traffic.
+A single httpx.AsyncClient runs on a private event loop thread and is
+shared by every list and content worker: one connection pool (HTTP/2 when
+the h2 package is installed), with many requests in flight on that one
+thread instead of one blocked thread per connection. Worker threads either
+submit() coroutines and collect concurrent.futures.Future objects, or
+run() a coroutine and wait for its result. Coroutines run with a copy of
+the submitting thread's context variables, so the metrics list scope
+follows them onto the loop.
+
+Requests pass through the same AdaptiveRateLimiter as the requests
+session, and each one has a deadline covering the connection, the request
+and the whole response body. Cancelling a request (or the future wrapping
+it) drops its connection and leaves no retry or rate limiter feedback
+half-applied. Timeouts and connection errors are raised as the matching
+requests.exceptions types, so callers handle both backends alike.
+"""
+
+import time
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Coroutine, Dict, Optional
+
+import requests
+
+try:
+    import httpx
+except ImportError:  # Optional dependency
+    httpx = None
+
+try:
+    import h2  # noqa: F401 - enables HTTP/2 in httpx
+except ImportError:  # Optional dependency
+    h2 = None
+
+from metrics import RunMetrics
+from rate_limiter import AdaptiveRateLimiter
+
+
+HTTPX_AVAILABLE = httpx is not None
+HTTP2_AVAILABLE = h2 is not None
+
+# Transient server errors retried with exponential backoff, like the
+# urllib3 retry strategy of the requests session
+RETRY_STATUSES = (500, 502, 503, 504)
+
+
+class AsyncHTTPClient:
+    """
+    Shared httpx.AsyncClient on its own event loop thread.
+    Safe to share between threads.
+    """
+    def __init__(
+        self,
+        rate_limiter: AdaptiveRateLimiter,
+        max_connections: int = 8,
+        timeout: float = 30.0,
+        http2: bool = True,
+        server_retries: int = 3,
+        backoff_factor: float = 0.5,
+        metrics: Optional[RunMetrics] = None
+    ):
+        if httpx is None:
+            raise ValueError(
+                "HTTP backend 'httpx' requires the httpx package"
+            )
+        
+        self.rate_limiter = rate_limiter
+        self.timeout = timeout
+        self.http2 = http2 and HTTP2_AVAILABLE
+        self.server_retries = server_retries
+        self.backoff_factor = backoff_factor
+        self.metrics = metrics
+        
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever,
+            name="async-http",
+            daemon=True
+        )
+        self._thread.start()
+        self._client = self.run(self._open_client(max_connections))
+    
+    async def _open_client(self, max_connections: int) -> "httpx.AsyncClient":
+        """Create the client on the loop it will be used from"""
+        return httpx.AsyncClient(
+            http2=self.http2,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections
+            ),
+            timeout=httpx.Timeout(self.timeout),
+            follow_redirects=True
+        )
+    
+    def submit(self, coroutine: Coroutine[Any, Any, Any]) -> Future:
+        """Schedule a coroutine on the client's loop from any thread"""
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop)
+    
+    def run(
+        self,
+        coroutine: Coroutine[Any, Any, Any],
+        timeout: Optional[float] = None
+    ) -> Any:
+        """
+        Run a coroutine on the client's loop and wait for its result.
+        If the waiting thread is interrupted, the coroutine is cancelled.
+        Must not be called from the loop thread itself.
+        """
+        future = self.submit(coroutine)
+        try:
+            return future.result(timeout)
+        except BaseException:
+            future.cancel()
+            raise
+    
+    async def request(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        data: Optional[bytes] = None,
+        deadline: Optional[float] = None
+    ) -> "httpx.Response":
+        """
+        Send one rate-limited request and read the whole response.
+        5xx responses and connection errors are retried server_retries
+        times with exponential backoff; the last 5xx response is returned.
+        Raises requests.exceptions.Timeout when a try exceeds its
+        deadline (default: the client timeout) and
+        requests.exceptions.ConnectionError once connection errors
+        have used up the retries.
+        """
+        if deadline is None:
+            deadline = self.timeout
+        
+        for attempt in range(self.server_retries + 1):
+            waited = await self.rate_limiter.acquire_async(method, url)
+            started = time.monotonic()
+            try:
+                response = await asyncio.wait_for(
+                    self._client.request(
+                        method, url, headers=headers, content=data
+                    ),
+                    deadline
+                )
+            except (asyncio.TimeoutError, httpx.TimeoutException) as e:
+                self._record_error(method, e)
+                raise requests.exceptions.Timeout(
+                    f"{method} {url} exceeded its {deadline:g}s deadline"
+                ) from e
+            except httpx.TransportError as e:
+                self._record_error(method, e)
+                if attempt < self.server_retries:
+                    await asyncio.sleep(self.backoff_factor * 2 ** attempt)
+                    continue
+                raise requests.exceptions.ConnectionError(
+                    f"{method} {url} failed: {e}"
+                ) from e
+            latency = time.monotonic() - started
+            
+            if self.metrics:
+                self.metrics.record_request(
+                    method,
+                    response.status_code,
+                    latency,
+                    len(response.content),
+                    len(data) if data else 0,
+                    waited
+                )
+            
+            # 429 responses are reported by the caller's rate limit handling
+            if response.status_code != 429 and response.status_code < 500:
+                self.rate_limiter.on_success(method, url)
+            
+            if (response.status_code in RETRY_STATUSES
+                    and attempt < self.server_retries):
+                await asyncio.sleep(self.backoff_factor * 2 ** attempt)
+                continue
+            return response
+    
+    def _record_error(self, method: str, error: Exception) -> None:
+        if self.metrics:
+            self.metrics.increment(
+                'request_errors', method=method, error=type(error).__name__
+            )
+    
+    def close(self) -> None:
+        """Close the connection pool and stop the loop thread"""
+        if self._loop.is_closed():
+            return
+        self.run(self._client.aclose())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
@@ -0,0 +1,162 @@
+"""
+Local Store for Full-Archive Backfills
+
+A backfill splits a list's archive into date-bounded shards and writes each
+shard to its own JSONL file (one transformed message per line). A manifest
+next to the shard files records the backfill's range and, per shard, its
+date range, the next offset to fetch and how many bytes of the shard file
+are complete. After an
+interruption a shard file is truncated back to its recorded size and the
+shard resumes from its next offset, so nothing is lost or written twice
+within a shard.
+"""
+
+import os
+import json
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+
+MANIFEST_FILE = "manifest.json"
+
+SHARD_PENDING = "pending"
+SHARD_DONE = "done"
+
+
+class BackfillStore:
+    """
+    Shard files and manifest of one list's backfill.
+    Safe to share between shard workers (each shard has one writer).
+    """
+    def __init__(self, folder: str):
+        self.folder = folder
+        self.manifest_path = os.path.join(folder, MANIFEST_FILE)
+        self.manifest: Optional[Dict[str, Any]] = None
+        self._lock = threading.Lock()
+        
+        os.makedirs(folder, exist_ok=True)
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                self.manifest = json.load(f)
+    
+    def shard_path(self, shard_id: int) -> str:
+        return os.path.join(self.folder, f"shard_{shard_id:05d}.jsonl")
+    
+    def plan(
+        self,
+        snapshot: Dict[str, Any],
+        shards: List[Tuple[int, Optional[datetime], Optional[datetime]]]
+    ) -> None:
+        """
+        Start a new backfill, discarding the files of an earlier one.
+        snapshot holds the run parameters (range, archive size, newest
+        email); shards are (start offset, since, until) with the dates
+        bounding the shard's emails, None meaning unbounded.
+        """
+        for name in os.listdir(self.folder):
+            if name.startswith("shard_") and name.endswith(".jsonl"):
+                os.remove(os.path.join(self.folder, name))
+        
+        now = datetime.now().isoformat()
+        self.manifest = dict(snapshot)
+        self.manifest.update({
+            "created_at": now,
+            "updated_at": now,
+            "handed_off": False,
+            "shards": [
+                {
+                    "id": shard_id,
+                    "start": start,
+                    "since": since.isoformat() if since else None,
+                    "until": until.isoformat() if until else None,
+                    "next_offset": start,
+                    "bytes": 0,
+                    "written": 0,
+                    "failed": [],
+                    "status": SHARD_PENDING
+                }
+                for shard_id, (start, since, until) in enumerate(shards)
+            ]
+        })
+        with self._lock:
+            self._save()
+    
+    def pending_shards(self) -> List[int]:
+        """Ids of the shards that still have to be crawled"""
+        with self._lock:
+            return [
+                shard["id"] for shard in self.manifest["shards"]
+                if shard["status"] != SHARD_DONE
+            ]
+    
+    def open_shard(self, shard_id: int) -> Dict[str, Any]:
+        """
+        Prepare a shard for (re)crawling: lines written after the last
+        manifest update are cut off. Returns a copy of the shard entry.
+        """
+        with self._lock:
+            shard = dict(self.manifest["shards"][shard_id])
+        with open(self.shard_path(shard_id), 'ab') as f:
+            f.truncate(shard["bytes"])
+        return shard
+    
+    def append(
+        self,
+        shard_id: int,
+        messages: List[bytes],
+        next_offset: int,
+        failed: List[str]
+    ) -> None:
+        """
+        Durably append one page worth of encoded (single-line JSON)
+        messages to a shard, then record the shard's new size, next
+        offset and failed email URLs.
+        """
+        data = b"".join(message + b"\n" for message in messages)
+        with open(self.shard_path(shard_id), 'ab') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        
+        with self._lock:
+            shard = self.manifest["shards"][shard_id]
+            shard["bytes"] += len(data)
+            shard["written"] += len(messages)
+            shard["failed"].extend(failed)
+            shard["next_offset"] = next_offset
+            self._save()
+    
+    def complete_shard(self, shard_id: int) -> None:
+        with self._lock:
+            self.manifest["shards"][shard_id]["status"] = SHARD_DONE
+            self._save()
+    
+    def mark_handed_off(self) -> None:
+        with self._lock:
+            self.manifest["handed_off"] = True
+            self._save()
+    
+    def is_complete(self) -> bool:
+        return not self.pending_shards()
+    
+    def totals(self) -> Dict[str, int]:
+        """Shard, written message and failed email counts"""
+        with self._lock:
+            shards = self.manifest["shards"]
+            return {
+                "shards": len(shards),
+                "done": sum(s["status"] == SHARD_DONE for s in shards),
+                "written": sum(s["written"] for s in shards),
+                "failed": sum(len(s["failed"]) for s in shards)
+            }
+    
+    def _save(self) -> None:
+        """Replace the manifest atomically. Must hold the lock."""
+        self.manifest["updated_at"] = datetime.now().isoformat()
+        temp_path = f"{self.manifest_path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f, ensure_ascii=False, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.manifest_path)
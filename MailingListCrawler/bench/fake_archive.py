@@ -0,0 +1,484 @@
+"""
+Fake HyperKitty Archive and Ingest API for Benchmarks
+
+Serves seeded, reproducible mailing list corpora under the same URL layout
+as lists.boost.org/archives/api: paginated emails and threads (newest
+first), email details with ETags, and the emails of a thread. An ingest
+endpoint accepts bundles (plain, gzip or zstd), counts the
+Content-Encoding of every body it decodes and records every posted
+message; a body that does not decode to bundle JSON is answered with 400.
+Latency, 429 and 5xx responses can be injected separately for archive
+reads and ingest writes, and the archive can cap the page size and reject
+large POST bodies with 413 like a real deployment.
+
+Run standalone (prints a boost_mailing_lists.json for the served lists):
+    python bench/fake_archive.py --emails 5000 --port 8080
+"""
+
+import gzip
+import json
+import random
+import base64
+import hashlib
+import argparse
+import threading
+import time
+from functools import partial
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+try:
+    import zstandard
+except ImportError:  # Optional dependency
+    zstandard = None
+
+
+API_PREFIX = "/archives/api/list/"
+INGEST_PATH = "/ingest/"
+
+WORDS = (
+    "boost library template compiler header review proposal release "
+    "asio beast container iterator allocator thread mutex future test "
+    "build cmake b2 documentation example patch issue version support "
+    "performance memory pointer function object type trait concept range"
+).split()
+
+
+class FaultProfile:
+    """Injected latency and error responses for one kind of request"""
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        rate_429: float = 0.0,
+        retry_after: float = 1.0,
+        rate_5xx: float = 0.0
+    ):
+        self.latency = latency  # Seconds added to every response
+        self.jitter = jitter  # Up to this many extra seconds
+        self.rate_429 = rate_429  # Share of requests answered with 429
+        self.retry_after = retry_after
+        self.rate_5xx = rate_5xx  # Share of requests answered with 503
+
+
+def message_id_hash(list_address: str, seed: int, index: int) -> str:
+    """HyperKitty style hash: base32 of a SHA-1, 32 characters"""
+    digest = hashlib.sha1(f"{list_address}:{seed}:{index}".encode()).digest()
+    return base64.b32encode(digest).decode()[:32]
+
+
+def build_corpus(
+    list_address: str,
+    count: int,
+    seed: int = 0,
+    start: datetime = datetime(2005, 1, 1, tzinfo=timezone.utc)
+) -> List[Dict[str, Any]]:
+    """
+    Generate count emails (oldest first) for a list. The same arguments
+    always produce the same corpus. Threads, senders, gaps between posts
+    and body lengths are randomized.
+    """
+    rng = random.Random(f"{list_address}:{seed}")
+    senders = [
+        (f"Developer {number}", f"dev{number}@example.org")
+        for number in range(max(5, count // 40))
+    ]
+    open_threads: List[Tuple[str, str]] = []  # (thread id, subject)
+    date = start
+    emails = []
+    
+    for index in range(count):
+        date += timedelta(seconds=rng.expovariate(1 / 3600))
+        
+        if not open_threads or rng.random() < 0.3:
+            subject = " ".join(rng.choices(WORDS, k=rng.randint(3, 8)))
+            thread = (f"T{seed}x{index}", subject)
+            open_threads = (open_threads + [thread])[-20:]
+            prefix = ""
+        else:
+            thread = rng.choice(open_threads)
+            prefix = "Re: "
+        
+        sender_name, sender_address = rng.choice(senders)
+        words = int(rng.lognormvariate(4.5, 0.8)) + 5
+        emails.append({
+            "message_id_hash": message_id_hash(list_address, seed, index),
+            "message_id": f"{index}.{seed}@{list_address}",
+            "thread_id": thread[0],
+            "subject": f"{prefix}{thread[1]}",
+            "date": date.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "sender_name": sender_name,
+            "sender": {"address": sender_address},
+            "content": " ".join(rng.choices(WORDS, k=words)),
+        })
+    return emails
+
+
+class ArchiveList:
+    """Indexes of one served list"""
+    def __init__(self, address: str, emails: List[Dict[str, Any]]):
+        self.address = address
+        self.newest_first = list(reversed(emails))
+        self.by_hash = {email["message_id_hash"]: email for email in emails}
+        
+        self.thread_emails: Dict[str, List[Dict[str, Any]]] = {}
+        for email in emails:
+            self.thread_emails.setdefault(email["thread_id"], []).append(
+                email
+            )
+        self.threads = sorted(
+            self.thread_emails,
+            key=lambda thread_id: self.thread_emails[thread_id][-1]["date"],
+            reverse=True
+        )
+
+
+class FakeArchive:
+    """
+    HTTP server with the archive and ingest endpoints.
+    start() serves on a background thread; stats and posted hashes are
+    kept for the benchmark to check.
+    """
+    def __init__(
+        self,
+        corpora: Dict[str, List[Dict[str, Any]]],
+        archive_faults: Optional[FaultProfile] = None,
+        ingest_faults: Optional[FaultProfile] = None,
+        max_page_size: Optional[int] = None,
+        max_body_bytes: Optional[int] = None,
+        seed: int = 0,
+        host: str = "127.0.0.1",
+        port: int = 0
+    ):
+        self.lists = {
+            address: ArchiveList(address, emails)
+            for address, emails in corpora.items()
+        }
+        self.archive_faults = archive_faults or FaultProfile()
+        self.ingest_faults = ingest_faults or FaultProfile()
+        self.max_page_size = max_page_size
+        self.max_body_bytes = max_body_bytes
+        self.posted: List[str] = []
+        self.stats: Dict[str, int] = {}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), ArchiveHandler)
+        self._server.daemon_threads = True
+        self._server.archive = self
+        self._thread: Optional[threading.Thread] = None
+    
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+    
+    @property
+    def ingest_url(self) -> str:
+        return f"{self.base_url}{INGEST_PATH}"
+    
+    def list_url(self, address: str) -> str:
+        return f"{self.base_url}{API_PREFIX}{address}/"
+    
+    def list_info(self, address: str) -> Dict[str, Any]:
+        """Entry for boost_mailing_lists.json"""
+        display_name = address.split("@")[0].capitalize()
+        return {
+            "url": self.list_url(address),
+            "name": address,
+            "display_name": display_name,
+            "threads": f"{self.list_url(address)}threads/",
+            "emails": f"{self.list_url(address)}emails/",
+        }
+    
+    def start(self) -> "FakeArchive":
+        self._thread = threading.Thread(
+            target=self._server.serve_forever,
+            name="fake-archive",
+            daemon=True
+        )
+        self._thread.start()
+        return self
+    
+    def serve_forever(self) -> None:
+        """Serve on the calling thread until interrupted"""
+        self._server.serve_forever()
+    
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+    
+    def count(self, name: str, value: int = 1) -> None:
+        with self._lock:
+            self.stats[name] = self.stats.get(name, 0) + value
+    
+    def inject_fault(self, faults: FaultProfile) -> Optional[int]:
+        """Sleep for the configured latency and pick an error status"""
+        with self._lock:
+            delay = faults.latency + self._rng.random() * faults.jitter
+            roll = self._rng.random()
+        if delay > 0:
+            time.sleep(delay)
+        if roll < faults.rate_429:
+            return 429
+        if roll < faults.rate_429 + faults.rate_5xx:
+            return 503
+        return None
+    
+    def record_posted(self, hashes: List[str]) -> None:
+        with self._lock:
+            self.posted.extend(hashes)
+
+
+class ArchiveHandler(BaseHTTPRequestHandler):
+    """Routes requests to the FakeArchive the server belongs to"""
+    protocol_version = "HTTP/1.1"
+    
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+    
+    @property
+    def archive(self) -> FakeArchive:
+        return self.server.archive
+    
+    def send_json(
+        self,
+        status: int,
+        data: Any,
+        headers: Optional[Dict[str, str]] = None
+    ) -> None:
+        body = json.dumps(data).encode("utf-8") if data is not None else b""
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def send_fault(self, status: int, faults: FaultProfile) -> None:
+        self.archive.count(f"served_{status}")
+        headers = {}
+        if status == 429:
+            headers["Retry-After"] = f"{faults.retry_after:g}"
+        self.send_json(status, {"detail": "injected"}, headers)
+    
+    def do_GET(self) -> None:
+        archive = self.archive
+        archive.count("archive_requests")
+        status = archive.inject_fault(archive.archive_faults)
+        if status:
+            self.send_fault(status, archive.archive_faults)
+            return
+        
+        url = urlsplit(self.path)
+        query = parse_qs(url.query)
+        parts = url.path[len(API_PREFIX):].strip("/").split("/")
+        served = None
+        if url.path.startswith(API_PREFIX):
+            served = archive.lists.get(parts[0])
+        if served is None:
+            self.send_json(404, {"detail": "Not found."})
+            return
+        
+        list_url = archive.list_url(served.address)
+        route = parts[1:]
+        if route == ["emails"]:
+            self.send_page(
+                served.newest_first,
+                query,
+                partial(self.email_summary, list_url)
+            )
+        elif route == ["threads"]:
+            self.send_page(
+                served.threads,
+                query,
+                partial(self.thread_summary, list_url, served)
+            )
+        elif len(route) == 2 and route[0] == "email":
+            self.send_email(list_url, served.by_hash.get(route[1]))
+        elif (len(route) == 3 and route[0] == "thread"
+              and route[2] == "emails"
+              and route[1] in served.thread_emails):
+            self.send_page(
+                served.thread_emails[route[1]],
+                query,
+                partial(self.email_summary, list_url)
+            )
+        else:
+            self.send_json(404, {"detail": "Not found."})
+    
+    def send_email(
+        self,
+        list_url: str,
+        email: Optional[Dict[str, Any]]
+    ) -> None:
+        """Answer an email detail request, honoring If-None-Match"""
+        if email is None:
+            self.send_json(404, {"detail": "Not found."})
+            return
+        
+        etag = f'"{email["message_id_hash"]}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.archive.count("served_304")
+            self.send_json(304, None, {"ETag": etag})
+            return
+        
+        detail = self.email_summary(list_url, email)
+        detail.update({
+            "message_id": email["message_id"],
+            "sender": email["sender"],
+            "content": email["content"],
+            "attachments": [],
+        })
+        self.send_json(200, detail, {"ETag": etag})
+    
+    def send_page(
+        self,
+        items: List[Any],
+        query: Dict[str, List[str]],
+        render: Callable[[Any], Dict[str, Any]]
+    ) -> None:
+        """Answer a limit/offset paginated listing"""
+        limit = int(query.get("limit", ["10"])[0])
+        if self.archive.max_page_size:
+            limit = min(limit, self.archive.max_page_size)
+        offset = int(query.get("offset", ["0"])[0])
+        page = items[offset:offset + limit]
+        base = f"{self.archive.base_url}{urlsplit(self.path).path}"
+        self.send_json(200, {
+            "count": len(items),
+            "next": (
+                f"{base}?limit={limit}&offset={offset + limit}"
+                if offset + limit < len(items) else None
+            ),
+            "previous": (
+                f"{base}?limit={limit}&offset={max(0, offset - limit)}"
+                if offset > 0 else None
+            ),
+            "results": [render(item) for item in page],
+        })
+    
+    def email_summary(
+        self,
+        list_url: str,
+        email: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        return {
+            "url": f"{list_url}email/{email['message_id_hash']}/",
+            "mailinglist": list_url,
+            "message_id_hash": email["message_id_hash"],
+            "thread": f"{list_url}thread/{email['thread_id']}/",
+            "sender_name": email["sender_name"],
+            "subject": email["subject"],
+            "date": email["date"],
+        }
+    
+    def thread_summary(
+        self,
+        list_url: str,
+        served: ArchiveList,
+        thread_id: str
+    ) -> Dict[str, Any]:
+        emails = served.thread_emails[thread_id]
+        return {
+            "url": f"{list_url}thread/{thread_id}/",
+            "mailinglist": list_url,
+            "thread_id": thread_id,
+            "subject": emails[0]["subject"],
+            "date_active": emails[-1]["date"],
+            "replies_count": len(emails) - 1,
+            "emails": f"{list_url}thread/{thread_id}/emails/",
+        }
+    
+    def do_POST(self) -> None:
+        archive = self.archive
+        archive.count("ingest_requests")
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        status = archive.inject_fault(archive.ingest_faults)
+        if status:
+            self.send_fault(status, archive.ingest_faults)
+            return
+        
+        if urlsplit(self.path).path != INGEST_PATH:
+            self.send_json(404, {"detail": "Not found."})
+            return
+        if archive.max_body_bytes and len(body) > archive.max_body_bytes:
+            archive.count("served_413")
+            self.send_json(413, {"detail": "Payload too large."})
+            return
+        
+        encoding = self.headers.get("Content-Encoding")
+        if encoding and encoding not in ("gzip", "zstd"):
+            self.send_json(415, {"detail": f"Unsupported {encoding}."})
+            return
+        if encoding == "zstd" and zstandard is None:
+            self.send_json(415, {"detail": "zstd needs zstandard."})
+            return
+        
+        try:
+            if encoding == "gzip":
+                body = gzip.decompress(body)
+            elif encoding == "zstd":
+                body = zstandard.ZstdDecompressor().decompressobj().decompress(
+                    body
+                )
+            messages = json.loads(body)["messages"]
+        except Exception:
+            archive.count("served_400")
+            self.send_json(400, {"detail": "Undecodable body."})
+            return
+        
+        archive.count(f"ingest_encoding_{encoding or 'identity'}")
+        archive.record_posted(
+            [message.get("message_id_hash", "") for message in messages]
+        )
+        archive.count("ingest_bytes", len(body))
+        self.send_json(200, {"received": len(messages)})
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Serve a fake mailing list archive and ingest API"
+    )
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--lists", nargs="+",
+                        default=["boost@lists.boost.org"])
+    parser.add_argument("--emails", type=int, default=5000,
+                        help="emails per list")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="seconds added to archive responses")
+    parser.add_argument("--rate-429", type=float, default=0.0)
+    parser.add_argument("--rate-5xx", type=float, default=0.0)
+    parser.add_argument("--max-page-size", type=int)
+    args = parser.parse_args()
+    
+    archive = FakeArchive(
+        {
+            address: build_corpus(address, args.emails, args.seed)
+            for address in args.lists
+        },
+        archive_faults=FaultProfile(
+            latency=args.latency,
+            rate_429=args.rate_429,
+            rate_5xx=args.rate_5xx
+        ),
+        max_page_size=args.max_page_size,
+        seed=args.seed,
+        port=args.port
+    )
+    print(json.dumps(
+        {"lists": [archive.list_info(address) for address in args.lists]},
+        indent=2
+    ))
+    print(f"Ingest endpoint: {archive.ingest_url}")
+    try:
+        archive.serve_forever()
+    except KeyboardInterrupt:
+        print(json.dumps(archive.stats, indent=2))
+
+
+if __name__ == "__main__":
+    main()
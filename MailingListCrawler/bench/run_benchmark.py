@@ -0,0 +1,367 @@
+"""
+Benchmark Runner for the Email Sync Crawler
+
+Runs process_single_list against the local fake archive (fake_archive.py)
+for a set of scenarios and reports end-to-end throughput, request counts
+and whether every message reached the ingest API exactly once. Each run
+gets a fresh working directory with the repository's config.json plus the
+benchmark and scenario overrides, so runs are independent and reproducible
+(corpora are seeded) and never touch lists.boost.org.
+
+Usage:
+    python bench/run_benchmark.py                          # all scenarios
+    python bench/run_benchmark.py --scenario baseline --emails 2000
+    python bench/run_benchmark.py --repeat 3 --output results.json
+    python bench/run_benchmark.py --scenarios-file my_scenarios.json
+
+A scenarios file maps names to objects with the keys of SCENARIOS below:
+"config" (config.json sections to override), "archive" and "ingest"
+(FaultProfile arguments), "max_page_size", "max_body_bytes" and
+"content_encoding" (the Content-Encoding every compressed POST must carry;
+bodies below the compression threshold are sent plain).
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import logging
+import argparse
+import tempfile
+import statistics
+from typing import Any, Dict, List
+
+from fake_archive import FakeArchive, FaultProfile, build_corpus
+
+CRAWLER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, CRAWLER_DIR)
+
+import email_sync  # noqa: E402
+from payload_encoding import zstandard  # noqa: E402
+from dedup_index import DedupIndex  # noqa: E402
+
+
+LIST_ADDRESS = "boost@lists.boost.org"
+
+# Applied to config.json before each scenario: no client-side pacing (the
+# fake archive is local) and no response cache carried between runs
+BENCHMARK_CONFIG = {
+    "rate_limit": {
+        "archive": {"rate": 0, "min_rate": 0, "max_rate": 0},
+        "ingest": {"rate": 0, "min_rate": 0, "max_rate": 0}
+    },
+    "http_cache": {"enabled": False}
+}
+
+SCENARIOS: Dict[str, Dict[str, Any]] = {
+    "baseline": {
+        "description": "Fast archive and ingest, no faults"
+    },
+    "archive_latency": {
+        "description": "50 ms (+ up to 20 ms) per archive request",
+        "archive": {"latency": 0.05, "jitter": 0.02}
+    },
+    "rate_limited": {
+        "description": "2% of archive requests answered with 429",
+        "archive": {"rate_429": 0.02, "retry_after": 0.2}
+    },
+    "server_errors": {
+        "description": "2% of archive and ingest requests answered with 503",
+        "archive": {"rate_5xx": 0.02},
+        "ingest": {"rate_5xx": 0.02}
+    },
+    "slow_ingest": {
+        "description": "300 ms per ingest POST",
+        "ingest": {"latency": 0.3}
+    },
+    "small_pages": {
+        "description": "Archive caps pages at 25 results",
+        "max_page_size": 25
+    },
+    "body_limit": {
+        "description": "Ingest rejects bodies over 64 KiB with 413",
+        "max_body_bytes": 64 * 1024
+    },
+    "gzip": {
+        "description": "Baseline with gzip-compressed POST bodies",
+        "config": {"post_encoding": {"compression": "gzip"}},
+        "content_encoding": "gzip"
+    },
+    "zstd": {
+        "description": "Baseline with zstd-compressed POST bodies",
+        "config": {"post_encoding": {"compression": "zstd"}},
+        "content_encoding": "zstd"
+    },
+    "threads_mode": {
+        "description": "Baseline synced through the threads endpoint",
+        "config": {"collection": {"sync_mode": "threads"}}
+    },
+    "httpx": {
+        "description": "Baseline over the asyncio httpx backend",
+        "config": {"collection": {"http_backend": "httpx"}}
+    }
+}
+
+
+def merge_config(
+    config: Dict[str, Any],
+    overrides: Dict[str, Any]
+) -> None:
+    """Merge overrides into config section by section (in place)"""
+    for section, values in overrides.items():
+        if isinstance(values, dict):
+            merge_config(config.setdefault(section, {}), values)
+        else:
+            config[section] = values
+
+
+def write_run_config(
+    workdir: str,
+    archive: FakeArchive,
+    scenario: Dict[str, Any]
+) -> str:
+    """Write config.json, pull.json and the lists file for one run"""
+    with open(os.path.join(CRAWLER_DIR, "config.json"), encoding="utf-8") as f:
+        config = json.load(f)
+    
+    merge_config(config, BENCHMARK_CONFIG)
+    merge_config(config, scenario.get("config", {}))
+    config["api_settings"]["endpoint"] = archive.ingest_url
+    config["file_paths"].update({
+        "pull_file": os.path.join(workdir, "pull.json"),
+        "lists_file": os.path.join(workdir, "boost_mailing_lists.json"),
+        "cache_folder": os.path.join(workdir, "cache"),
+        "log_file": os.path.join(workdir, "email_sync.log"),
+        "checkpoint_file": os.path.join(workdir, "checkpoint.json"),
+        "thread_cursor_file": os.path.join(workdir, "thread_cursor.json")
+    })
+    merge_config(config, {
+        "dedup": {"path": os.path.join(workdir, "dedup_index.sqlite3")},
+        "metrics": {"summary_file": "", "prometheus_file": ""}
+    })
+    
+    files = {
+        "config.json": config,
+        "pull.json": {},
+        "boost_mailing_lists.json": {
+            "lists": [archive.list_info(LIST_ADDRESS)]
+        }
+    }
+    for name, data in files.items():
+        with open(os.path.join(workdir, name), "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+    return os.path.join(workdir, "config.json")
+
+
+def run_once(
+    name: str,
+    scenario: Dict[str, Any],
+    emails: int,
+    seed: int,
+    keep: bool
+) -> Dict[str, Any]:
+    """Sync one freshly generated list against a fresh fake archive"""
+    corpus = build_corpus(LIST_ADDRESS, emails, seed)
+    archive = FakeArchive(
+        {LIST_ADDRESS: corpus},
+        archive_faults=FaultProfile(**scenario.get("archive", {})),
+        ingest_faults=FaultProfile(**scenario.get("ingest", {})),
+        max_page_size=scenario.get("max_page_size"),
+        max_body_bytes=scenario.get("max_body_bytes"),
+        seed=seed
+    ).start()
+    workdir = tempfile.mkdtemp(prefix=f"email_sync_bench_{name}_")
+    session = None
+    dedup_index = None
+    
+    try:
+        email_sync.Config.load_from_file(
+            write_run_config(workdir, archive, scenario)
+        )
+        logger = email_sync.setup_logging()
+        for handler in logger.handlers:
+            if not isinstance(handler, logging.FileHandler):
+                handler.setLevel(logging.WARNING)
+        
+        session = email_sync.create_http_session()
+        if email_sync.Config.DEDUP_ENABLED:
+            dedup_index = DedupIndex(email_sync.Config.DEDUP_INDEX_FILE)
+        list_info = archive.list_info(LIST_ADDRESS)
+        
+        started = time.perf_counter()
+        with session.metrics.list_scope(list_info["display_name"]):
+            result = email_sync.process_single_list(
+                list_info,
+                {},
+                email_sync.Config.API_ENDPOINT,
+                dedup_index,
+                session,
+                logger
+            )
+        elapsed = time.perf_counter() - started
+        
+        expected = {email["message_id_hash"] for email in corpus}
+        posted = set(archive.posted)
+        counters = session.metrics.summary()["totals"]["counters"]
+        encodings = {
+            key[len("ingest_encoding_"):]: value
+            for key, value in archive.stats.items()
+            if key.startswith("ingest_encoding_")
+        }
+        content_encoding = scenario.get("content_encoding")
+        return {
+            "scenario": name,
+            "success": result.success,
+            # Every body decoded, and compressed ones used the expected
+            # Content-Encoding
+            "encoding_ok": (
+                not archive.stats.get("served_400")
+                and (content_encoding is None
+                     or (content_encoding in encodings
+                         and set(encodings) <= {content_encoding, "identity"}))
+            ),
+            "content_encodings": encodings,
+            "elapsed_seconds": round(elapsed, 3),
+            "messages_per_second": round(len(posted) / elapsed, 1),
+            "posted": len(posted & expected),
+            "missing": len(expected - posted),
+            "duplicates": len(archive.posted) - len(posted),
+            "archive_requests": archive.stats.get("archive_requests", 0),
+            "ingest_requests": archive.stats.get("ingest_requests", 0),
+            "served": {
+                key[len("served_"):]: value
+                for key, value in archive.stats.items()
+                if key.startswith("served_")
+            },
+            "metrics": counters,
+            "workdir": workdir if keep else None
+        }
+    finally:
+        if session:
+            session.close()
+        if dedup_index:
+            dedup_index.close()
+        archive.stop()
+        logging.getLogger("EmailSync").handlers.clear()
+        if not keep:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+
+def summarize(runs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Median throughput and worst-case correctness over repeated runs"""
+    return {
+        "runs": len(runs),
+        "all_succeeded": all(
+            run["success"] and run["encoding_ok"] for run in runs
+        ),
+        "median_seconds": statistics.median(
+            run["elapsed_seconds"] for run in runs
+        ),
+        "median_messages_per_second": statistics.median(
+            run["messages_per_second"] for run in runs
+        ),
+        "max_missing": max(run["missing"] for run in runs),
+        "max_duplicates": max(run["duplicates"] for run in runs),
+        "median_archive_requests": statistics.median(
+            run["archive_requests"] for run in runs
+        ),
+        "median_ingest_requests": statistics.median(
+            run["ingest_requests"] for run in runs
+        )
+    }
+
+
+def print_table(results: Dict[str, Dict[str, Any]]) -> None:
+    header = (
+        f"{'scenario':<16} {'ok':<4} {'seconds':>8} {'msg/s':>8} "
+        f"{'GETs':>6} {'POSTs':>6} {'missing':>8} {'dups':>5}"
+    )
+    print(header)
+    print("-" * len(header))
+    for name, result in results.items():
+        summary = result["summary"]
+        print(
+            f"{name:<16} {'yes' if summary['all_succeeded'] else 'NO':<4} "
+            f"{summary['median_seconds']:>8.2f} "
+            f"{summary['median_messages_per_second']:>8.1f} "
+            f"{summary['median_archive_requests']:>6.0f} "
+            f"{summary['median_ingest_requests']:>6.0f} "
+            f"{summary['max_missing']:>8} {summary['max_duplicates']:>5}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmark email_sync against a local fake archive"
+    )
+    parser.add_argument(
+        "--scenario", action="append",
+        help="scenario to run (repeatable, default: all)"
+    )
+    parser.add_argument("--scenarios-file",
+                        help="JSON file with additional scenarios")
+    parser.add_argument("--emails", type=int, default=1000,
+                        help="emails in the generated list")
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write results as JSON")
+    parser.add_argument("--keep", action="store_true",
+                        help="keep working directories (logs, spool)")
+    args = parser.parse_args()
+    
+    scenarios = dict(SCENARIOS)
+    if args.scenarios_file:
+        with open(args.scenarios_file, encoding="utf-8") as f:
+            scenarios.update(json.load(f))
+    
+    names = args.scenario or list(scenarios)
+    unknown = [name for name in names if name not in scenarios]
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(unknown)}")
+    
+    results = {}
+    for name in names:
+        scenario = scenarios[name]
+        backend = scenario.get("config", {}).get("collection", {}).get(
+            "http_backend"
+        )
+        if backend == "httpx" and not email_sync.HTTPX_AVAILABLE:
+            print(f"Skipping {name}: httpx is not installed")
+            continue
+        compression = scenario.get("config", {}).get(
+            "post_encoding", {}
+        ).get("compression")
+        if compression == "zstd" and zstandard is None:
+            print(f"Skipping {name}: zstandard is not installed")
+            continue
+        print(f"Running {name}: {scenario.get('description', '')}")
+        runs = [
+            run_once(name, scenario, args.emails, args.seed, args.keep)
+            for _ in range(args.repeat)
+        ]
+        results[name] = {
+            "description": scenario.get("description", ""),
+            "summary": summarize(runs),
+            "runs": runs
+        }
+    
+    print()
+    print_table(results)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "emails": args.emails,
+                    "seed": args.seed,
+                    "repeat": args.repeat,
+                    "scenarios": results
+                },
+                f,
+                indent=2
+            )
+        print(f"\nResults written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
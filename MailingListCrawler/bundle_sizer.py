@@ -0,0 +1,113 @@
+"""
+Adaptive Bundle Sizing for Ingest POSTs
+
+Bundles are closed when they reach a target payload size or a target
+message count, whichever comes first. Both targets grow while the ingest
+API answers quickly and shrink when it slows down, times out or rejects a
+request as too large (413), so large threads are split into smaller POSTs
+and short notices are packed into fewer requests.
+"""
+
+import logging
+import threading
+
+
+logger = logging.getLogger("EmailSync.BundleSizer")
+
+
+class BundleSizer:
+    """Thread-safe byte/count targets adjusted from POST feedback"""
+    def __init__(
+        self,
+        target_bytes: int,
+        min_bytes: int,
+        max_bytes: int,
+        target_count: int,
+        max_count: int,
+        target_latency: float,
+        grow_factor: float = 1.25,
+        shrink_factor: float = 0.75
+    ):
+        self.min_bytes = min_bytes
+        self.max_bytes = max_bytes
+        self.max_count = max_count
+        self.target_latency = target_latency
+        self.grow_factor = grow_factor
+        self.shrink_factor = shrink_factor
+        self.target_bytes = self._clamp_bytes(target_bytes)
+        self.target_count = self._clamp_count(target_count)
+        self._lock = threading.Lock()
+    
+    def _clamp_bytes(self, value: float) -> int:
+        return int(min(self.max_bytes, max(self.min_bytes, value)))
+    
+    def _clamp_count(self, value: float) -> int:
+        return int(min(self.max_count, max(1, value)))
+    
+    def is_full(self, count: int, size_bytes: int) -> bool:
+        """Whether a bundle of this many messages and bytes should be sent"""
+        with self._lock:
+            return (count >= self.target_count
+                    or size_bytes >= self.target_bytes)
+    
+    def on_success(self, count: int, size_bytes: int, latency: float) -> None:
+        """
+        Feed back a successful POST.
+        A fast response grows whichever target closed the bundle; a
+        response slower than target_latency shrinks both.
+        """
+        with self._lock:
+            old = (self.target_bytes, self.target_count)
+            
+            if latency > self.target_latency:
+                self.target_bytes = self._clamp_bytes(
+                    min(self.target_bytes, size_bytes) * self.shrink_factor
+                )
+                self.target_count = self._clamp_count(
+                    min(self.target_count, count) * self.shrink_factor
+                )
+            elif latency < self.target_latency / 2:
+                if count >= self.target_count:
+                    self.target_count = self._clamp_count(
+                        self.target_count + 1
+                    )
+                if size_bytes >= self.target_bytes * self.shrink_factor:
+                    self.target_bytes = self._clamp_bytes(
+                        self.target_bytes * self.grow_factor
+                    )
+            
+            new = (self.target_bytes, self.target_count)
+        
+        if new != old:
+            logger.info(
+                f"Bundle target after {latency:.2f}s POST: "
+                f"{old[0]} -> {new[0]} bytes, "
+                f"{old[1]} -> {new[1]} messages"
+            )
+    
+    def on_too_large(self, count: int, size_bytes: int, reason: str) -> None:
+        """
+        Halve the targets after a 413 or timeout for this bundle.
+        A 413 also caps max_bytes below the rejected size, since it
+        reflects a server limit rather than load.
+        """
+        with self._lock:
+            old = (self.target_bytes, self.target_count)
+            if reason == "413":
+                self.max_bytes = max(
+                    self.min_bytes, min(self.max_bytes, size_bytes - 1)
+                )
+            self.target_bytes = self._clamp_bytes(
+                min(self.target_bytes, size_bytes) / 2
+            )
+            self.target_count = self._clamp_count(
+                min(self.target_count, count) // 2
+            )
+            new = (self.target_bytes, self.target_count)
+        
+        logger.warning(
+            f"Bundle target after {reason} "
+            f"({count} messages, {size_bytes} bytes): "
+            f"{old[0]} -> {new[0]} bytes, "
+            f"{old[1]} -> {new[1]} messages"
+        )
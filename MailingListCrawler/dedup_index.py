@@ -0,0 +1,172 @@
+"""
+Index of Already-Ingested Messages
+
+Every message_id_hash that has been posted (or spooled) is stored per list
+in a SQLite table, which is the exact record. An in-memory Bloom filter is
+built from it per list, so the common "never seen" answer costs no disk
+access; only possible hits are confirmed against the table. Collection uses
+the index to skip known messages and to stop scanning after a run of them
+when the pull.json cursor has been lost.
+"""
+
+import math
+import sqlite3
+import hashlib
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, Iterable
+
+
+logger = logging.getLogger("EmailSync.DedupIndex")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS seen (
+    list_name TEXT NOT NULL,
+    message_id_hash TEXT NOT NULL,
+    added_at TEXT NOT NULL,
+    PRIMARY KEY (list_name, message_id_hash)
+) WITHOUT ROWID;
+"""
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings using double hashing"""
+    def __init__(self, capacity: int, false_positive_rate: float):
+        self.capacity = max(1, capacity)
+        self.false_positive_rate = false_positive_rate
+        self.size = max(8, int(math.ceil(
+            -self.capacity * math.log(false_positive_rate)
+            / (math.log(2) ** 2)
+        )))
+        self.hash_count = max(
+            1, round(self.size / self.capacity * math.log(2))
+        )
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+    
+    def _positions(self, value: str) -> Iterable[int]:
+        digest = hashlib.blake2b(
+            value.encode('utf-8'), digest_size=16
+        ).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        for i in range(self.hash_count):
+            yield (h1 + i * h2) % self.size
+    
+    def add(self, value: str) -> None:
+        for position in self._positions(value):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+    
+    def __contains__(self, value: str) -> bool:
+        return all(
+            self.bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(value)
+        )
+
+
+class DedupIndex:
+    """
+    Per-list set of ingested message hashes with a Bloom filter in front.
+    Safe to share between threads.
+    """
+    def __init__(
+        self,
+        path: str,
+        expected_items: int = 100000,
+        false_positive_rate: float = 0.001
+    ):
+        self.path = path
+        self.expected_items = expected_items
+        self.false_positive_rate = false_positive_rate
+        self.lookups = 0
+        self.bloom_negatives = 0
+        self._filters: Dict[str, BloomFilter] = {}
+        self._lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.executescript(SCHEMA)
+    
+    def __enter__(self) -> "DedupIndex":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+    
+    def close(self) -> None:
+        """Close the underlying database connection"""
+        with self._lock:
+            self.connection.close()
+    
+    def _filter(self, list_name: str) -> BloomFilter:
+        """
+        Return the list's Bloom filter, (re)building it from the table
+        when missing or when it has outgrown its capacity.
+        Must be called with the lock held.
+        """
+        bloom = self._filters.get(list_name)
+        if bloom is not None and bloom.count <= bloom.capacity:
+            return bloom
+        
+        known = self.connection.execute(
+            "SELECT COUNT(*) FROM seen WHERE list_name = ?",
+            (list_name,)
+        ).fetchone()[0]
+        bloom = BloomFilter(
+            max(self.expected_items, known * 2),
+            self.false_positive_rate
+        )
+        for (message_id_hash,) in self.connection.execute(
+            "SELECT message_id_hash FROM seen WHERE list_name = ?",
+            (list_name,)
+        ):
+            bloom.add(message_id_hash)
+        
+        logger.info(
+            f"Loaded {known} known message hashes for {list_name} "
+            f"({len(bloom.bits) // 1024} KiB filter)"
+        )
+        self._filters[list_name] = bloom
+        return bloom
+    
+    def contains(self, list_name: str, message_id_hash: str) -> bool:
+        """Whether the message has already been ingested for the list"""
+        with self._lock:
+            self.lookups += 1
+            if message_id_hash not in self._filter(list_name):
+                self.bloom_negatives += 1
+                return False
+            row = self.connection.execute(
+                "SELECT 1 FROM seen "
+                "WHERE list_name = ? AND message_id_hash = ?",
+                (list_name, message_id_hash)
+            ).fetchone()
+            return row is not None
+    
+    def add_many(self, list_name: str, hashes: Iterable[str]) -> None:
+        """Durably record ingested messages in one transaction"""
+        now = datetime.now().isoformat()
+        hashes = [value for value in hashes if value]
+        with self._lock:
+            bloom = self._filter(list_name)
+            with self.connection:
+                self.connection.executemany(
+                    "INSERT OR IGNORE INTO seen "
+                    "(list_name, message_id_hash, added_at) VALUES (?, ?, ?)",
+                    [(list_name, value, now) for value in hashes]
+                )
+            for value in hashes:
+                bloom.add(value)
+    
+    def stats(self) -> Dict[str, int]:
+        """Lookup counters and the number of indexed messages"""
+        with self._lock:
+            total = self.connection.execute(
+                "SELECT COUNT(*) FROM seen"
+            ).fetchone()[0]
+            return {
+                'indexed': total,
+                'lookups': self.lookups,
+                'bloom_negatives': self.bloom_negatives
+            }
@@ -8,16 +8,51 @@ target API with robust error handling, caching, and retry mechanisms.
 import os
 import json
 import time
+import asyncio
+import argparse
+import queue
+import signal
 import logging
 import hashlib
+import threading
 import requests
-from typing import Dict, List, Any, Optional, Tuple
-from datetime import datetime
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, Iterator, List, Any, Optional, Tuple
+from datetime import datetime, timezone
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
+from async_http import HTTPX_AVAILABLE, AsyncHTTPClient
+from backfill_store import BackfillStore
+from bundle_sizer import BundleSizer
+from dedup_index import DedupIndex
+from http_cache import HTTPResponseCache
+from metrics import (
+    BYTES_BUCKETS,
+    COUNT_BUCKETS,
+    RunMetrics,
+    current_list_scope,
+    set_list_scope,
+)
+from payload_encoding import PayloadEncoder
+from scheduler import PollScheduler, TriggerServer
+from spool import MessageSpool
+from rate_limiter import (
+    ARCHIVE,
+    INGEST,
+    AdaptiveRateLimiter,
+    RateProfile,
+    parse_retry_after,
+)
+
 
 # ==================== Configuration ====================
+# Collection modes: walk the flat emails feed, or threads by activity
+SYNC_MODES = ("emails", "threads")
+HTTP_BACKENDS = ("requests", "httpx")
+
+
 class Config:
     """Configuration loaded from config.json"""
     
@@ -46,6 +81,12 @@ class Config:
             cls.LISTS_FILE = file_paths.get('lists_file')
             cls.CACHE_FOLDER = file_paths.get('cache_folder')
             cls.LOG_FILE = file_paths.get('log_file')
+            cls.CHECKPOINT_FILE = file_paths.get(
+                'checkpoint_file', 'checkpoint.json'
+            )
+            cls.THREAD_CURSOR_FILE = file_paths.get(
+                'thread_cursor_file', 'thread_cursor.json'
+            )
             
             # Validate required file paths
             if not all([cls.PULL_FILE, cls.LISTS_FILE, 
@@ -99,6 +140,181 @@ class Config:
                     "Missing required fields in 'retry' section"
                 )
             
+            # Load collection settings (optional section)
+            collection = config_data.get('collection', {})
+            cls.PAGE_SIZE = collection.get('page_size', 100)
+            cls.FETCH_WORKERS = collection.get('fetch_workers', 4)
+            cls.LIST_WORKERS = collection.get('list_workers', 3)
+            cls.MAX_CONNECTIONS_PER_HOST = collection.get(
+                'max_connections_per_host', 8
+            )
+            cls.QUEUE_BUNDLES = collection.get('queue_bundles', 2)
+            cls.SYNC_MODE = collection.get('sync_mode', 'emails')
+            cls.HTTP_BACKEND = collection.get('http_backend', 'requests')
+            cls.HTTP2 = collection.get('http2', True)
+            cls.FETCH_WINDOW = collection.get('fetch_window', 32)
+            
+            if cls.SYNC_MODE not in SYNC_MODES:
+                raise ValueError(
+                    f"'sync_mode' in 'collection' section must be one of "
+                    f"{', '.join(SYNC_MODES)}"
+                )
+            if cls.HTTP_BACKEND not in HTTP_BACKENDS:
+                raise ValueError(
+                    f"'http_backend' in 'collection' section must be one "
+                    f"of {', '.join(HTTP_BACKENDS)}"
+                )
+            if cls.HTTP_BACKEND == 'httpx' and not HTTPX_AVAILABLE:
+                raise ValueError(
+                    "HTTP backend 'httpx' requires the httpx package"
+                )
+            
+            if not isinstance(cls.PAGE_SIZE, int) or cls.PAGE_SIZE < 1:
+                raise ValueError(
+                    "'page_size' in 'collection' section must be "
+                    "a positive integer"
+                )
+            for key, value in [
+                ('fetch_workers', cls.FETCH_WORKERS),
+                ('list_workers', cls.LIST_WORKERS),
+                ('max_connections_per_host', cls.MAX_CONNECTIONS_PER_HOST),
+                ('queue_bundles', cls.QUEUE_BUNDLES),
+                ('fetch_window', cls.FETCH_WINDOW)
+            ]:
+                if not isinstance(value, int) or value < 1:
+                    raise ValueError(
+                        f"'{key}' in 'collection' section must be "
+                        f"a positive integer"
+                    )
+            
+            # Load rate limit settings (optional section). Default rates
+            # follow the legacy request_delay / batch_delay spacing.
+            rate_limit = config_data.get('rate_limit', {})
+            cls.RATE_LIMITS = {
+                ARCHIVE: cls._load_rate_profile(
+                    rate_limit.get(ARCHIVE, {}),
+                    default_rate=cls._rate_from_delay(cls.REQUEST_DELAY),
+                    default_burst=4
+                ),
+                INGEST: cls._load_rate_profile(
+                    rate_limit.get(INGEST, {}),
+                    default_rate=cls._rate_from_delay(cls.BATCH_DELAY),
+                    default_burst=2
+                ),
+            }
+            cls.RATE_DECREASE_FACTOR = rate_limit.get('decrease_factor', 0.5)
+            cls.RATE_INCREASE_STEP = rate_limit.get('increase_step', 0.25)
+            cls.RATE_INCREASE_AFTER = rate_limit.get('increase_after', 20)
+            
+            if not 0 < cls.RATE_DECREASE_FACTOR <= 1:
+                raise ValueError(
+                    "'decrease_factor' in 'rate_limit' section must be "
+                    "between 0 and 1"
+                )
+            
+            # Load HTTP response cache settings (optional section)
+            http_cache = config_data.get('http_cache', {})
+            cls.HTTP_CACHE_ENABLED = http_cache.get('enabled', True)
+            cls.HTTP_CACHE_FOLDER = http_cache.get('folder', 'http_cache')
+            cls.HTTP_CACHE_MAX_SIZE_MB = http_cache.get('max_size_mb', 100)
+            
+            if cls.HTTP_CACHE_MAX_SIZE_MB <= 0:
+                raise ValueError(
+                    "'max_size_mb' in 'http_cache' section must be positive"
+                )
+            
+            # Load adaptive bundle sizing settings (optional section).
+            # bundle_threshold is the starting message count.
+            bundling = config_data.get('bundling', {})
+            cls.BUNDLE_TARGET_KB = bundling.get('target_kb', 256)
+            cls.BUNDLE_MIN_KB = bundling.get('min_kb', 16)
+            cls.BUNDLE_MAX_KB = bundling.get('max_kb', 4096)
+            cls.BUNDLE_MAX_COUNT = bundling.get(
+                'max_count', max(50, cls.BUNDLE_THRESHOLD)
+            )
+            cls.BUNDLE_TARGET_LATENCY = bundling.get('target_latency', 2.0)
+            
+            if not (0 < cls.BUNDLE_MIN_KB <= cls.BUNDLE_TARGET_KB
+                    <= cls.BUNDLE_MAX_KB):
+                raise ValueError(
+                    "'bundling' sizes must satisfy "
+                    "0 < min_kb <= target_kb <= max_kb"
+                )
+            if cls.BUNDLE_MAX_COUNT < 1 or cls.BUNDLE_TARGET_LATENCY <= 0:
+                raise ValueError(
+                    "'max_count' and 'target_latency' in 'bundling' "
+                    "section must be positive"
+                )
+            
+            # Load dedup index settings (optional section)
+            dedup = config_data.get('dedup', {})
+            cls.DEDUP_ENABLED = dedup.get('enabled', True)
+            cls.DEDUP_INDEX_FILE = dedup.get('path', 'dedup_index.sqlite3')
+            cls.DEDUP_EXPECTED_ITEMS = dedup.get('expected_items', 100000)
+            cls.DEDUP_FALSE_POSITIVE_RATE = dedup.get(
+                'false_positive_rate', 0.001
+            )
+            cls.DEDUP_STOP_AFTER_KNOWN = dedup.get('stop_after_known', 20)
+            
+            if not 0 < cls.DEDUP_FALSE_POSITIVE_RATE < 1:
+                raise ValueError(
+                    "'false_positive_rate' in 'dedup' section must be "
+                    "between 0 and 1"
+                )
+            if (cls.DEDUP_EXPECTED_ITEMS < 1
+                    or cls.DEDUP_STOP_AFTER_KNOWN < 1):
+                raise ValueError(
+                    "'expected_items' and 'stop_after_known' in 'dedup' "
+                    "section must be positive"
+                )
+            
+            # Load backfill settings (optional section)
+            backfill = config_data.get('backfill', {})
+            cls.BACKFILL_FOLDER = backfill.get('folder', 'backfill')
+            cls.BACKFILL_SHARD_SIZE = backfill.get('shard_size', 5000)
+            cls.BACKFILL_WORKERS = backfill.get('workers', 4)
+            
+            if cls.BACKFILL_SHARD_SIZE < 1 or cls.BACKFILL_WORKERS < 1:
+                raise ValueError(
+                    "'shard_size' and 'workers' in 'backfill' section "
+                    "must be positive"
+                )
+            
+            # Load daemon settings (optional section)
+            daemon = config_data.get('daemon', {})
+            cls.DAEMON_POLL_INTERVAL = daemon.get('poll_interval', 300)
+            cls.DAEMON_MAX_INTERVAL = daemon.get('max_interval', 3600)
+            cls.DAEMON_BACKOFF_FACTOR = daemon.get('backoff_factor', 2.0)
+            cls.DAEMON_TRIGGER_HOST = daemon.get('trigger_host', '127.0.0.1')
+            cls.DAEMON_TRIGGER_PORT = daemon.get('trigger_port', 0)
+            cls.DAEMON_TRIGGER_TOKEN = daemon.get('trigger_token', '')
+            
+            if not 0 < cls.DAEMON_POLL_INTERVAL <= cls.DAEMON_MAX_INTERVAL:
+                raise ValueError(
+                    "'daemon' intervals must satisfy "
+                    "0 < poll_interval <= max_interval"
+                )
+            if cls.DAEMON_BACKOFF_FACTOR < 1:
+                raise ValueError(
+                    "'backoff_factor' in 'daemon' section must be at least 1"
+                )
+            
+            # Load metrics output settings (optional section)
+            metrics = config_data.get('metrics', {})
+            cls.METRICS_SUMMARY_FILE = metrics.get(
+                'summary_file', 'metrics.json'
+            )
+            cls.METRICS_PROMETHEUS_FILE = metrics.get('prometheus_file', '')
+            
+            # Load POST body encoding settings (optional section)
+            post_encoding = config_data.get('post_encoding', {})
+            cls.PAYLOAD_ENCODER = PayloadEncoder(
+                json_encoder=post_encoding.get('json_encoder', 'auto'),
+                compression=post_encoding.get('compression', 'none'),
+                level=post_encoding.get('level'),
+                min_bytes=post_encoding.get('min_bytes', 1024)
+            )
+            
             print(f"Configuration loaded successfully from: {config_file}")
             
         except FileNotFoundError:
@@ -116,6 +332,33 @@ class Config:
         except Exception as e:
             print(f"ERROR: Failed to load configuration: {e}")
             raise SystemExit(1)
+    
+    @staticmethod
+    def _rate_from_delay(delay: float) -> float:
+        """Convert a fixed delay between requests to requests per second"""
+        return 1.0 / delay if delay > 0 else 0.0
+    
+    @staticmethod
+    def _load_rate_profile(
+        settings: Dict[str, Any],
+        default_rate: float,
+        default_burst: float
+    ) -> RateProfile:
+        """Build a token bucket profile from a 'rate_limit' subsection"""
+        rate = settings.get('rate', default_rate)
+        profile = RateProfile(
+            rate=rate,
+            burst=settings.get('burst', default_burst),
+            min_rate=settings.get('min_rate', rate / 10),
+            max_rate=settings.get('max_rate', rate * 4)
+        )
+        
+        if not (0 <= profile.min_rate <= profile.rate <= profile.max_rate):
+            raise ValueError(
+                "'rate_limit' rates must satisfy "
+                "0 <= min_rate <= rate <= max_rate"
+            )
+        return profile
 
 
 # ==================== Logging Setup ====================
@@ -142,9 +385,10 @@ def setup_logging() -> logging.Logger:
     console_handler = logging.StreamHandler()
     console_handler.setLevel(logging.INFO)
     
-    # Formatter
+    # Formatter (thread name identifies the mailing list being synced)
     formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        '%(asctime)s - %(name)s - %(threadName)s - %(levelname)s - '
+        '%(message)s',
         datefmt='%Y-%m-%d %H:%M:%S'
     )
     file_handler.setFormatter(formatter)
@@ -181,19 +425,29 @@ def write_json_file(
     data: Dict[str, Any], 
     logger: logging.Logger
 ) -> bool:
-    """Write data to JSON file with error handling"""
+    """
+    Write data to JSON file with error handling.
+    The file is written to a temporary file first and renamed into place,
+    so readers never see a partially written file.
+    """
+    temp_path = f"{file_path}.{threading.get_ident()}.tmp"
     try:
         file_dir = os.path.dirname(file_path)
         if file_dir:
             os.makedirs(file_dir, exist_ok=True)
         
-        with open(file_path, 'w', encoding='utf-8') as f:
+        with open(temp_path, 'w', encoding='utf-8') as f:
             json.dump(data, f, ensure_ascii=False, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, file_path)
         
         logger.info(f"Successfully wrote: {file_path}")
         return True
     except Exception as e:
         logger.error(f"Error writing {file_path}: {e}")
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
         return False
 
 
@@ -209,37 +463,43 @@ def normalize_list_name(list_name: str) -> str:
 
 
 # ==================== Cache Management ====================
+def get_spool_path(list_name: str) -> str:
+    """Path of the durable spool holding failed messages for a list"""
+    normalized_name = normalize_list_name(list_name)
+    return os.path.join(Config.CACHE_FOLDER, f"{normalized_name}_spool.sqlite3")
+
+
+def open_spool(list_name: str) -> MessageSpool:
+    """Open (creating if needed) the spool for a mailing list"""
+    os.makedirs(Config.CACHE_FOLDER, exist_ok=True)
+    return MessageSpool(get_spool_path(list_name))
+
+
 def save_cache_file(
     list_name: str, 
-    bundle_data: List[Dict[str, Any]], 
+    bundle_data: List["EmailRecord"], 
     logger: logging.Logger
 ) -> str:
-    """Save failed bundle to timestamped cache file"""
-    os.makedirs(Config.CACHE_FOLDER, exist_ok=True)
-    
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    normalized_name = normalize_list_name(list_name)
-    cache_filename = f"{normalized_name}_cache_{timestamp}.json"
-    cache_path = os.path.join(Config.CACHE_FOLDER, cache_filename)
-    
-    cache_data = {
-        "timestamp": datetime.now().isoformat(),
-        "list_name": list_name,
-        "message_count": len(bundle_data),
-        "messages": bundle_data
-    }
-    
-    if write_json_file(cache_path, cache_data, logger):
-        logger.info(f"Saved cache: {cache_path}")
-        return cache_path
-    return ""
+    """Durably append a failed bundle's encoded messages to the spool"""
+    spool_path = get_spool_path(list_name)
+    try:
+        with open_spool(list_name) as spool:
+            spool.append([
+                (record.message_id_hash, record.payload)
+                for record in bundle_data
+            ])
+        logger.info(f"Spooled {len(bundle_data)} messages: {spool_path}")
+        return spool_path
+    except Exception as e:
+        logger.error(f"Error writing spool {spool_path}: {e}")
+        return ""
 
 
 def get_cache_files(
     list_name: str, 
     logger: logging.Logger
 ) -> List[str]:
-    """Get all cache files for a specific mailing list"""
+    """Get all legacy per-bundle JSON cache files for a mailing list"""
     if not os.path.exists(Config.CACHE_FOLDER):
         return []
     
@@ -257,7 +517,8 @@ def get_cache_files(
         
         if cache_files:
             logger.info(
-                f"Found {len(cache_files)} cache file(s) for {list_name}"
+                f"Found {len(cache_files)} legacy cache file(s) "
+                f"for {list_name}"
             )
         
         return cache_files
@@ -266,48 +527,33 @@ def get_cache_files(
         return []
 
 
-def process_single_cache_file(
-    cache_path: str,
-    api_endpoint: str,
-    session: requests.Session,
+def import_legacy_cache_files(
+    list_name: str,
+    spool: MessageSpool,
     logger: logging.Logger
-) -> bool:
-    """Process a single cache file and delete if successful"""
-    logger.info(f"Processing cache: {cache_path}")
-    
-    cache_data = read_json_file(cache_path, logger)
-    if not cache_data:
-        logger.error(f"Failed to read cache: {cache_path}")
-        return True  # Continue to next file
-    
-    messages = cache_data.get('messages', [])
-    if not messages:
-        logger.warning(f"Empty cache: {cache_path}")
-        try:
-            os.remove(cache_path)
-            logger.info(f"Removed empty cache: {cache_path}")
-        except Exception as e:
-            logger.error(f"Failed to remove cache: {e}")
-        return True
-    
-    logger.info(f"Posting {len(messages)} messages from cache")
-    success = post_bundle_with_retry(
-        api_endpoint, 
-        messages, 
-        session, 
-        logger
-    )
-    
-    if success:
+) -> None:
+    """Move messages from legacy JSON cache files into the spool"""
+    for cache_path in get_cache_files(list_name, logger):
+        cache_data = read_json_file(cache_path, logger)
+        if cache_data is None:
+            logger.error(f"Failed to read cache: {cache_path}")
+            continue
+        
+        messages = cache_data.get('messages', [])
+        if messages:
+            spool.append([
+                (record.message_id_hash, record.payload)
+                for record in map(EmailRecord.from_message, messages)
+            ])
+        
         try:
             os.remove(cache_path)
-            logger.info(f"Posted and removed cache: {cache_path}")
+            logger.info(
+                f"Imported {len(messages)} messages into spool "
+                f"and removed: {cache_path}"
+            )
         except Exception as e:
             logger.error(f"Failed to remove cache: {e}")
-        return True
-    else:
-        logger.error(f"Failed to post cache: {cache_path}")
-        return False
 
 
 def process_all_cache_files(
@@ -316,52 +562,194 @@ def process_all_cache_files(
     session: requests.Session,
     logger: logging.Logger
 ) -> bool:
-    """Process all cache files for a mailing list"""
-    cache_files = get_cache_files(list_name, logger)
-    
-    if not cache_files:
-        logger.info(f"No cache files for {list_name}")
+    """
+    Replay the list's spool: post pending messages in spool order,
+    acknowledging each bundle as it succeeds, then compact the spool.
+    Stops at the first bundle that still fails; it stays pending.
+    """
+    spool_path = get_spool_path(list_name)
+    if (not os.path.exists(spool_path)
+            and not get_cache_files(list_name, logger)):
+        logger.info(f"No cached messages for {list_name}")
         return True
     
-    logger.info(f"Processing {len(cache_files)} cache file(s)")
-    
-    for cache_path in cache_files:
-        success = process_single_cache_file(
-            cache_path, 
-            api_endpoint, 
-            session, 
-            logger
-        )
-        if not success:
-            logger.error(f"Cache processing failed, stopping")
-            return False
-    
-    logger.info(f"Completed cache processing for {list_name}")
-    return True
+    try:
+        with open_spool(list_name) as spool:
+            import_legacy_cache_files(list_name, spool, logger)
+            
+            pending = spool.pending_count()
+            if not pending:
+                spool.compact()
+                logger.info(f"No cached messages for {list_name}")
+                return True
+            
+            logger.info(f"Replaying {pending} spooled message(s)")
+            
+            for batch in spool.iter_pending(Config.BUNDLE_THRESHOLD):
+                seqs = [seq for seq, _, _ in batch]
+                messages = [
+                    EmailRecord(message_id_hash, payload)
+                    for _, message_id_hash, payload in batch
+                ]
+                
+                logger.info(f"Posting {len(messages)} messages from spool")
+                outcome = post_bundle_with_retry(
+                    api_endpoint,
+                    messages,
+                    session,
+                    logger
+                )
+                
+                if outcome != POST_OK:
+                    logger.error(
+                        f"Spool replay failed, stopping "
+                        f"({spool.pending_count()} message(s) pending)"
+                    )
+                    return False
+                
+                spool.ack(seqs)
+            
+            removed = spool.compact()
+            logger.info(
+                f"Completed spool replay for {list_name} "
+                f"({removed} message(s) compacted)"
+            )
+            return True
+    except Exception as e:
+        logger.error(f"Error processing spool {spool_path}: {e}")
+        return False
 
 
 # ==================== HTTP Session ====================
+class RateLimitedSession(requests.Session):
+    """
+    requests.Session that passes every request through an
+    AdaptiveRateLimiter and reports successful responses back to it
+    (429 responses are reported by handle_rate_limit_response).
+    Optionally carries the response cache used for conditional GETs,
+    the bundle sizer shared by every list posting to the ingest API, the
+    run metrics every request is recorded in and, with the httpx backend,
+    the AsyncHTTPClient that then carries all archive and ingest traffic.
+    """
+    def __init__(
+        self,
+        rate_limiter: AdaptiveRateLimiter,
+        response_cache: Optional[HTTPResponseCache] = None,
+        bundle_sizer: Optional[BundleSizer] = None,
+        metrics: Optional[RunMetrics] = None
+    ):
+        super().__init__()
+        self.rate_limiter = rate_limiter
+        self.response_cache = response_cache
+        self.bundle_sizer = bundle_sizer
+        self.metrics = metrics
+        self.async_client: Optional[AsyncHTTPClient] = None
+    
+    def request(self, method: str, url: str, *args, **kwargs):
+        waited = self.rate_limiter.acquire(method, url)
+        started = time.monotonic()
+        try:
+            response = super().request(method, url, *args, **kwargs)
+        except requests.exceptions.RequestException as e:
+            if self.metrics:
+                self.metrics.increment(
+                    'request_errors',
+                    method=method,
+                    error=type(e).__name__
+                )
+            raise
+        latency = time.monotonic() - started
+        
+        if self.metrics:
+            body = kwargs.get('data')
+            self.metrics.record_request(
+                method,
+                response.status_code,
+                latency,
+                len(response.content),
+                len(body) if isinstance(body, bytes) else 0,
+                waited
+            )
+        
+        if response.status_code != 429 and response.status_code < 500:
+            self.rate_limiter.on_success(method, url)
+        
+        return response
+    
+    def close(self) -> None:
+        if self.async_client:
+            self.async_client.close()
+            self.async_client = None
+        super().close()
+
+
 def create_http_session() -> requests.Session:
-    """Create HTTP session with connection pooling and retry strategy"""
-    session = requests.Session()
+    """
+    Create HTTP session with keep-alive connection pooling, retry strategy,
+    adaptive per-host rate limiting (Config.RATE_LIMITS), adaptive bundle
+    sizing, run metrics and, if enabled, the on-disk response cache for
+    conditional GETs.
+    The session is shared by all list and content workers; at most
+    Config.MAX_CONNECTIONS_PER_HOST connections are opened per host and
+    further requests wait for a free connection. With the httpx backend
+    the session also gets an AsyncHTTPClient with the same rate limiter
+    and connection cap, which then sends every request.
+    """
+    response_cache = None
+    if Config.HTTP_CACHE_ENABLED:
+        response_cache = HTTPResponseCache(
+            Config.HTTP_CACHE_FOLDER,
+            int(Config.HTTP_CACHE_MAX_SIZE_MB * 1024 * 1024)
+        )
+    
+    session = RateLimitedSession(
+        AdaptiveRateLimiter(
+            Config.RATE_LIMITS,
+            decrease_factor=Config.RATE_DECREASE_FACTOR,
+            increase_step=Config.RATE_INCREASE_STEP,
+            increase_after=Config.RATE_INCREASE_AFTER
+        ),
+        response_cache,
+        BundleSizer(
+            target_bytes=Config.BUNDLE_TARGET_KB * 1024,
+            min_bytes=Config.BUNDLE_MIN_KB * 1024,
+            max_bytes=Config.BUNDLE_MAX_KB * 1024,
+            target_count=Config.BUNDLE_THRESHOLD,
+            max_count=Config.BUNDLE_MAX_COUNT,
+            target_latency=Config.BUNDLE_TARGET_LATENCY
+        ),
+        RunMetrics()
+    )
     
-    # Retry strategy (excluding 429 - handled separately)
+    # Retry strategy (excluding 429 - handled separately; urllib3 would
+    # otherwise retry 429 responses that carry a Retry-After header)
     retry_strategy = Retry(
         total=3,
         backoff_factor=0.5,
         status_forcelist=[500, 502, 503, 504],
-        allowed_methods=["HEAD", "GET", "OPTIONS", "POST"]
+        allowed_methods=["HEAD", "GET", "OPTIONS", "POST"],
+        respect_retry_after_header=False
     )
     
     adapter = HTTPAdapter(
         max_retries=retry_strategy,
         pool_connections=10,
-        pool_maxsize=20
+        pool_maxsize=Config.MAX_CONNECTIONS_PER_HOST,
+        pool_block=True
     )
     
     session.mount("http://", adapter)
     session.mount("https://", adapter)
     
+    if Config.HTTP_BACKEND == 'httpx':
+        session.async_client = AsyncHTTPClient(
+            session.rate_limiter,
+            max_connections=Config.MAX_CONNECTIONS_PER_HOST,
+            timeout=Config.REQUEST_TIMEOUT,
+            http2=Config.HTTP2,
+            metrics=session.metrics
+        )
+    
     return session
 
 
@@ -369,9 +757,10 @@ def create_http_session() -> requests.Session:
 def extract_retry_after(
     response: requests.Response,
     default_delay: float
-) -> int:
-    """Extract retry_after value from response headers"""
-    return int(response.headers.get('Retry-After', default_delay))
+) -> float:
+    """Extract retry_after value (seconds or HTTP date) from headers"""
+    retry_after = parse_retry_after(response.headers.get('Retry-After'))
+    return default_delay if retry_after is None else retry_after
 
 
 def handle_rate_limit_response(
@@ -381,22 +770,29 @@ def handle_rate_limit_response(
     retry_delay: float,
     url: str,
     logger: logging.Logger,
-    is_post: bool = False
+    is_post: bool = False,
+    rate_limiter: Optional[AdaptiveRateLimiter] = None
 ) -> Tuple[bool, float]:
     """
     Handle 429 rate limit response for both GET and POST requests.
+    The rate limiter slows down and pauses the host for Retry-After, or
+    for retry_delay when the header is missing, so the retry waits for
+    the host's next token. Without a rate limiter the pause is slept here.
     Returns (should_continue, new_retry_delay)
     """
-    retry_after = extract_retry_after(response, retry_delay)
+    request_type = "POST" if is_post else "GET"
+    pause = extract_retry_after(response, retry_delay)
+    if rate_limiter:
+        rate_limiter.on_rate_limited(request_type, url, pause)
     
     if attempt < max_retries - 1:
-        request_type = "POST" if is_post else "GET"
         logger.warning(
             f"Rate limited (429) on {request_type}. "
             f"Retry {attempt + 1}/{max_retries} "
-            f"after {retry_after}s: {url}"
+            f"after a {pause:g}s pause: {url}"
         )
-        time.sleep(retry_after)
+        if not rate_limiter:
+            time.sleep(pause)
         return True, retry_delay * 2
     else:
         logger.error(
@@ -411,10 +807,12 @@ def handle_timeout_error(
     retry_delay: float,
     url: str,
     logger: logging.Logger,
-    is_post: bool = False
+    is_post: bool = False,
+    sleep: bool = True
 ) -> Tuple[bool, float]:
     """
     Handle timeout exception for both GET and POST requests.
+    With sleep=False the caller waits retry_delay itself (coroutines).
     Returns (should_continue, new_retry_delay)
     """
     if attempt < max_retries - 1:
@@ -424,7 +822,8 @@ def handle_timeout_error(
             f"Retry {attempt + 1}/{max_retries} "
             f"after {retry_delay}s: {url}"
         )
-        time.sleep(retry_delay)
+        if sleep:
+            time.sleep(retry_delay)
         return True, retry_delay * 2
     else:
         logger.error(f"Timeout, no retries left: {url}")
@@ -441,20 +840,48 @@ def fetch_json_from_url(
     Fetch JSON data from URL with retry logic and exponential backoff.
     Handles 429 rate limiting and timeouts with retry.
     5xx errors are handled by session-level retry strategy.
+    When the session has a response cache, previously seen URLs are
+    revalidated with a conditional GET and a 304 returns the cached body.
+    With the httpx backend the request runs as fetch_json_async() on the
+    session's AsyncHTTPClient.
     """
+    async_client = getattr(session, 'async_client', None)
+    if async_client:
+        return async_client.run(
+            fetch_json_async(url, session, logger, max_retries)
+        )
+    
     retry_delay = 1.0  # Start with 1 second delay
+    response_cache = getattr(session, 'response_cache', None)
+    metrics = getattr(session, 'metrics', None)
+    cached = response_cache.lookup(url) if response_cache else None
+    headers = cached.conditional_headers() if cached else {}
     
     for attempt in range(max_retries):
         try:
-            response = session.get(url, timeout=Config.REQUEST_TIMEOUT)
+            response = session.get(
+                url,
+                timeout=Config.REQUEST_TIMEOUT,
+                headers=headers
+            )
+            
+            # Not modified since cached - reuse the stored body
+            if response.status_code == 304 and cached:
+                response_cache.record_hit(url)
+                if metrics:
+                    metrics.increment('cache_hits')
+                return cached.json()
             
             # Handle rate limiting (429) - not in session retry
             if response.status_code == 429:
                 should_continue, retry_delay = handle_rate_limit_response(
                     response, attempt, max_retries, 
-                    retry_delay, url, logger, is_post=False
+                    retry_delay, url, logger, is_post=False,
+                    rate_limiter=getattr(session, 'rate_limiter', None)
                 )
                 if should_continue:
+                    if metrics:
+                        metrics.increment('retries', method='GET')
                     continue
                 else:
                     return None
@@ -464,14 +891,31 @@ def fetch_json_from_url(
             response.raise_for_status()
             
             # Parse and return JSON
-            return response.json()
+            data = response.json()
+            
+            if response_cache:
+                response_cache.record_miss()
+                response_cache.store(
+                    url,
+                    response.content,
+                    response.headers.get('ETag'),
+                    response.headers.get('Last-Modified')
+                )
+            
+            return data
             
         except requests.exceptions.Timeout:
+            slept = retry_delay
             should_continue, retry_delay = handle_timeout_error(
                 attempt, max_retries, retry_delay, url, logger
             )
             if not should_continue:
                 return None
+            if metrics:
+                metrics.increment('retries', method='GET')
+                metrics.increment(
+                    'sleep_seconds', slept, reason='retry_backoff'
+                )
                 
         except requests.exceptions.RequestException as e:
             # Other request errors (after session retry exhausted)
@@ -486,6 +930,125 @@ def fetch_json_from_url(
     return None
 
 
+async def fetch_json_async(
+    url: str,
+    session: requests.Session,
+    logger: logging.Logger,
+    max_retries: int = 3
+) -> Optional[Dict[str, Any]]:
+    """
+    fetch_json_from_url() as a coroutine on the session's AsyncHTTPClient,
+    with the same retries, response cache handling and result. 5xx
+    errors are retried by the client. Backoff sleeps yield the loop to
+    other requests, and cancellation is never swallowed.
+    """
+    async_client = session.async_client
+    retry_delay = 1.0  # Start with 1 second delay
+    response_cache = getattr(session, 'response_cache', None)
+    metrics = getattr(session, 'metrics', None)
+    cached = response_cache.lookup(url) if response_cache else None
+    headers = cached.conditional_headers() if cached else {}
+    
+    for attempt in range(max_retries):
+        try:
+            response = await async_client.request(
+                "GET",
+                url,
+                headers=headers,
+                deadline=Config.REQUEST_TIMEOUT
+            )
+        except requests.exceptions.Timeout:
+            slept = retry_delay
+            should_continue, retry_delay = handle_timeout_error(
+                attempt, max_retries, retry_delay, url, logger, sleep=False
+            )
+            if not should_continue:
+                return None
+            if metrics:
+                metrics.increment('retries', method='GET')
+                metrics.increment(
+                    'sleep_seconds', slept, reason='retry_backoff'
+                )
+            await asyncio.sleep(slept)
+            continue
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Request error for {url}: {e}")
+            return None
+        
+        if response.status_code == 304 and cached:
+            response_cache.record_hit(url)
+            if metrics:
+                metrics.increment('cache_hits')
+            return cached.json()
+        
+        # Retry after the rate limiter's pause, like the sync path
+        if response.status_code == 429:
+            should_continue, retry_delay = handle_rate_limit_response(
+                response, attempt, max_retries,
+                retry_delay, url, logger, is_post=False,
+                rate_limiter=async_client.rate_limiter
+            )
+            if not should_continue:
+                return None
+            if metrics:
+                metrics.increment('retries', method='GET')
+            continue
+        
+        if response.status_code >= 400:
+            logger.error(
+                f"Request error for {url}: HTTP {response.status_code}"
+            )
+            return None
+        
+        try:
+            data = response.json()
+        except json.JSONDecodeError as e:
+            # JSON decode errors are not transient, don't retry
+            logger.error(f"JSON decode error for {url}: {e}")
+            return None
+        
+        if response_cache:
+            response_cache.record_miss()
+            response_cache.store(
+                url,
+                response.content,
+                response.headers.get('ETag'),
+                response.headers.get('Last-Modified')
+            )
+        
+        return data
+    
+    return None
+
+
+def send_post(
+    url: str,
+    body: bytes,
+    headers: Dict[str, str],
+    session: requests.Session
+):
+    """
+    POST a body over the session's HTTP backend. Either way the response
+    has status_code, headers and text, and timeouts or connection errors
+    raise requests.exceptions.
+    """
+    async_client = getattr(session, 'async_client', None)
+    if async_client:
+        return async_client.run(async_client.request(
+            "POST",
+            url,
+            headers=headers,
+            data=body,
+            deadline=Config.REQUEST_TIMEOUT
+        ))
+    return session.post(
+        url,
+        data=body,
+        timeout=Config.REQUEST_TIMEOUT,
+        headers=headers
+    )
+
+
 def fetch_email_metadata(
     url: str,
     session: requests.Session,
@@ -542,12 +1105,40 @@ def transform_message_format(
     return transformed
 
 
-def generate_request_id(messages: List[Dict[str, Any]]) -> str:
+class EmailRecord:
+    """
+    An email transformed to the target API format and encoded once, when
+    it is fetched. Bundle bodies, retries, the spool and the backfill
+    store all reuse the encoded bytes.
+    """
+    __slots__ = ('message_id_hash', 'payload')
+    
+    def __init__(self, message_id_hash: str, payload: bytes):
+        self.message_id_hash = message_id_hash
+        self.payload = payload  # Compact UTF-8 JSON of the message
+    
+    @classmethod
+    def from_message(cls, message: Dict[str, Any]) -> "EmailRecord":
+        """Transform and encode an email from the Boost API"""
+        return cls(
+            message.get('message_id_hash', ''),
+            Config.PAYLOAD_ENCODER.encode_json(
+                transform_message_format(message)
+            )
+        )
+    
+    @property
+    def size(self) -> int:
+        """Number of bytes the message adds to a POST body"""
+        return len(self.payload)
+
+
+def generate_request_id(records: List[EmailRecord]) -> str:
     """Generate SHA256 hash request ID from message hashes"""
     message_hashes = [
-        msg.get('message_id_hash', '')
-        for msg in messages
-        if msg.get('message_id_hash')
+        record.message_id_hash
+        for record in records
+        if record.message_id_hash
     ]
     
     combined = ''.join(sorted(message_hashes))
@@ -556,104 +1147,183 @@ def generate_request_id(messages: List[Dict[str, Any]]) -> str:
 
 
 # ==================== API Posting ====================
-def build_request_data(
-    messages: List[Dict[str, Any]]
-) -> Dict[str, Any]:
-    """Build request data structure for API POST"""
-    transformed_messages = [
-        transform_message_format(msg) 
-        for msg in messages
-    ]
+# Outcomes of posting a bundle
+POST_OK = "ok"
+POST_FAILED = "failed"
+POST_TOO_LARGE = "too_large"  # 413: retrying the same bundle is pointless
+
+
+class EncodedBundle:
+    """POST body of a bundle, encoded and compressed once for all attempts"""
+    __slots__ = (
+        'request_id', 'message_count', 'raw_body', 'body', 'content_encoding'
+    )
     
-    request_data = {
+    def __init__(self, request_id: str, message_count: int, raw_body: bytes):
+        self.request_id = request_id
+        self.message_count = message_count
+        self.raw_body = raw_body  # Uncompressed JSON
+        self.body, self.content_encoding = Config.PAYLOAD_ENCODER.compress(
+            raw_body
+        )
+
+
+def build_request_data(records: List[EmailRecord]) -> EncodedBundle:
+    """
+    Build the API POST body
+    {"timestamp", "requestId", "messages", "message_count"} by joining
+    the records' encoded messages instead of re-serializing them
+    """
+    request_id = generate_request_id(records)
+    header = Config.PAYLOAD_ENCODER.encode_json({
         "timestamp": datetime.now().isoformat(),
-        "requestId": generate_request_id(messages),
-        "messages": transformed_messages,
-        "message_count": len(transformed_messages)
-    }
-    
-    return request_data
+        "requestId": request_id
+    })
+    raw_body = b"".join((
+        header[:-1],
+        b',"messages":[',
+        b",".join(record.payload for record in records),
+        b'],"message_count":',
+        str(len(records)).encode('ascii'),
+        b"}"
+    ))
+    return EncodedBundle(request_id, len(records), raw_body)
 
 
 def post_messages_bundle(
     api_endpoint: str,
-    request_data: Dict[str, Any],
+    bundle: EncodedBundle,
     session: requests.Session,
     logger: logging.Logger,
     attempt: int = 0,
     max_retries: int = None,
     retry_delay: float = None
-) -> Tuple[bool, float]:
+) -> Tuple[str, float]:
     """
     POST messages bundle to API endpoint with 429 and timeout handling.
-    Returns (success, new_retry_delay)
+    The bundle's body is sent as encoded, so retries cost no re-encoding.
+    Latency, 413 and timeouts are fed back to the session's bundle sizer
+    (sizes are uncompressed JSON bytes).
+    Returns (outcome, new_retry_delay) where outcome is one of POST_OK,
+    POST_FAILED or POST_TOO_LARGE.
     """
     if max_retries is None:
         max_retries = Config.MAX_RETRY_ATTEMPTS
     if retry_delay is None:
         retry_delay = Config.INITIAL_RETRY_DELAY
     
+    bundle_sizer = getattr(session, 'bundle_sizer', None)
+    metrics = getattr(session, 'metrics', None)
+    message_count = bundle.message_count
+    raw_body = bundle.raw_body
+    body, content_encoding = bundle.body, bundle.content_encoding
+    headers = {"Content-Type": "application/json"}
+    if content_encoding:
+        headers["Content-Encoding"] = content_encoding
+    
     try:
-        message_count = request_data.get('message_count', 0)
-        logger.info(f"Posting {message_count} messages to API")
-        logger.info(f"Request ID: {request_data['requestId']}")
-        
-        response = session.post(
-            api_endpoint,
-            json=request_data,
-            timeout=Config.REQUEST_TIMEOUT,
-            headers={"Content-Type": "application/json"}
+        logger.info(
+            f"Posting {message_count} messages ({len(raw_body)} bytes"
+            + (f", {content_encoding} {len(body)} bytes"
+               if content_encoding else "")
+            + ") to API"
         )
+        logger.info(f"Request ID: {bundle.request_id}")
+        
+        started = time.monotonic()
+        response = send_post(api_endpoint, body, headers, session)
+        latency = time.monotonic() - started
         
         # Handle rate limiting (429) using common handler
         if response.status_code == 429:
             should_continue, new_retry_delay = handle_rate_limit_response(
                 response, attempt, max_retries,
-                retry_delay, api_endpoint, logger, is_post=True
+                retry_delay, api_endpoint, logger, is_post=True,
+                rate_limiter=getattr(session, 'rate_limiter', None)
             )
-            # Return success=False and updated delay
-            return False, new_retry_delay
+            # Return failure and updated delay
+            return POST_FAILED, new_retry_delay
         
         # Handle success
         if 200 <= response.status_code < 300:
-            logger.info(f"Success: {response.status_code}")
-            return True, retry_delay
+            logger.info(f"Success: {response.status_code} ({latency:.2f}s)")
+            if bundle_sizer:
+                bundle_sizer.on_success(
+                    message_count, len(raw_body), latency
+                )
+            if metrics:
+                metrics.increment('bundles_posted')
+                metrics.increment('messages_posted', message_count)
+                metrics.observe(
+                    'bundle_messages', message_count, COUNT_BUCKETS
+                )
+                metrics.observe('bundle_bytes', len(raw_body), BYTES_BUCKETS)
+            return POST_OK, retry_delay
+        
+        # Payload too large - the bundle has to be split
+        if response.status_code == 413:
+            logger.warning(
+                f"POST rejected as too large ({len(body)} bytes)"
+            )
+            if bundle_sizer:
+                bundle_sizer.on_too_large(
+                    message_count, len(raw_body), "413"
+                )
+            if metrics:
+                metrics.increment('bundles_too_large')
+            return POST_TOO_LARGE, retry_delay
         
         # Handle other errors
         logger.error(
             f"POST failed ({response.status_code}): {response.text}"
         )
-        return False, retry_delay
+        return POST_FAILED, retry_delay
     
     except requests.exceptions.Timeout:
+        if bundle_sizer:
+            bundle_sizer.on_too_large(
+                message_count, len(raw_body), "timeout"
+            )
+        
         # Handle timeout using common handler
         should_continue, new_retry_delay = handle_timeout_error(
-            attempt, max_retries, retry_delay, 
+            attempt, max_retries, retry_delay,
             api_endpoint, logger, is_post=True
         )
-        return False, new_retry_delay
+        if should_continue and metrics:
+            metrics.increment(
+                'sleep_seconds', retry_delay, reason='retry_backoff'
+            )
+        return POST_FAILED, new_retry_delay
         
     except requests.exceptions.RequestException as e:
         logger.error(f"Error posting bundle: {e}")
-        return False, retry_delay
+        return POST_FAILED, retry_delay
 
 
 def post_bundle_with_retry(
     api_endpoint: str,
-    messages: List[Dict[str, Any]],
+    records: List[EmailRecord],
     session: requests.Session,
     logger: logging.Logger
-) -> bool:
-    """POST bundle with exponential backoff retry logic"""
-    retry_delay = Config.INITIAL_RETRY_DELAY
-    
-    # Build request data once before retry loop
-    request_data = build_request_data(messages)
+) -> str:
+    """
+    POST bundle with exponential backoff retry logic.
+    Returns POST_OK, POST_FAILED, or POST_TOO_LARGE if the API rejected
+    the bundle as too large (not retried).
+    """
+    retry_delay = Config.INITIAL_RETRY_DELAY
+    metrics = getattr(session, 'metrics', None)
+    
+    # Encode the body once before retry loop
+    bundle = build_request_data(records)
     
     for attempt in range(Config.MAX_RETRY_ATTEMPTS):
-        success, retry_delay = post_messages_bundle(
+        if attempt > 0 and metrics:
+            metrics.increment('retries', method='POST')
+        outcome, retry_delay = post_messages_bundle(
             api_endpoint, 
-            request_data,  # Pass pre-built request data
+            bundle,  # Pass pre-built request body
             session, 
             logger,
             attempt,
@@ -661,83 +1331,85 @@ def post_bundle_with_retry(
             retry_delay
         )
         
-        if success:
-            return True
-        
-        # Wait before next retry if not last attempt
-        if attempt < Config.MAX_RETRY_ATTEMPTS - 1:
-            # Sleep already done in handle_rate_limit_response for 429
-            # For other errors, we need to wait
-            pass  # Delay is handled by handle_rate_limit_response for 429
+        if outcome != POST_FAILED:
+            return outcome
     
     logger.error(
         f"Failed after {Config.MAX_RETRY_ATTEMPTS} attempts"
     )
-    return False
+    if metrics:
+        metrics.increment('bundles_failed')
+    return POST_FAILED
 
 
 # ==================== Email Collection ====================
-def fetch_single_email(
+def fetch_email_page(
     emails_url: str,
     offset: int,
+    page_size: int,
     session: requests.Session,
     logger: logging.Logger
-) -> Optional[Dict[str, Any]]:
-    """Fetch a single email at the given offset"""
-    iterate_url = f"{emails_url}?limit=1&offset={offset}"
-    logger.info(f"Fetching email at offset {offset}")
-    
-    iterate_email = fetch_email_metadata(iterate_url, session, logger)
+) -> Optional[List[Dict[str, Any]]]:
+    """
+    Fetch a page of email metadata starting at the given offset.
+    Returns the page results (empty at the end of the archive),
+    or None if the request failed.
+    """
+    page_url = f"{emails_url}?limit={page_size}&offset={offset}"
+    logger.info(f"Fetching emails at offset {offset} (limit {page_size})")
     
-    if not iterate_email:
-        logger.error(f"Failed to fetch at offset {offset}")
-        return None
+    page = fetch_email_metadata(page_url, session, logger)
     
-    results = iterate_email.get('results', [])
-    if not results:
-        logger.info(f"No more emails at offset {offset}")
+    if page is None:
+        logger.error(f"Failed to fetch page at offset {offset}")
         return None
     
-    return results[0]
+    return page.get('results', [])
 
 
 class EmailCollectionResult:
     """Result of email collection process"""
     def __init__(
         self,
-        emails: List[Dict[str, Any]],
+        collected_count: int = 0,
         success: bool = True,
         failed_metadata_count: int = 0,
-        failed_content_count: int = 0
+        failed_content_count: int = 0,
+        metadata_requests: int = 0,
+        content_requests: int = 0
     ):
-        self.emails = emails
+        self.collected_count = collected_count
         self.success = success
         self.failed_metadata_count = failed_metadata_count
         self.failed_content_count = failed_content_count
+        self.metadata_requests = metadata_requests
+        self.content_requests = content_requests
 
 
-def collect_new_emails(
-    emails_url: str,
-    last_processed_hash: str,
+def fetch_metadata_pages(
+    url: str,
+    result: EmailCollectionResult,
     session: requests.Session,
     logger: logging.Logger
-) -> EmailCollectionResult:
+) -> Iterator[List[Dict[str, Any]]]:
     """
-    Collect all new emails until reaching last processed.
-    Returns EmailCollectionResult with collected emails and failure counts.
+    Yield pages of Config.PAGE_SIZE results from a paginated archive
+    endpoint until a short or empty page. A page is only short compared
+    to the largest page seen, since the server may cap the page size
+    below Config.PAGE_SIZE. A failed page is retried in place; after 3
+    consecutive failures result.success is set to False and iteration
+    stops. Request and failure counts go into result.
     """
-    new_emails = []
     offset = 0
-    failed_metadata_count = 0
-    failed_content_count = 0
+    largest_page = 0
     consecutive_metadata_failures = 0
-    consecutive_content_failures = 0
     
     while True:
-        result = fetch_single_email(emails_url, offset, session, logger)
+        result.metadata_requests += 1
+        page = fetch_email_page(url, offset, Config.PAGE_SIZE, session, logger)
         
-        if not result:
-            failed_metadata_count += 1
+        if page is None:
+            result.failed_metadata_count += 1
             consecutive_metadata_failures += 1
             
             # Stop if too many consecutive metadata failures
@@ -746,138 +1418,592 @@ def collect_new_emails(
                     f"Too many consecutive metadata fetch failures "
                     f"(offset {offset}). Stopping collection."
                 )
-                return EmailCollectionResult(
-                    emails=new_emails,
-                    success=False,
-                    failed_metadata_count=failed_metadata_count,
-                    failed_content_count=failed_content_count
-                )
-            
-            # If no results at all, we've reached the end
-            if offset == 0:
-                break
+                result.success = False
+                return
             
-            offset += 1
-            time.sleep(Config.REQUEST_DELAY)
+            # Retry the same page
             continue
         
         # Reset consecutive metadata failure counter on success
         consecutive_metadata_failures = 0
         
-        message_id_hash = result.get('message_id_hash', '')
-        email_url = result.get('url', '')
+        if not page:
+            logger.info(f"No more results at offset {offset}")
+            return
         
-        logger.info(f"Found email: {message_id_hash}")
+        yield page
         
-        # Check if reached last processed
-        if message_id_hash == last_processed_hash:
-            logger.info(f"Reached last processed: {message_id_hash}")
-            break
+        # A short page means we reached the end of the archive
+        largest_page = max(largest_page, len(page))
+        if len(page) < largest_page:
+            return
         
-        # Fetch full content
-        if email_url:
-            time.sleep(Config.REQUEST_DELAY)
-            email_content = fetch_email_content(email_url, session, logger)
+        offset += len(page)
+
+
+def fetch_contents_in_order(
+    email_urls: List[str],
+    pipeline: "BundlePipeline",
+    result: EmailCollectionResult,
+    session: requests.Session,
+    logger: logging.Logger
+) -> bool:
+    """
+    Fetch full email contents with Config.FETCH_WORKERS workers through
+    a small in-flight window and hand them to the pipeline in the given
+    order. With the httpx backend there are no worker threads: up to
+    Config.FETCH_WINDOW requests are in flight on the session's
+    AsyncHTTPClient. Returns False if collection has to stop, either
+    because posting failed or after 5 consecutive content failures
+    (which also sets result.success to False).
+    """
+    async_client = getattr(session, 'async_client', None)
+    executor = None
+    
+    if async_client:
+        window = Config.FETCH_WINDOW
+        
+        def submit(email_url):
+            logger.info(f"Fetching content: {email_url}")
+            return async_client.submit(
+                fetch_json_async(email_url, session, logger)
+            )
+    else:
+        window = Config.FETCH_WORKERS * 2
+        executor = ThreadPoolExecutor(
+            max_workers=Config.FETCH_WORKERS,
+            thread_name_prefix=f"{threading.current_thread().name}-fetch",
+            initializer=set_list_scope,
+            initargs=(current_list_scope(),)
+        )
+        
+        def submit(email_url):
+            return executor.submit(
+                fetch_email_content, email_url, session, logger
+            )
+    
+    in_flight = deque()
+    next_index = 0
+    consecutive_content_failures = 0
+    
+    try:
+        while next_index < len(email_urls) or in_flight:
+            while next_index < len(email_urls) and len(in_flight) < window:
+                email_url = email_urls[next_index]
+                in_flight.append((email_url, submit(email_url)))
+                next_index += 1
+                result.content_requests += 1
+            
+            email_url, future = in_flight.popleft()
+            email_content = future.result()
             
             if email_content:
-                new_emails.append(email_content)
+                result.collected_count += 1
                 consecutive_content_failures = 0  # Reset on success
                 logger.info(
-                    f"Fetched content (total: {len(new_emails)})"
+                    f"Fetched content (total: {result.collected_count})"
                 )
-            else:
-                failed_content_count += 1
-                consecutive_content_failures += 1
-                logger.error(f"Failed to fetch content: {email_url}")
                 
-                # Stop if too many consecutive content failures
-                if consecutive_content_failures >= 5:
+                # Blocks while the poster is behind (backpressure)
+                if not pipeline.add(EmailRecord.from_message(email_content)):
                     logger.error(
-                        f"Too many consecutive content fetch failures "
-                        f"({consecutive_content_failures}). "
-                        f"Stopping collection."
+                        "Bundle posting failed. Stopping collection."
                     )
-                    return EmailCollectionResult(
-                        emails=new_emails,
-                        success=False,
-                        failed_metadata_count=failed_metadata_count,
-                        failed_content_count=failed_content_count
-                    )
-        
-        offset += 1
-        time.sleep(Config.REQUEST_DELAY)
+                    return False
+                continue
+            
+            result.failed_content_count += 1
+            consecutive_content_failures += 1
+            logger.error(f"Failed to fetch content: {email_url}")
+            
+            # Stop if too many consecutive content failures
+            if consecutive_content_failures >= 5:
+                logger.error(
+                    f"Too many consecutive content fetch failures "
+                    f"({consecutive_content_failures}). "
+                    f"Stopping collection."
+                )
+                result.success = False
+                return False
+    finally:
+        # Abandon the rest of the window when collection stops early
+        for _, future in in_flight:
+            future.cancel()
+        if executor:
+            executor.shutdown(cancel_futures=True)
+    
+    return True
+
+
+def log_collection_summary(
+    result: EmailCollectionResult,
+    logger: logging.Logger
+) -> None:
+    """Log request counts and any failures of a collection"""
+    logger.info(
+        f"Collection issued {result.metadata_requests} metadata and "
+        f"{result.content_requests} content requests"
+    )
     
     # Log summary if there were failures
-    if failed_metadata_count > 0 or failed_content_count > 0:
+    if result.failed_metadata_count > 0 or result.failed_content_count > 0:
         logger.warning(
             f"Collection completed with failures: "
-            f"{failed_metadata_count} metadata, "
-            f"{failed_content_count} content"
+            f"{result.failed_metadata_count} metadata, "
+            f"{result.failed_content_count} content"
         )
+
+
+def collect_new_emails(
+    emails_url: str,
+    last_processed_hash: str,
+    pipeline: "BundlePipeline",
+    session: requests.Session,
+    logger: logging.Logger
+) -> EmailCollectionResult:
+    """
+    Collect all new emails until reaching last processed and stream them,
+    oldest first, into the bundle pipeline.
+    Metadata is fetched in pages of Config.PAGE_SIZE emails (newest first)
+    and only hashes and URLs are kept. Emails already in the dedup index
+    are skipped, and Config.DEDUP_STOP_AFTER_KNOWN consecutive known
+    emails end the scan even if the last processed hash is never seen.
+    Contents are then fetched concurrently and handed to the pipeline in
+    order, so bundles post while collection continues. Returns
+    EmailCollectionResult with failure counts and the number of requests
+    issued.
+    """
+    result = EmailCollectionResult()
+    pending = []  # (message_id_hash, url), newest first
+    consecutive_known = 0
+    
+    # Scan metadata pages until the last processed email
+    for page in fetch_metadata_pages(emails_url, result, session, logger):
+        reached_last_processed = False
+        for entry in page:
+            message_id_hash = entry.get('message_id_hash', '')
+            email_url = entry.get('url', '')
+            
+            logger.info(f"Found email: {message_id_hash}")
+            
+            # Check if reached last processed
+            if message_id_hash == last_processed_hash:
+                logger.info(f"Reached last processed: {message_id_hash}")
+                reached_last_processed = True
+                break
+            
+            # Skip emails that were already ingested; a long run of them
+            # means the cursor was lost and everything older is known
+            if pipeline.is_known(message_id_hash):
+                consecutive_known += 1
+                if consecutive_known >= Config.DEDUP_STOP_AFTER_KNOWN:
+                    logger.info(
+                        f"Reached {consecutive_known} consecutive "
+                        f"already ingested emails, stopping scan"
+                    )
+                    reached_last_processed = True
+                    break
+                continue
+            consecutive_known = 0
+            
+            if email_url:
+                pending.append((message_id_hash, email_url))
+        
+        if reached_last_processed:
+            break
+    
+    if not result.success:
+        return result
     
-    return EmailCollectionResult(
-        emails=new_emails,
-        success=True,
-        failed_metadata_count=failed_metadata_count,
-        failed_content_count=failed_content_count
+    logger.info(f"Found {len(pending)} new emails")
+    if not pending:
+        return result
+    
+    pipeline.start(target_hash=pending[0][0])
+    pending.reverse()  # Oldest first
+    
+    fetch_contents_in_order(
+        [email_url for _, email_url in pending],
+        pipeline,
+        result,
+        session,
+        logger
     )
+    if result.success:
+        log_collection_summary(result, logger)
+    return result
 
 
-# ==================== Bundle Processing ====================
-def process_email_bundles(
-    new_emails: List[Dict[str, Any]],
+# ==================== Thread Collection ====================
+def parse_api_date(value: str) -> Optional[datetime]:
+    """Parse an ISO 8601 timestamp from the archive API (None if invalid)"""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def load_thread_cursors(logger: logging.Logger) -> Dict[str, str]:
+    """Read the per-list thread activity cursors (empty if none saved)"""
+    if not os.path.exists(Config.THREAD_CURSOR_FILE):
+        return {}
+    return read_json_file(Config.THREAD_CURSOR_FILE, logger)
+
+
+def update_thread_cursor(
     list_name: str,
-    api_endpoint: str,
+    date_active: str,
+    logger: logging.Logger
+) -> None:
+    """Record that every thread active up to date_active is synced"""
+    with pull_file_lock:
+        cursors = load_thread_cursors(logger)
+        cursors[list_name] = date_active
+        write_json_file(Config.THREAD_CURSOR_FILE, cursors, logger)
+    logger.info(f"Updated thread cursor: {date_active}")
+
+
+def collect_thread_emails(
+    threads_url: str,
+    emails_url: str,
+    list_name: str,
+    last_processed_hash: str,
+    pipeline: "BundlePipeline",
     session: requests.Session,
     logger: logging.Logger
-) -> bool:
-    """Process collected emails in bundles"""
-    if not new_emails:
-        logger.info(f"No new emails for {list_name}")
-        return True
+) -> EmailCollectionResult:
+    """
+    Collect new emails thread by thread.
+    Threads are listed by last activity (newest first) and scanning
+    stops at the list's stored activity cursor, so a quiet list costs a
+    single request. Only emails dated after the cursor are fetched from
+    each changed thread. Threads are replayed oldest activity first and
+    each thread's new emails are flushed as their own bundle(s); the
+    cursor advances once a thread's last bundle is confirmed.
+    """
+    result = EmailCollectionResult()
+    cursor_value = load_thread_cursors(logger).get(list_name, "")
+    cursor = parse_api_date(cursor_value)
+    changed_threads = []  # newest activity first
+    
+    for page in fetch_metadata_pages(threads_url, result, session, logger):
+        reached_cursor = False
+        for thread in page:
+            date_active = parse_api_date(thread.get('date_active', ''))
+            if cursor and date_active and date_active <= cursor:
+                logger.info(f"Reached thread cursor: {cursor_value}")
+                reached_cursor = True
+                break
+            if thread.get('emails'):
+                changed_threads.append(thread)
+        
+        # Without a cursor, a list already synced by the emails feed
+        # catches up through the feed once; the cursor is then seeded
+        # from the most recently active thread
+        if not cursor and last_processed_hash and changed_threads:
+            newest = changed_threads[0].get('date_active', '')
+            logger.info(
+                f"No thread cursor for {list_name}, catching up from the "
+                f"emails feed before switching to threads at {newest}"
+            )
+            feed_result = collect_new_emails(
+                emails_url, last_processed_hash, pipeline, session, logger
+            )
+            feed_result.metadata_requests += result.metadata_requests
+            if feed_result.success:
+                pipeline.flush(
+                    lambda: update_thread_cursor(list_name, newest, logger)
+                )
+            return feed_result
+        
+        if reached_cursor:
+            break
     
-    logger.info(f"Processing {len(new_emails)} emails in bundles")
+    if not result.success:
+        return result
     
-    # Reverse to process oldest first
-    new_emails.reverse()
+    logger.info(f"Found {len(changed_threads)} threads with new activity")
+    if not changed_threads:
+        return result
     
-    # Calculate total bundles
-    total_bundles = (
-        (len(new_emails) + Config.BUNDLE_THRESHOLD - 1) 
-        // Config.BUNDLE_THRESHOLD
-    )
+    pipeline.start(target_hash="")
     
-    # Process each bundle
-    for idx in range(0, len(new_emails), Config.BUNDLE_THRESHOLD):
-        bundle_end = min(idx + Config.BUNDLE_THRESHOLD, len(new_emails))
-        bundle = new_emails[idx:bundle_end]
-        bundle_num = (idx // Config.BUNDLE_THRESHOLD) + 1
+    for thread in reversed(changed_threads):
+        thread_id = thread.get('thread_id', thread.get('emails'))
+        email_urls = []
+        for page in fetch_metadata_pages(
+            thread['emails'], result, session, logger
+        ):
+            for entry in page:
+                email_date = parse_api_date(entry.get('date', ''))
+                if cursor and email_date and email_date <= cursor:
+                    continue
+                if pipeline.is_known(entry.get('message_id_hash', '')):
+                    continue
+                if entry.get('url'):
+                    email_urls.append(entry['url'])
         
-        logger.info(
-            f"Bundle {bundle_num}/{total_bundles} "
-            f"({len(bundle)} messages)"
-        )
+        if not result.success:
+            return result
         
-        success = post_bundle_with_retry(
-            api_endpoint, 
-            bundle, 
-            session, 
-            logger
+        logger.info(f"Thread {thread_id}: {len(email_urls)} new emails")
+        if not fetch_contents_in_order(
+            email_urls, pipeline, result, session, logger
+        ):
+            return result
+        
+        # Post the thread as its own bundle(s), then move the cursor
+        date_active = thread.get('date_active', '')
+        if not pipeline.flush(
+            lambda date_active=date_active: update_thread_cursor(
+                list_name, date_active, logger
+            )
+        ):
+            logger.error("Bundle posting failed. Stopping collection.")
+            return result
+    
+    log_collection_summary(result, logger)
+    return result
+
+
+# ==================== Bundle Processing ====================
+class BundlePipeline:
+    """
+    Bounded producer/consumer pipeline that posts bundles while
+    collection is still running.
+    The collecting thread adds emails oldest first; a bundle is closed
+    when it reaches the session's adaptive byte or message target
+    (Config.BUNDLE_THRESHOLD messages without a sizer) and is queued for
+    a poster thread. At most Config.QUEUE_BUNDLES bundles wait in the
+    queue, so a slow ingest API blocks collection instead of letting
+    the backlog pile up in memory. The list's cursor is checkpointed
+    after every bundle that is posted (or durably spooled), and the
+    bundle's messages are recorded in the dedup index first.
+    """
+    def __init__(
+        self,
+        list_name: str,
+        pull_data: Dict[str, str],
+        api_endpoint: str,
+        dedup_index: Optional[DedupIndex],
+        session: requests.Session,
+        logger: logging.Logger
+    ):
+        self.list_name = list_name
+        self.pull_data = pull_data
+        self.api_endpoint = api_endpoint
+        self.dedup_index = dedup_index
+        self.session = session
+        self.logger = logger
+        self.failed = False
+        self.posted_count = 0
+        self.bundle_count = 0
+        self.checkpoint: Optional[Dict[str, Any]] = None
+        self.bundle_sizer = getattr(session, 'bundle_sizer', None)
+        self.metrics = getattr(session, 'metrics', None)
+        self._bundle: List[EmailRecord] = []
+        self._bundle_bytes = 0
+        self._queue = queue.Queue(maxsize=Config.QUEUE_BUNDLES)
+        self._poster: Optional[threading.Thread] = None
+    
+    def start(self, target_hash: str) -> None:
+        """
+        Start the poster thread for a catch-up ending at target_hash
+        (empty if not known in advance)
+        """
+        self.checkpoint = new_checkpoint(target_hash)
+        self._poster = threading.Thread(
+            target=self._run,
+            name=f"{threading.current_thread().name}-post",
+            daemon=True
         )
+        self._poster.start()
+    
+    def is_known(self, message_id_hash: str) -> bool:
+        """Whether the email was already ingested for this list"""
+        if not self.dedup_index or not message_id_hash:
+            return False
+        return self.dedup_index.contains(self.list_name, message_id_hash)
+    
+    def add(self, record: EmailRecord) -> bool:
+        """
+        Add an email (oldest first). Blocks while the queue is full.
+        Returns False once posting has failed and collection should stop.
+        """
+        if self.failed:
+            return False
+        
+        self._bundle.append(record)
+        if self.bundle_sizer:
+            self._bundle_bytes += record.size
+            full = self.bundle_sizer.is_full(
+                len(self._bundle), self._bundle_bytes
+            )
+        else:
+            full = len(self._bundle) >= Config.BUNDLE_THRESHOLD
+        
+        if full:
+            self._enqueue()
+        return not self.failed
+    
+    def flush(
+        self,
+        on_confirmed: Optional[Callable[[], None]] = None
+    ) -> bool:
+        """
+        Close the current bundle even if it is not full. on_confirmed is
+        called by the poster once everything added so far is posted
+        (immediately if nothing was ever added).
+        Returns False once posting has failed.
+        """
+        if self.failed:
+            return False
+        if self._poster is None:
+            if on_confirmed:
+                on_confirmed()
+            return True
+        self._enqueue(on_confirmed)
+        return not self.failed
+    
+    def _enqueue(
+        self,
+        on_confirmed: Optional[Callable[[], None]] = None
+    ) -> None:
+        if self._bundle or on_confirmed:
+            started = time.monotonic()
+            self._queue.put((self._bundle, on_confirmed))
+            if self.metrics:
+                self.metrics.increment(
+                    'sleep_seconds',
+                    time.monotonic() - started,
+                    reason='backpressure'
+                )
+        self._bundle = []
+        self._bundle_bytes = 0
+    
+    def finish(self) -> bool:
+        """
+        Queue the last partial bundle and wait for the poster to drain.
+        Returns True if every queued bundle was posted.
+        """
+        if self._poster is None:
+            self.logger.info(f"No new emails for {self.list_name}")
+            return True
         
-        if not success:
-            logger.error(f"Failed bundle {bundle_num}/{total_bundles}")
-            cache_path = save_cache_file(list_name, bundle, logger)
-            logger.error(f"Saved to cache: {cache_path}")
-            logger.error(f"Terminated for {list_name}")
+        if not self.failed:
+            self._enqueue()
+        self._bundle = []
+        self._queue.put(None)
+        self._poster.join()
+        
+        if self.failed:
             return False
         
-        # Delay between bundles
-        if bundle_end < len(new_emails):
-            time.sleep(Config.BATCH_DELAY)
+        self.checkpoint['complete'] = True
+        save_checkpoint(self.list_name, self.checkpoint, self.logger)
+        self.logger.info(f"Successfully processed {self.posted_count} emails")
+        return True
     
-    logger.info(f"Successfully processed {len(new_emails)} emails")
-    return True
+    def _run(self) -> None:
+        """Poster thread: post queued bundles until the end marker"""
+        set_list_scope(self.list_name)
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            
+            # After a failure keep draining so the producer never blocks;
+            # dropped bundles are refetched on the next run
+            if self.failed:
+                continue
+            
+            bundle, on_confirmed = item
+            try:
+                if bundle:
+                    self._post(bundle)
+                if on_confirmed and not self.failed:
+                    on_confirmed()
+            except Exception as e:
+                self.logger.error(
+                    f"Unexpected error posting bundle: {e}",
+                    exc_info=True
+                )
+                self.failed = True
+    
+    def _post(self, bundle: List[EmailRecord]) -> None:
+        """
+        Post one bundle, splitting it in half if the API rejects it as
+        too large and spooling it if every attempt fails
+        """
+        self.bundle_count += 1
+        bundle_num = self.bundle_count
+        self.logger.info(f"Bundle {bundle_num} ({len(bundle)} messages)")
+        
+        outcome = post_bundle_with_retry(
+            self.api_endpoint,
+            bundle,
+            self.session,
+            self.logger
+        )
+        
+        if outcome == POST_TOO_LARGE and len(bundle) > 1:
+            middle = len(bundle) // 2
+            self.logger.warning(
+                f"Bundle {bundle_num} too large, splitting into "
+                f"{middle} + {len(bundle) - middle} messages"
+            )
+            self._post(bundle[:middle])
+            if not self.failed:
+                self._post(bundle[middle:])
+            return
+        
+        if outcome != POST_OK:
+            self.logger.error(f"Failed bundle {bundle_num}")
+            spool_path = save_cache_file(self.list_name, bundle, self.logger)
+            self.logger.error(f"Saved to spool: {spool_path}")
+            
+            # A spooled bundle will be replayed, so the cursor may move on
+            if spool_path:
+                self._record(bundle)
+                checkpoint_bundle(
+                    self.pull_data,
+                    self.list_name,
+                    bundle,
+                    self.checkpoint,
+                    self.logger
+                )
+            
+            self.logger.error(f"Terminated for {self.list_name}")
+            self.failed = True
+            return
+        
+        self.posted_count += len(bundle)
+        self._record(bundle)
+        checkpoint_bundle(
+            self.pull_data,
+            self.list_name,
+            bundle,
+            self.checkpoint,
+            self.logger
+        )
+    
+    def _record(self, bundle: List[EmailRecord]) -> None:
+        """Add a confirmed bundle's messages to the dedup index"""
+        if self.dedup_index:
+            self.dedup_index.add_many(
+                self.list_name,
+                [record.message_id_hash for record in bundle]
+            )
+
+
+# ==================== Progress Tracking ====================
+# Serializes pull.json and checkpoint updates from concurrently synced lists
+pull_file_lock = threading.Lock()
 
 
 def update_pull_file(
@@ -887,11 +2013,86 @@ def update_pull_file(
     logger: logging.Logger
 ) -> None:
     """Update pull.json with latest processed hash"""
-    pull_data[list_name] = latest_hash
-    write_json_file(Config.PULL_FILE, pull_data, logger)
+    with pull_file_lock:
+        pull_data[list_name] = latest_hash
+        write_json_file(Config.PULL_FILE, pull_data, logger)
     logger.info(f"Updated pull.json with hash: {latest_hash}")
 
 
+def load_checkpoints(logger: logging.Logger) -> Dict[str, Dict[str, Any]]:
+    """Read all per-list catch-up checkpoints (empty if none saved yet)"""
+    if not os.path.exists(Config.CHECKPOINT_FILE):
+        return {}
+    
+    try:
+        with open(Config.CHECKPOINT_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception as e:
+        logger.error(f"Error reading {Config.CHECKPOINT_FILE}: {e}")
+        return {}
+
+
+def new_checkpoint(target_hash: str) -> Dict[str, Any]:
+    """Start a checkpoint for a catch-up that ends at target_hash"""
+    now = datetime.now().isoformat()
+    return {
+        "target_hash": target_hash,
+        "oldest_confirmed_hash": "",
+        "newest_confirmed_hash": "",
+        "confirmed_count": 0,
+        "complete": False,
+        "started_at": now,
+        "updated_at": now
+    }
+
+
+def save_checkpoint(
+    list_name: str,
+    checkpoint: Dict[str, Any],
+    logger: logging.Logger
+) -> None:
+    """Store a list's checkpoint, replacing the file atomically"""
+    checkpoint['updated_at'] = datetime.now().isoformat()
+    with pull_file_lock:
+        checkpoints = load_checkpoints(logger)
+        checkpoints[list_name] = dict(checkpoint)
+        write_json_file(Config.CHECKPOINT_FILE, checkpoints, logger)
+
+
+def checkpoint_bundle(
+    pull_data: Dict[str, str],
+    list_name: str,
+    bundle: List[EmailRecord],
+    checkpoint: Dict[str, Any],
+    logger: logging.Logger
+) -> None:
+    """
+    Advance the list's cursor past a confirmed bundle (oldest first) and
+    record the catch-up progress. Both files are replaced atomically.
+    """
+    hashes = [
+        record.message_id_hash
+        for record in bundle
+        if record.message_id_hash
+    ]
+    if not hashes:
+        return
+    
+    if not checkpoint['oldest_confirmed_hash']:
+        checkpoint['oldest_confirmed_hash'] = hashes[0]
+    checkpoint['newest_confirmed_hash'] = hashes[-1]
+    checkpoint['confirmed_count'] += len(bundle)
+    checkpoint['complete'] = hashes[-1] == checkpoint['target_hash']
+    
+    update_pull_file(pull_data, list_name, hashes[-1], logger)
+    save_checkpoint(list_name, checkpoint, logger)
+    
+    logger.info(
+        f"Checkpoint: {checkpoint['confirmed_count']} emails confirmed "
+        f"up to {hashes[-1]}"
+    )
+
+
 # ==================== List Processing ====================
 class ProcessingResult:
     """Result of processing a single mailing list"""
@@ -899,17 +2100,20 @@ class ProcessingResult:
         self, 
         success: bool, 
         error_type: Optional[str] = None,
-        error_message: Optional[str] = None
+        error_message: Optional[str] = None,
+        posted_count: int = 0
     ):
         self.success = success
         self.error_type = error_type  # 'cache_failed', 'api_failed', etc.
         self.error_message = error_message
+        self.posted_count = posted_count  # New emails posted
 
 
 def process_single_list(
     list_info: Dict[str, Any],
     pull_data: Dict[str, str],
     api_endpoint: str,
+    dedup_index: Optional[DedupIndex],
     session: requests.Session,
     logger: logging.Logger
 ) -> ProcessingResult:
@@ -920,13 +2124,29 @@ def process_single_list(
     display_name = list_info['display_name']
     emails_url = list_info['emails']
     last_processed_hash = pull_data.get(display_name, "")
+    sync_mode = list_info.get('sync_mode', Config.SYNC_MODE)
+    if sync_mode == "threads" and not list_info.get('threads'):
+        logger.warning(
+            f"No threads URL for {display_name}, using the emails feed"
+        )
+        sync_mode = "emails"
     
     logger.info("=" * 50)
     logger.info(f"Processing list: {display_name}")
     logger.info(f"Last processed: {last_processed_hash}")
+    logger.info(f"Sync mode: {sync_mode}")
     
-    # Step 1: Process cache files
-    logger.info(f"Step 1: Processing cache for {display_name}")
+    with pull_file_lock:
+        checkpoint = load_checkpoints(logger).get(display_name)
+    if checkpoint and not checkpoint.get('complete', True):
+        logger.info(
+            f"Resuming interrupted catch-up: "
+            f"{checkpoint.get('confirmed_count', 0)} emails were confirmed "
+            f"up to {checkpoint.get('newest_confirmed_hash')}"
+        )
+    
+    # Step 1: Replay spooled messages from earlier failures
+    logger.info(f"Step 1: Replaying spool for {display_name}")
     cache_success = process_all_cache_files(
         display_name, 
         api_endpoint, 
@@ -934,7 +2154,7 @@ def process_single_list(
         logger
     )
     if not cache_success:
-        error_msg = f"Failed to process cache files for {display_name}"
+        error_msg = f"Failed to replay spooled messages for {display_name}"
         logger.error(error_msg)
         return ProcessingResult(
             success=False,
@@ -942,14 +2162,36 @@ def process_single_list(
             error_message=error_msg
         )
     
-    # Step 2: Collect new emails
-    logger.info(f"Step 2: Collecting new emails")
-    collection_result = collect_new_emails(
-        emails_url,
-        last_processed_hash,
+    # Step 2: Collect new emails and post them in bundles as they fill,
+    # checkpointing pull.json as each bundle is confirmed
+    logger.info(f"Step 2: Collecting and posting new emails")
+    pipeline = BundlePipeline(
+        display_name,
+        pull_data,
+        api_endpoint,
+        dedup_index,
         session,
         logger
     )
+    if sync_mode == "threads":
+        collection_result = collect_thread_emails(
+            list_info['threads'],
+            emails_url,
+            display_name,
+            last_processed_hash,
+            pipeline,
+            session,
+            logger
+        )
+    else:
+        collection_result = collect_new_emails(
+            emails_url,
+            last_processed_hash,
+            pipeline,
+            session,
+            logger
+        )
+    success = pipeline.finish()
     
     # Check if collection failed critically
     if not collection_result.success:
@@ -972,42 +2214,707 @@ def process_single_list(
             f"to fetch content for {display_name}"
         )
     
-    new_emails = collection_result.emails
+    if not success:
+        error_msg = (
+            f"Failed to post email bundles for {display_name}. "
+            f"Check cache folder for failed bundles."
+        )
+        logger.error(error_msg)
+        return ProcessingResult(
+            success=False,
+            error_type="api_failed",
+            error_message=error_msg
+        )
+    
+    return ProcessingResult(success=True, posted_count=pipeline.posted_count)
+
+
+def run_list_worker(
+    list_info: Dict[str, Any],
+    pull_data: Dict[str, str],
+    api_endpoint: str,
+    dedup_index: Optional[DedupIndex],
+    session: requests.Session,
+    logger: logging.Logger
+) -> ProcessingResult:
+    """
+    Process a single mailing list on a worker thread.
+    Unexpected exceptions are turned into a failed ProcessingResult so one
+    list can never abort the others.
+    """
+    display_name = list_info.get('display_name', 'Unknown')
+    threading.current_thread().name = display_name
     
-    # Step 3: Update pull.json with latest hash
-    if new_emails:
-        latest_hash = new_emails[0].get('message_id_hash', '')
-        if latest_hash:
-            update_pull_file(pull_data, display_name, latest_hash, logger)
+    try:
+        with session.metrics.list_scope(display_name):
+            return process_single_list(
+                list_info,
+                pull_data,
+                api_endpoint,
+                dedup_index,
+                session,
+                logger
+            )
+    except Exception as e:
+        logger.exception(f"Unexpected error while processing {display_name}")
+        return ProcessingResult(
+            success=False,
+            error_type="unexpected_error",
+            error_message=str(e)
+        )
+
+
+def report_list_result(
+    display_name: str,
+    result: ProcessingResult,
+    logger: logging.Logger
+) -> None:
+    """Log the outcome of processing a single mailing list"""
+    if result.success:
+        logger.info(f"Successfully completed {display_name}")
+        return
     
-    # Step 4: Process emails in bundles
-    logger.info(f"Step 3: Processing email bundles")
-    success = process_email_bundles(
-        new_emails,
-        display_name,
-        api_endpoint,
+    # Handle different error types
+    if result.error_type == "cache_failed":
+        logger.error(
+            f"Cache processing failed for {display_name}. "
+            f"Will retry on next run."
+        )
+        # Cache will be retried later
+        
+    elif result.error_type == "collection_failed":
+        logger.error(
+            f"Email collection failed for {display_name}. "
+            f"Details: {result.error_message}"
+        )
+        # Will retry collection on next run
+        
+    elif result.error_type == "api_failed":
+        logger.error(
+            f"API posting failed for {display_name}. "
+            f"Failed bundles saved to cache folder."
+        )
+        # Failed bundles are cached
+        
+    else:
+        logger.error(
+            f"Unknown error for {display_name}: "
+            f"{result.error_message}"
+        )
+
+
+def sync_lists_once(
+    mailing_lists: List[Dict[str, Any]],
+    pull_data: Dict[str, str],
+    api_endpoint: str,
+    dedup_index: Optional[DedupIndex],
+    session: requests.Session,
+    logger: logging.Logger
+) -> List[str]:
+    """
+    Sync every list once, Config.LIST_WORKERS at a time; each list keeps
+    its own cursor in pull.json and failures stay isolated to that list.
+    Returns the display names of the lists that failed.
+    """
+    failed_lists = []
+    with ThreadPoolExecutor(max_workers=Config.LIST_WORKERS) as executor:
+        futures = {
+            executor.submit(
+                run_list_worker,
+                list_info,
+                pull_data,
+                api_endpoint,
+                dedup_index,
+                session,
+                logger
+            ): list_info.get('display_name', 'Unknown')
+            for list_info in mailing_lists
+        }
+        
+        for future in as_completed(futures):
+            display_name = futures[future]
+            result = future.result()
+            report_list_result(display_name, result, logger)
+            if not result.success:
+                failed_lists.append(display_name)
+    
+    return failed_lists
+
+
+# ==================== Backfill ====================
+def parse_cli_date(value: str) -> datetime:
+    """Parse a YYYY-MM-DD command line date (midnight UTC)"""
+    try:
+        parsed = datetime.strptime(value, "%Y-%m-%d")
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"invalid date '{value}', expected YYYY-MM-DD"
+        )
+    return parsed.replace(tzinfo=timezone.utc)
+
+
+def fetch_archive_snapshot(
+    emails_url: str,
+    session: requests.Session,
+    logger: logging.Logger
+) -> Optional[Tuple[int, Dict[str, Any]]]:
+    """
+    Fetch the archive size and its newest email entry.
+    Returns (count, newest entry) or None if the request failed.
+    """
+    page = fetch_email_metadata(
+        f"{emails_url}?limit=1&offset=0", session, logger
+    )
+    if page is None or 'count' not in page:
+        logger.error(f"Failed to read archive size from {emails_url}")
+        return None
+    
+    results = page.get('results', [])
+    return page['count'], (results[0] if results else {})
+
+
+def find_date_offset(
+    emails_url: str,
+    total: int,
+    boundary: datetime,
+    session: requests.Session,
+    logger: logging.Logger
+) -> Optional[int]:
+    """
+    Binary search for the first offset whose email is dated before
+    boundary. The archive is ordered newest first, so everything older
+    than boundary starts there. Costs about log2(total) one-email page
+    requests. Returns None if a probe failed.
+    """
+    low, high = 0, total
+    while low < high:
+        middle = (low + high) // 2
+        page = fetch_email_page(emails_url, middle, 1, session, logger)
+        if not page:
+            logger.error(f"Failed to probe archive at offset {middle}")
+            return None
+        
+        email_date = parse_api_date(page[0].get('date', ''))
+        if email_date is not None and email_date < boundary:
+            high = middle
+        else:
+            low = middle + 1
+    return low
+
+
+def plan_shards(
+    emails_url: str,
+    start: int,
+    stop: int,
+    since: Optional[datetime],
+    until: Optional[datetime],
+    session: requests.Session,
+    logger: logging.Logger
+) -> Optional[List[Tuple[int, Optional[datetime], Optional[datetime]]]]:
+    """
+    Split offsets [start, stop) into shards of about
+    Config.BACKFILL_SHARD_SIZE emails, bounded by dates rather than
+    offsets: the date of the email at each shard boundary is the until
+    bound of the shard starting there and the since bound of the one
+    before it. Posts arriving during the backfill shift offsets, but an
+    email keeps its date, so it stays in its shard. New posts only move
+    emails to higher offsets, so a shard starting one page before its
+    boundary offset still reaches its newest emails.
+    Returns (start offset, since, until) triples, or None if a boundary
+    probe failed.
+    """
+    shards = []
+    shard_start, shard_until = start, until
+    for offset in range(start + Config.BACKFILL_SHARD_SIZE, stop,
+                        Config.BACKFILL_SHARD_SIZE):
+        page = fetch_email_page(emails_url, offset, 1, session, logger)
+        if not page:
+            logger.error(f"Failed to probe archive at offset {offset}")
+            return None
+        
+        # An undated or out-of-order boundary would leave an empty or
+        # inverted date range, so the current shard grows past it
+        boundary = parse_api_date(page[0].get('date', ''))
+        if (boundary is None
+                or (shard_until and boundary >= shard_until)
+                or (since and boundary <= since)):
+            continue
+        shards.append((shard_start, boundary, shard_until))
+        shard_start = max(0, offset - Config.PAGE_SIZE)
+        shard_until = boundary
+    shards.append((shard_start, since, shard_until))
+    return shards
+
+
+def backfill_shard(
+    emails_url: str,
+    store: BackfillStore,
+    shard_id: int,
+    session: requests.Session,
+    logger: logging.Logger
+) -> bool:
+    """
+    Crawl one shard page by page from its next offset, writing the
+    contents of emails dated in the shard's [since, until) range to the
+    store after each page. The shard ends once a whole page is older than
+    since, or at the end of the archive.
+    Returns False after 3 consecutive metadata failures (the shard stays
+    pending and resumes on the next run).
+    """
+    shard = store.open_shard(shard_id)
+    offset = shard['next_offset']
+    since = parse_api_date(shard['since'])
+    until = parse_api_date(shard['until'])
+    largest_page = 0
+    consecutive_metadata_failures = 0
+    
+    logger.info(
+        f"Backfilling shard {shard_id} from offset {offset}, emails dated "
+        f"{shard['since'] or 'the start'} to {shard['until'] or 'now'}"
+    )
+    
+    while True:
+        limit = Config.PAGE_SIZE
+        page = fetch_email_page(emails_url, offset, limit, session, logger)
+        if page is None:
+            consecutive_metadata_failures += 1
+            if consecutive_metadata_failures >= 3:
+                logger.error(
+                    f"Too many consecutive metadata fetch failures in "
+                    f"shard {shard_id} (offset {offset})"
+                )
+                return False
+            continue
+        consecutive_metadata_failures = 0
+        
+        email_urls = []
+        older_count = 0
+        for entry in page:
+            email_date = parse_api_date(entry.get('date', ''))
+            if email_date and since and email_date < since:
+                older_count += 1
+                continue
+            if email_date and until and email_date >= until:
+                continue
+            if entry.get('url'):
+                email_urls.append(entry['url'])
+        
+        messages = []
+        failed = []
+        for email_url in email_urls:
+            email_content = fetch_email_content(email_url, session, logger)
+            if email_content:
+                messages.append(
+                    EmailRecord.from_message(email_content).payload
+                )
+            else:
+                logger.error(f"Failed to fetch content: {email_url}")
+                failed.append(email_url)
+        
+        offset += len(page)
+        store.append(shard_id, messages, offset, failed)
+        
+        # A short page is the end of the archive (the server may cap the
+        # page size); a page entirely older than since means the rest of
+        # the archive belongs to later shards
+        largest_page = max(largest_page, len(page))
+        if (not page or len(page) < min(limit, largest_page)
+                or older_count == len(page)):
+            break
+    
+    store.complete_shard(shard_id)
+    logger.info(f"Completed shard {shard_id}")
+    return True
+
+
+def plan_backfill(
+    list_info: Dict[str, Any],
+    store: BackfillStore,
+    since: Optional[datetime],
+    until: Optional[datetime],
+    session: requests.Session,
+    logger: logging.Logger
+) -> bool:
+    """
+    Snapshot the archive and write a new manifest covering [since, until).
+    Offsets of the range ends are found by binary search on email dates
+    and padded by one page, since Date headers are not strictly ordered;
+    the shards between them are planned by plan_shards.
+    Returns False if the archive could not be probed.
+    """
+    emails_url = list_info['emails']
+    snapshot = fetch_archive_snapshot(emails_url, session, logger)
+    if snapshot is None:
+        return False
+    total, newest = snapshot
+    
+    start, end = 0, None
+    if until:
+        start = find_date_offset(emails_url, total, until, session, logger)
+        if start is None:
+            return False
+        start = max(0, start - Config.PAGE_SIZE)
+    if since:
+        end = find_date_offset(emails_url, total, since, session, logger)
+        if end is None:
+            return False
+        end = min(total, end + Config.PAGE_SIZE)
+    
+    shards = plan_shards(
+        emails_url,
+        start,
+        total if end is None else end,
+        since,
+        until,
         session,
         logger
     )
+    if shards is None:
+        return False
+    store.plan(
+        {
+            "list_name": list_info['display_name'],
+            "emails_url": emails_url,
+            "since": since.isoformat() if since else None,
+            "until": until.isoformat() if until else None,
+            "archive_count": total,
+            "newest_hash": newest.get('message_id_hash', ''),
+            "shard_size": Config.BACKFILL_SHARD_SIZE
+        },
+        shards
+    )
+    logger.info(
+        f"Planned {len(shards)} shards from offset {start} "
+        f"of {total} emails"
+    )
+    return True
+
+
+def backfill_list(
+    list_info: Dict[str, Any],
+    pull_data: Dict[str, str],
+    since: Optional[datetime],
+    until: Optional[datetime],
+    session: requests.Session,
+    logger: logging.Logger
+) -> ProcessingResult:
+    """
+    Bulk-load a list's archive into its local backfill store, crawling
+    shards with Config.BACKFILL_WORKERS workers. An interrupted backfill
+    with the same range resumes from its manifest. A complete backfill
+    without an upper bound hands off to incremental sync by setting the
+    list's pull.json cursor to the newest email at planning time, unless
+    the list already has a cursor.
+    """
+    display_name = list_info['display_name']
+    emails_url = list_info['emails']
+    store = BackfillStore(
+        os.path.join(
+            Config.BACKFILL_FOLDER, normalize_list_name(display_name)
+        )
+    )
     
-    if not success:
+    logger.info("=" * 50)
+    logger.info(f"Backfilling list: {display_name}")
+    
+    requested = (
+        since.isoformat() if since else None,
+        until.isoformat() if until else None
+    )
+    manifest = store.manifest
+    if manifest and requested == (manifest['since'], manifest['until']):
+        totals = store.totals()
+        logger.info(
+            f"Resuming backfill: {totals['done']}/{totals['shards']} "
+            f"shards done, {totals['written']} emails stored"
+        )
+    else:
+        if manifest:
+            logger.warning(
+                "Discarding earlier backfill with a different range"
+            )
+        if not plan_backfill(
+            list_info, store, since, until, session, logger
+        ):
+            return ProcessingResult(
+                success=False,
+                error_type="collection_failed",
+                error_message=f"Failed to plan backfill for {display_name}"
+            )
+    
+    pending = store.pending_shards()
+    with ThreadPoolExecutor(
+        max_workers=Config.BACKFILL_WORKERS,
+        thread_name_prefix=f"{display_name}-shard",
+        initializer=set_list_scope,
+        initargs=(display_name,)
+    ) as executor:
+        list(executor.map(
+            lambda shard_id: backfill_shard(
+                emails_url, store, shard_id, session, logger
+            ),
+            pending
+        ))
+    
+    totals = store.totals()
+    logger.info(
+        f"Backfill stored {totals['written']} emails in "
+        f"{totals['done']}/{totals['shards']} shards"
+    )
+    if totals['failed']:
+        logger.warning(
+            f"{totals['failed']} emails failed to fetch content "
+            f"(listed in {store.manifest_path})"
+        )
+    if not store.is_complete():
         error_msg = (
-            f"Failed to post email bundles for {display_name}. "
-            f"Check cache folder for failed bundles."
+            f"Backfill of {display_name} is incomplete. "
+            f"Run it again to resume."
         )
         logger.error(error_msg)
         return ProcessingResult(
             success=False,
-            error_type="api_failed",
+            error_type="collection_failed",
             error_message=error_msg
         )
     
+    # Hand off to incremental sync right after the backfilled range
+    newest_hash = store.manifest['newest_hash']
+    if until is None and newest_hash and not store.manifest['handed_off']:
+        if pull_data.get(display_name):
+            logger.info(
+                f"Keeping existing cursor {pull_data[display_name]}"
+            )
+        else:
+            update_pull_file(pull_data, display_name, newest_hash, logger)
+            logger.info(f"Handed off to incremental sync at {newest_hash}")
+        store.mark_handed_off()
+    
     return ProcessingResult(success=True)
 
 
+def run_backfill(
+    mailing_lists: List[Dict[str, Any]],
+    pull_data: Dict[str, str],
+    since: Optional[datetime],
+    until: Optional[datetime],
+    session: requests.Session,
+    logger: logging.Logger
+) -> List[str]:
+    """Backfill lists one after another. Returns the failed list names."""
+    failed_lists = []
+    for list_info in mailing_lists:
+        display_name = list_info.get('display_name', 'Unknown')
+        try:
+            with session.metrics.list_scope(display_name):
+                result = backfill_list(
+                    list_info, pull_data, since, until, session, logger
+                )
+        except Exception as e:
+            logger.exception(
+                f"Unexpected error while backfilling {display_name}"
+            )
+            result = ProcessingResult(
+                success=False,
+                error_type="unexpected_error",
+                error_message=str(e)
+            )
+        report_list_result(display_name, result, logger)
+        if not result.success:
+            failed_lists.append(display_name)
+    return failed_lists
+
+
+# ==================== Daemon ====================
+def run_daemon(
+    mailing_lists: List[Dict[str, Any]],
+    pull_data: Dict[str, str],
+    api_endpoint: str,
+    dedup_index: Optional[DedupIndex],
+    session: requests.Session,
+    logger: logging.Logger
+) -> List[str]:
+    """
+    Keep syncing lists until SIGINT or SIGTERM, reusing the session,
+    response cache and dedup index across syncs. Each list is polled
+    every Config.DAEMON_POLL_INTERVAL seconds (or its own
+    "poll_interval" in the lists file), backing off on quiet lists up to
+    Config.DAEMON_MAX_INTERVAL. With Config.DAEMON_TRIGGER_PORT set, a
+    local HTTP endpoint accepts immediate sync requests. Metrics files
+    are rewritten after every sync.
+    Returns the display names of the lists whose last sync failed.
+    """
+    scheduler = PollScheduler(Config.DAEMON_BACKOFF_FACTOR)
+    lists_by_name = {}
+    for list_info in mailing_lists:
+        display_name = list_info.get('display_name', 'Unknown')
+        lists_by_name[display_name] = list_info
+        scheduler.add_list(
+            display_name,
+            list_info.get('poll_interval', Config.DAEMON_POLL_INTERVAL),
+            Config.DAEMON_MAX_INTERVAL
+        )
+    
+    trigger_server = None
+    if Config.DAEMON_TRIGGER_PORT:
+        trigger_server = TriggerServer(
+            scheduler,
+            Config.DAEMON_TRIGGER_HOST,
+            Config.DAEMON_TRIGGER_PORT,
+            Config.DAEMON_TRIGGER_TOKEN,
+            on_trigger=lambda name: logger.info(
+                f"Sync triggered for {name or 'all lists'}"
+            )
+        ).start()
+        logger.info(
+            f"Sync trigger listening on http://{Config.DAEMON_TRIGGER_HOST}:"
+            f"{Config.DAEMON_TRIGGER_PORT}/sync"
+        )
+    
+    def stop(signum, frame):
+        logger.info(
+            f"Received signal {signum}, stopping after running syncs"
+        )
+        scheduler.stop()
+    
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+    
+    failed_lists = set()
+    metrics_lock = threading.Lock()
+    
+    def on_synced(display_name, future):
+        result = future.result()
+        report_list_result(display_name, result, logger)
+        if result.success:
+            failed_lists.discard(display_name)
+        else:
+            failed_lists.add(display_name)
+        delay = scheduler.complete(
+            display_name, result.posted_count, result.success
+        )
+        logger.info(
+            f"{display_name}: {result.posted_count} new emails, "
+            f"next sync in {delay:.0f}s"
+        )
+        with metrics_lock:
+            write_run_metrics(
+                session,
+                {"mode": "daemon", "schedule": scheduler.status()},
+                logger
+            )
+    
+    logger.info(
+        f"Daemon started: {len(lists_by_name)} lists, polling every "
+        f"{Config.DAEMON_POLL_INTERVAL}-{Config.DAEMON_MAX_INTERVAL}s"
+    )
+    try:
+        with ThreadPoolExecutor(
+            max_workers=Config.LIST_WORKERS
+        ) as executor:
+            while True:
+                due = scheduler.wait_due()
+                if not due:
+                    break
+                for display_name in due:
+                    future = executor.submit(
+                        run_list_worker,
+                        lists_by_name[display_name],
+                        pull_data,
+                        api_endpoint,
+                        dedup_index,
+                        session,
+                        logger
+                    )
+                    future.add_done_callback(
+                        lambda future, display_name=display_name:
+                            on_synced(display_name, future)
+                    )
+    finally:
+        if trigger_server:
+            trigger_server.stop()
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    
+    logger.info("Daemon stopped")
+    return sorted(failed_lists)
+
+
 # ==================== Main Entry Point ====================
-def main():
+def write_run_metrics(
+    session: requests.Session,
+    extra: Dict[str, Any],
+    logger: logging.Logger
+) -> None:
+    """
+    Write the run's metrics to Config.METRICS_SUMMARY_FILE (JSON) and,
+    if configured, Config.METRICS_PROMETHEUS_FILE (Prometheus textfile)
+    """
+    metrics = session.metrics
+    try:
+        if Config.METRICS_SUMMARY_FILE:
+            summary = metrics.write_summary(
+                Config.METRICS_SUMMARY_FILE, extra
+            )
+            totals = summary['totals']
+            logger.info(
+                f"Metrics: {totals['elapsed_seconds']}s, "
+                f"{totals['messages_per_second']} messages/s, "
+                f"written to {Config.METRICS_SUMMARY_FILE}"
+            )
+        if Config.METRICS_PROMETHEUS_FILE:
+            metrics.write_prometheus(Config.METRICS_PROMETHEUS_FILE)
+    except OSError as e:
+        logger.error(f"Error writing metrics: {e}")
+
+
+def parse_arguments(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(
+        description="Synchronize Boost mailing lists to the ingest API"
+    )
+    parser.add_argument(
+        '--backfill',
+        action='store_true',
+        help="bulk-load list archives into the local backfill store"
+    )
+    parser.add_argument(
+        '--since',
+        type=parse_cli_date,
+        help="backfill emails dated on or after this day (YYYY-MM-DD)"
+    )
+    parser.add_argument(
+        '--until',
+        type=parse_cli_date,
+        help="backfill emails dated before this day (YYYY-MM-DD)"
+    )
+    parser.add_argument(
+        '--daemon',
+        action='store_true',
+        help="keep running and sync each list on its own poll schedule"
+    )
+    parser.add_argument(
+        '--list',
+        dest='lists',
+        action='append',
+        metavar='NAME',
+        help="only process this list (display name, repeatable)"
+    )
+    
+    args = parser.parse_args(argv)
+    if (args.since or args.until) and not args.backfill:
+        parser.error("--since and --until require --backfill")
+    if args.daemon and args.backfill:
+        parser.error("--daemon and --backfill cannot be combined")
+    if args.since and args.until and args.since >= args.until:
+        parser.error("--since must be before --until")
+    return args
+
+
+def main(argv: Optional[List[str]] = None):
     """Main execution function"""
+    args = parse_arguments(argv)
+    
     # Load configuration from config.json
     print("Loading configuration from config.json...")
     Config.load_from_file()
@@ -1032,60 +2939,126 @@ def main():
     mailing_lists = lists_data.get('lists', [])
     logger.info(f"Found {len(mailing_lists)} mailing lists")
     
-    # Create HTTP session
+    if args.lists:
+        known_names = {
+            list_info.get('display_name') for list_info in mailing_lists
+        }
+        for name in sorted(set(args.lists) - known_names):
+            logger.warning(f"Unknown list: {name}")
+        mailing_lists = [
+            list_info for list_info in mailing_lists
+            if list_info.get('display_name') in args.lists
+        ]
+        logger.info(f"Processing {len(mailing_lists)} selected lists")
+    
+    # Create HTTP session shared by all lists
     session = create_http_session()
     api_endpoint = Config.API_ENDPOINT
     logger.info(f"API endpoint: {api_endpoint}")
+    logger.info(
+        f"POST bodies: {Config.PAYLOAD_ENCODER.json_encoder_name} encoder, "
+        f"{Config.PAYLOAD_ENCODER.compression} compression"
+    )
+    if session.async_client:
+        logger.info(
+            f"HTTP backend: httpx "
+            f"({'HTTP/2' if session.async_client.http2 else 'HTTP/1.1'}, "
+            f"up to {Config.FETCH_WINDOW} bodies in flight)"
+        )
     
-    # Process each mailing list
-    for idx, list_info in enumerate(mailing_lists, 1):
-        display_name = list_info.get('display_name', 'Unknown')
-        logger.info(f"\nList {idx}/{len(mailing_lists)}: {display_name}")
-        
-        result = process_single_list(
-            list_info,
+    if args.backfill:
+        failed_lists = run_backfill(
+            mailing_lists,
+            pull_data,
+            args.since,
+            args.until,
+            session,
+            logger
+        )
+        logger.info("=" * 50)
+        logger.info(
+            f"Backfilled {len(mailing_lists) - len(failed_lists)}/"
+            f"{len(mailing_lists)} lists"
+        )
+        if failed_lists:
+            logger.warning(
+                f"Failed lists: {', '.join(sorted(failed_lists))}"
+            )
+        write_run_metrics(
+            session,
+            {"mode": "backfill", "failed_lists": sorted(failed_lists)},
+            logger
+        )
+        session.close()
+        return
+    
+    # Index of already ingested messages shared by all lists
+    dedup_index = None
+    if Config.DEDUP_ENABLED:
+        dedup_index = DedupIndex(
+            Config.DEDUP_INDEX_FILE,
+            expected_items=Config.DEDUP_EXPECTED_ITEMS,
+            false_positive_rate=Config.DEDUP_FALSE_POSITIVE_RATE
+        )
+    
+    logger.info(
+        f"Syncing up to {Config.LIST_WORKERS} lists concurrently"
+    )
+    if args.daemon:
+        failed_lists = run_daemon(
+            mailing_lists,
             pull_data,
             api_endpoint,
+            dedup_index,
             session,
             logger
         )
-        
-        if not result.success:
-            # Handle different error types
-            if result.error_type == "cache_failed":
-                logger.error(
-                    f"Cache processing failed for {display_name}. "
-                    f"Will retry on next run."
-                )
-                # Continue to next list - cache will be retried later
-                
-            elif result.error_type == "collection_failed":
-                logger.error(
-                    f"Email collection failed for {display_name}. "
-                    f"Details: {result.error_message}"
-                )
-                # Continue to next list - will retry collection on next run
-                
-            elif result.error_type == "api_failed":
-                logger.error(
-                    f"API posting failed for {display_name}. "
-                    f"Failed bundles saved to cache folder."
-                )
-                # Continue to next list - failed bundles are cached
-                
-            else:
-                logger.error(
-                    f"Unknown error for {display_name}: "
-                    f"{result.error_message}"
-                )
-        else:
-            logger.info(f"Successfully completed {display_name}")
-        
-        # Delay between lists
-        if idx < len(mailing_lists):
-            time.sleep(Config.BATCH_DELAY)
+    else:
+        failed_lists = sync_lists_once(
+            mailing_lists,
+            pull_data,
+            api_endpoint,
+            dedup_index,
+            session,
+            logger
+        )
+    
+    if session.response_cache:
+        cache_stats = session.response_cache.stats()
+        logger.info(
+            f"HTTP cache: {cache_stats['hits']} hits (304), "
+            f"{cache_stats['misses']} misses, "
+            f"{cache_stats['evictions']} evictions, "
+            f"{cache_stats['entries']} entries "
+            f"({cache_stats['size_bytes']} bytes)"
+        )
+    
+    if dedup_index:
+        dedup_stats = dedup_index.stats()
+        logger.info(
+            f"Dedup index: {dedup_stats['indexed']} messages, "
+            f"{dedup_stats['lookups']} lookups "
+            f"({dedup_stats['bloom_negatives']} answered by the filter)"
+        )
+        dedup_index.close()
+    
+    write_run_metrics(
+        session,
+        {
+            "mode": "daemon" if args.daemon else "sync",
+            "failed_lists": sorted(failed_lists)
+        },
+        logger
+    )
+    session.close()
     
     logger.info("=" * 50)
+    logger.info(
+        f"Completed {len(mailing_lists) - len(failed_lists)}/"
+        f"{len(mailing_lists)} lists"
+    )
+    if failed_lists:
+        logger.warning(f"Failed lists: {', '.join(sorted(failed_lists))}")
     logger.info("Email Synchronization Process Completed")
     logger.info("=" * 50)
 
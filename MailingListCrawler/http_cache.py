@@ -0,0 +1,219 @@
+"""
+On-Disk HTTP Response Cache for Archive API Requests
+
+Responses that carry an ETag or Last-Modified validator are stored on disk,
+keyed by URL. Later requests for the same URL are sent as conditional GETs
+(If-None-Match / If-Modified-Since), so an unchanged resource costs a 304
+instead of a full download. The cache is bounded by total size and evicts
+the least recently used entries first.
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from typing import Any, Dict, List, Optional
+
+
+logger = logging.getLogger("EmailSync.HTTPCache")
+
+CACHE_SUFFIX = ".cache"
+
+
+class CacheEntry:
+    """A cached response body together with its validators"""
+    def __init__(
+        self,
+        url: str,
+        body: bytes,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None
+    ):
+        self.url = url
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+    
+    def conditional_headers(self) -> Dict[str, str]:
+        """Headers that turn a GET into a conditional GET"""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+    
+    def json(self) -> Any:
+        """Decode the cached body as JSON"""
+        return json.loads(self.body)
+
+
+class HTTPResponseCache:
+    """
+    Size-bounded response cache stored as one file per URL.
+    Each file holds a JSON header line (url and validators) followed
+    by the raw response body. Safe to share between threads.
+    """
+    def __init__(self, folder: str, max_size_bytes: int):
+        self.folder = folder
+        self.max_size_bytes = max_size_bytes
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._index: Dict[str, Dict[str, float]] = {}
+        self._total_size = 0
+        
+        os.makedirs(folder, exist_ok=True)
+        self._load_index()
+    
+    @staticmethod
+    def _key(url: str) -> str:
+        return hashlib.sha256(url.encode('utf-8')).hexdigest()
+    
+    def _path(self, key: str) -> str:
+        return os.path.join(self.folder, key + CACHE_SUFFIX)
+    
+    def _load_index(self) -> None:
+        """Rebuild the size/recency index from the files on disk"""
+        for entry in os.scandir(self.folder):
+            if not entry.name.endswith(CACHE_SUFFIX):
+                continue
+            stat = entry.stat()
+            key = entry.name[:-len(CACHE_SUFFIX)]
+            self._index[key] = {'size': stat.st_size, 'used': stat.st_mtime}
+            self._total_size += stat.st_size
+    
+    def lookup(self, url: str) -> Optional[CacheEntry]:
+        """Return the cached entry for a URL, or None if not cached"""
+        key = self._key(url)
+        with self._lock:
+            if key not in self._index:
+                return None
+        
+        try:
+            with open(self._path(key), 'rb') as f:
+                header = json.loads(f.readline())
+                body = f.read()
+        except FileNotFoundError:
+            # Evicted by another thread in the meantime
+            self._remove(key)
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Dropping unreadable cache entry for {url}: {e}")
+            self._remove(key)
+            return None
+        
+        return CacheEntry(
+            url,
+            body,
+            etag=header.get('etag'),
+            last_modified=header.get('last_modified')
+        )
+    
+    def record_hit(self, url: str) -> None:
+        """Count a 304 revalidation and mark the entry as recently used"""
+        key = self._key(url)
+        with self._lock:
+            self.hits += 1
+            if key in self._index:
+                self._index[key]['used'] = time.time()
+        try:
+            os.utime(self._path(key))
+        except OSError:
+            pass
+    
+    def record_miss(self) -> None:
+        """Count a request that had to download the full body"""
+        with self._lock:
+            self.misses += 1
+    
+    def store(
+        self,
+        url: str,
+        body: bytes,
+        etag: Optional[str],
+        last_modified: Optional[str]
+    ) -> None:
+        """Store a response body if it carries a validator"""
+        if not etag and not last_modified:
+            return
+        
+        key = self._key(url)
+        header = json.dumps({
+            'url': url,
+            'etag': etag,
+            'last_modified': last_modified
+        }).encode('utf-8')
+        path = self._path(key)
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        
+        try:
+            with open(temp_path, 'wb') as f:
+                f.write(header + b'\n' + body)
+            os.replace(temp_path, path)
+        except OSError as e:
+            logger.warning(f"Failed to cache response for {url}: {e}")
+            return
+        
+        size = len(header) + 1 + len(body)
+        with self._lock:
+            previous = self._index.get(key)
+            if previous:
+                self._total_size -= previous['size']
+            self._index[key] = {'size': size, 'used': time.time()}
+            self._total_size += size
+            self.stores += 1
+            victims = self._select_victims()
+        
+        for victim in victims:
+            self._remove(victim, evicted=True)
+    
+    def _select_victims(self) -> List[str]:
+        """
+        Pick least recently used entries until the cache fits in 90% of
+        its budget. Must be called with the lock held.
+        """
+        if self._total_size <= self.max_size_bytes:
+            return []
+        
+        target = self.max_size_bytes * 0.9
+        remaining = self._total_size
+        victims = []
+        for key, info in sorted(
+            self._index.items(), key=lambda item: item[1]['used']
+        ):
+            if remaining <= target:
+                break
+            victims.append(key)
+            remaining -= info['size']
+        return victims
+    
+    def _remove(self, key: str, evicted: bool = False) -> None:
+        """Delete an entry from disk and from the index"""
+        with self._lock:
+            info = self._index.pop(key, None)
+            if info is None:
+                return
+            self._total_size -= info['size']
+            if evicted:
+                self.evictions += 1
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+    
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters and current cache size"""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'stores': self.stores,
+                'evictions': self.evictions,
+                'entries': len(self._index),
+                'size_bytes': self._total_size
+            }
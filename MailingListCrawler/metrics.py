@@ -0,0 +1,323 @@
+"""
+Run Metrics for Email Sync
+
+Counters and histograms (request latency, bundle sizes) are recorded per
+mailing list and written at the end of a run as a JSON summary and,
+optionally, as a Prometheus textfile for the node_exporter textfile
+collector. The list being synced is carried in a context variable: a list
+worker enters list_scope(), and threads it starts inherit the scope via
+set_list_scope(), so deeply nested code records metrics without being
+passed the list name.
+"""
+
+import os
+import json
+import time
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+
+# Histogram bucket upper bounds
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+COUNT_BUCKETS = (1, 5, 10, 25, 50, 100, 250, 500, 1000)
+BYTES_BUCKETS = tuple(2 ** power * 1024 for power in range(4, 16, 2))
+
+PROMETHEUS_PREFIX = "emailsync_"
+
+_list_scope: ContextVar[str] = ContextVar("metrics_list_scope", default="")
+
+# (metric name, sorted label pairs)
+MetricKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+def set_list_scope(list_name: str) -> None:
+    """Attribute metrics recorded in the current context to list_name"""
+    _list_scope.set(list_name)
+
+
+def current_list_scope() -> str:
+    return _list_scope.get()
+
+
+def format_key(key: MetricKey) -> str:
+    """Render a metric key as name{label=value,...}"""
+    name, labels = key
+    if not labels:
+        return name
+    return name + "{" + ",".join(f"{k}={v}" for k, v in labels) + "}"
+
+
+class Histogram:
+    """Cumulative bucket histogram in the Prometheus style"""
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # Last one is +Inf
+        self.sum = 0.0
+        self.count = 0
+    
+    def observe(self, value: float) -> None:
+        index = len(self.buckets)
+        for position, bound in enumerate(self.buckets):
+            if value <= bound:
+                index = position
+                break
+        self.counts[index] += 1
+        self.sum += value
+        self.count += 1
+    
+    def merge(self, other: "Histogram") -> None:
+        for index, count in enumerate(other.counts):
+            self.counts[index] += count
+        self.sum += other.sum
+        self.count += other.count
+    
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """(upper bound, cumulative count) pairs ending with +Inf"""
+        bounds = [f"{bound:g}" for bound in self.buckets] + ["+Inf"]
+        pairs = []
+        total = 0
+        for bound, count in zip(bounds, self.counts):
+            total += count
+            pairs.append((bound, total))
+        return pairs
+    
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the q-quantile"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        total = 0
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            if total >= rank:
+                return bound
+        return float("inf")
+    
+    def json_quantile(self, q: float) -> Union[float, str, None]:
+        """quantile() with +Inf as a string, since JSON has no infinity"""
+        value = self.quantile(q)
+        return "+Inf" if value == float("inf") else value
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "mean": round(self.sum / self.count, 6) if self.count else None,
+            "p50": self.json_quantile(0.5),
+            "p95": self.json_quantile(0.95),
+            "buckets": dict(self.cumulative())
+        }
+
+
+class ScopeMetrics:
+    """Counters, histograms and timing of one list (or the run itself)"""
+    def __init__(self):
+        self.counters: Dict[MetricKey, float] = {}
+        self.histograms: Dict[MetricKey, Histogram] = {}
+        self.started: Optional[float] = None
+        self.elapsed = 0.0
+    
+    def merge(self, other: "ScopeMetrics") -> None:
+        for key, value in other.counters.items():
+            self.counters[key] = self.counters.get(key, 0) + value
+        for key, histogram in other.histograms.items():
+            if key not in self.histograms:
+                self.histograms[key] = Histogram(histogram.buckets)
+            self.histograms[key].merge(histogram)
+    
+    def to_dict(self, elapsed: float) -> Dict[str, Any]:
+        messages = self.counters.get(("messages_posted", ()), 0)
+        return {
+            "elapsed_seconds": round(elapsed, 3),
+            "messages_per_second": (
+                round(messages / elapsed, 3) if elapsed > 0 else None
+            ),
+            "counters": {
+                format_key(key): round(value, 6)
+                for key, value in sorted(self.counters.items())
+            },
+            "histograms": {
+                format_key(key): histogram.to_dict()
+                for key, histogram in sorted(self.histograms.items())
+            }
+        }
+
+
+class RunMetrics:
+    """
+    Metrics of one sync run, kept per list scope.
+    Safe to share between threads.
+    """
+    def __init__(self):
+        self.started_at = datetime.now()
+        self._started = time.monotonic()
+        self._scopes: Dict[str, ScopeMetrics] = {}
+        self._lock = threading.Lock()
+    
+    def _scope(self, list_name: Optional[str] = None) -> ScopeMetrics:
+        """Metrics of a list (the current scope by default). Hold lock."""
+        if list_name is None:
+            list_name = _list_scope.get()
+        scope = self._scopes.get(list_name)
+        if scope is None:
+            scope = self._scopes[list_name] = ScopeMetrics()
+        return scope
+    
+    def increment(self, name: str, value: float = 1, **labels: str) -> None:
+        """Add value to a counter of the current list"""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            counters = self._scope().counters
+            counters[key] = counters.get(key, 0) + value
+    
+    def observe(
+        self,
+        name: str,
+        value: float,
+        buckets: Tuple[float, ...] = LATENCY_BUCKETS,
+        **labels: str
+    ) -> None:
+        """Record a value in a histogram of the current list"""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histograms = self._scope().histograms
+            if key not in histograms:
+                histograms[key] = Histogram(buckets)
+            histograms[key].observe(value)
+    
+    def record_request(
+        self,
+        method: str,
+        status: int,
+        latency: float,
+        downloaded: int,
+        uploaded: int,
+        waited: float
+    ) -> None:
+        """Record one HTTP exchange (shared by both HTTP backends)"""
+        self.increment('requests', method=method, status=str(status))
+        self.observe('request_latency_seconds', latency, method=method)
+        self.increment('downloaded_bytes', downloaded, method=method)
+        if uploaded:
+            self.increment('uploaded_bytes', uploaded, method=method)
+        if status == 429:
+            self.increment('rate_limited', method=method)
+        if waited > 0:
+            self.increment('sleep_seconds', waited, reason='rate_limit')
+    
+    @contextmanager
+    def list_scope(self, list_name: str) -> Iterator[None]:
+        """Attribute metrics to list_name and time the list's sync"""
+        token = _list_scope.set(list_name)
+        with self._lock:
+            self._scope(list_name).started = time.monotonic()
+        try:
+            yield
+        finally:
+            with self._lock:
+                scope = self._scope(list_name)
+                scope.elapsed += time.monotonic() - scope.started
+            _list_scope.reset(token)
+    
+    def summary(
+        self,
+        extra: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Run totals and per-list metrics as a JSON-ready dict"""
+        elapsed = time.monotonic() - self._started
+        with self._lock:
+            totals = ScopeMetrics()
+            for scope in self._scopes.values():
+                totals.merge(scope)
+            summary = {
+                "started_at": self.started_at.isoformat(),
+                "finished_at": datetime.now().isoformat(),
+                **(extra or {}),
+                "totals": totals.to_dict(elapsed),
+                "lists": {
+                    list_name: scope.to_dict(scope.elapsed)
+                    for list_name, scope in sorted(self._scopes.items())
+                    if list_name
+                }
+            }
+        return summary
+    
+    def prometheus_text(self) -> str:
+        """Per-list metrics in the Prometheus text exposition format"""
+        families: Dict[str, Tuple[str, List[str]]] = {}
+        
+        def add(family, metric_type, name, labels, value):
+            label_text = ",".join(f'{k}="{v}"' for k, v in labels)
+            if label_text:
+                name = f"{name}{{{label_text}}}"
+            families.setdefault(family, (metric_type, []))[1].append(
+                f"{name} {value:g}"
+            )
+        
+        with self._lock:
+            for list_name, scope in sorted(self._scopes.items()):
+                scope_labels = (("list", list_name),) if list_name else ()
+                for (name, labels), value in sorted(scope.counters.items()):
+                    family = f"{PROMETHEUS_PREFIX}{name}_total"
+                    add(family, "counter", family, scope_labels + labels,
+                        value)
+                for (name, labels), histogram in sorted(
+                    scope.histograms.items()
+                ):
+                    family = f"{PROMETHEUS_PREFIX}{name}"
+                    labels = scope_labels + labels
+                    for bound, count in histogram.cumulative():
+                        add(family, "histogram", f"{family}_bucket",
+                            labels + (("le", bound),), count)
+                    add(family, "histogram", f"{family}_sum", labels,
+                        histogram.sum)
+                    add(family, "histogram", f"{family}_count", labels,
+                        histogram.count)
+                if list_name:
+                    family = f"{PROMETHEUS_PREFIX}list_duration_seconds"
+                    add(family, "gauge", family, scope_labels, scope.elapsed)
+            
+            family = f"{PROMETHEUS_PREFIX}run_duration_seconds"
+            add(family, "gauge", family, (),
+                time.monotonic() - self._started)
+            family = f"{PROMETHEUS_PREFIX}last_run_timestamp_seconds"
+            add(family, "gauge", family, (), time.time())
+        
+        lines = []
+        for family, (metric_type, samples) in families.items():
+            lines.append(f"# TYPE {family} {metric_type}")
+            lines.extend(samples)
+        return "\n".join(lines) + "\n"
+    
+    def write_summary(
+        self,
+        path: str,
+        extra: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Write the JSON summary and return it"""
+        summary = self.summary(extra)
+        write_atomically(
+            path,
+            json.dumps(summary, ensure_ascii=False, indent=2, allow_nan=False)
+        )
+        return summary
+    
+    def write_prometheus(self, path: str) -> None:
+        """Write the Prometheus textfile (replaced atomically)"""
+        write_atomically(path, self.prometheus_text())
+
+
+def write_atomically(path: str, text: str) -> None:
+    """Write a text file through a temporary file and rename"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
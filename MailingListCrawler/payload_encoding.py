@@ -0,0 +1,97 @@
+"""
+JSON Encoding and Compression for Ingest POST Bodies
+
+Bundles are serialized with orjson when it is installed (falling back to
+the standard library) and optionally compressed with gzip or zstd before
+being sent with a matching Content-Encoding header. Mailing list bodies
+are plain text and usually shrink several times under compression.
+"""
+
+import gzip
+import json
+import threading
+from typing import Any, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:  # Optional dependency
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:  # Optional dependency
+    zstandard = None
+
+
+JSON_ENCODERS = ("auto", "orjson", "json")
+COMPRESSIONS = ("none", "gzip", "zstd")
+
+
+class PayloadEncoder:
+    """
+    Serializes request data to compact UTF-8 JSON and compresses it.
+    Safe to share between threads.
+    """
+    def __init__(
+        self,
+        json_encoder: str = "auto",
+        compression: str = "none",
+        level: Optional[int] = None,
+        min_bytes: int = 1024
+    ):
+        if json_encoder not in JSON_ENCODERS:
+            raise ValueError(
+                f"Unknown JSON encoder '{json_encoder}', "
+                f"expected one of {', '.join(JSON_ENCODERS)}"
+            )
+        if compression not in COMPRESSIONS:
+            raise ValueError(
+                f"Unknown compression '{compression}', "
+                f"expected one of {', '.join(COMPRESSIONS)}"
+            )
+        if json_encoder == "orjson" and orjson is None:
+            raise ValueError(
+                "JSON encoder 'orjson' requires the orjson package"
+            )
+        if compression == "zstd" and zstandard is None:
+            raise ValueError(
+                "Compression 'zstd' requires the zstandard package"
+            )
+        
+        self.use_orjson = orjson is not None and json_encoder != "json"
+        self.compression = compression
+        self.level = level
+        self.min_bytes = min_bytes
+        self._local = threading.local()
+    
+    @property
+    def json_encoder_name(self) -> str:
+        return "orjson" if self.use_orjson else "json"
+    
+    def encode_json(self, data: Any) -> bytes:
+        """Serialize data to compact UTF-8 JSON"""
+        if self.use_orjson:
+            return orjson.dumps(data)
+        return json.dumps(
+            data, ensure_ascii=False, separators=(',', ':')
+        ).encode('utf-8')
+    
+    def compress(self, body: bytes) -> Tuple[bytes, Optional[str]]:
+        """
+        Compress a body if compression is enabled and the body is large
+        enough to benefit. Returns (body, content_encoding or None).
+        """
+        if self.compression == "none" or len(body) < self.min_bytes:
+            return body, None
+        
+        if self.compression == "gzip":
+            level = 6 if self.level is None else self.level
+            return gzip.compress(body, compresslevel=level), "gzip"
+        
+        # zstd compressors are not thread-safe, keep one per thread
+        compressor = getattr(self._local, 'zstd', None)
+        if compressor is None:
+            level = 3 if self.level is None else self.level
+            compressor = zstandard.ZstdCompressor(level=level)
+            self._local.zstd = compressor
+        return compressor.compress(body), "zstd"
@@ -0,0 +1,259 @@
+"""
+Adaptive Token-Bucket Rate Limiter for the Email Sync HTTP Session
+
+Every (request kind, host) pair gets its own token bucket, so archive GETs
+and ingest POSTs are paced independently. A bucket slows down
+multiplicatively when the server answers 429 (and pauses for Retry-After),
+then speeds back up additively after a run of successful requests.
+"""
+
+import time
+import asyncio
+import logging
+import threading
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+
+logger = logging.getLogger("EmailSync.RateLimiter")
+
+# Request kinds: archive reads (GET) and ingest writes (POST)
+ARCHIVE = "archive"
+INGEST = "ingest"
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header (delay in seconds or HTTP date).
+    Returns the delay in seconds, or None if missing or invalid.
+    """
+    if not value:
+        return None
+    
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class RateProfile:
+    """Token bucket settings for one request kind"""
+    def __init__(
+        self,
+        rate: float,
+        burst: float,
+        min_rate: float,
+        max_rate: float
+    ):
+        self.rate = rate  # Tokens per second, 0 disables limiting
+        self.burst = burst
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+
+
+class TokenBucket:
+    """Thread-safe token bucket with an adjustable rate"""
+    def __init__(
+        self,
+        name: str,
+        profile: RateProfile,
+        decrease_factor: float,
+        increase_step: float,
+        increase_after: int
+    ):
+        self.name = name
+        self.profile = profile
+        self.rate = profile.rate
+        self.capacity = max(1.0, profile.burst)
+        self.tokens = self.capacity
+        self.decrease_factor = decrease_factor
+        self.increase_step = increase_step
+        self.increase_after = increase_after
+        self.consecutive_successes = 0
+        self.blocked_until = 0.0
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def _refill(self, now: float) -> None:
+        """Add the tokens earned since the last update"""
+        if self.rate <= 0:
+            # Unlimited bucket: only Retry-After pauses apply
+            self.tokens = self.capacity
+            return
+        if now <= self._updated:
+            return
+        self.tokens = min(
+            self.capacity,
+            self.tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+    
+    def try_acquire(self) -> float:
+        """
+        Take one token if one is available without waiting.
+        Returns 0 on success, otherwise the delay before the next try.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            
+            if now >= self.blocked_until and self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+            
+            if now < self.blocked_until:
+                return self.blocked_until - now
+            return (1 - self.tokens) / self.rate
+    
+    def acquire(self) -> float:
+        """
+        Take one token, sleeping until one is available.
+        Returns the number of seconds spent waiting.
+        """
+        waited = 0.0
+        while True:
+            delay = self.try_acquire()
+            if delay <= 0:
+                return waited
+            time.sleep(delay)
+            waited += delay
+    
+    async def acquire_async(self) -> float:
+        """acquire() for coroutines: waits without blocking the loop"""
+        waited = 0.0
+        while True:
+            delay = self.try_acquire()
+            if delay <= 0:
+                return waited
+            await asyncio.sleep(delay)
+            waited += delay
+    
+    def on_success(self) -> None:
+        """Record a successful request; speed up after a run of them"""
+        with self._lock:
+            self.consecutive_successes += 1
+            
+            if (self.rate <= 0
+                    or self.consecutive_successes < self.increase_after
+                    or self.rate >= self.profile.max_rate):
+                return
+            
+            self.consecutive_successes = 0
+            old_rate = self.rate
+            self.rate = min(
+                self.profile.max_rate,
+                self.rate + self.increase_step
+            )
+        
+        logger.info(
+            f"Rate for {self.name} increased: "
+            f"{old_rate:.2f} -> {self.rate:.2f} req/s"
+        )
+    
+    def on_rate_limited(self, retry_after: Optional[float]) -> None:
+        """Slow down after a 429 and pause until Retry-After has passed"""
+        with self._lock:
+            now = time.monotonic()
+            self.consecutive_successes = 0
+            old_rate = self.rate
+            
+            if self.rate > 0:
+                self.rate = max(
+                    self.profile.min_rate,
+                    self.rate * self.decrease_factor
+                )
+            
+            # Resume with an empty bucket so requests restart at the new pace
+            if retry_after:
+                self.blocked_until = max(self.blocked_until, now + retry_after)
+            self._refill(now)
+            self.tokens = 0.0
+            self._updated = max(now, self.blocked_until)
+        
+        logger.warning(
+            f"Rate for {self.name} decreased after 429: "
+            f"{old_rate:.2f} -> {self.rate:.2f} req/s"
+            + (f", pausing {retry_after:.1f}s" if retry_after else "")
+        )
+
+
+class AdaptiveRateLimiter:
+    """
+    Per-host rate limiter shared by every thread using the HTTP session.
+    GET requests use the archive profile, POST requests the ingest profile.
+    """
+    def __init__(
+        self,
+        profiles: Dict[str, RateProfile],
+        decrease_factor: float = 0.5,
+        increase_step: float = 0.25,
+        increase_after: int = 20
+    ):
+        self.profiles = profiles
+        self.decrease_factor = decrease_factor
+        self.increase_step = increase_step
+        self.increase_after = increase_after
+        self._buckets: Dict[Tuple[str, str], TokenBucket] = {}
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def request_kind(method: str) -> str:
+        """Map an HTTP method to the rate profile it is limited by"""
+        return INGEST if method.upper() == "POST" else ARCHIVE
+    
+    def get_bucket(self, method: str, url: str) -> TokenBucket:
+        """Return the bucket for a request, creating it on first use"""
+        kind = self.request_kind(method)
+        host = urlsplit(url).netloc
+        key = (kind, host)
+        
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = TokenBucket(
+                    f"{kind} {host}",
+                    self.profiles[kind],
+                    self.decrease_factor,
+                    self.increase_step,
+                    self.increase_after
+                )
+                self._buckets[key] = bucket
+            return bucket
+    
+    def acquire(self, method: str, url: str) -> float:
+        """Wait for permission to send a request; returns seconds waited"""
+        return self.get_bucket(method, url).acquire()
+    
+    async def acquire_async(self, method: str, url: str) -> float:
+        """acquire() for coroutines running on an event loop"""
+        return await self.get_bucket(method, url).acquire_async()
+    
+    def on_success(self, method: str, url: str) -> None:
+        """Feed back a request that was not rate limited"""
+        self.get_bucket(method, url).on_success()
+    
+    def on_rate_limited(
+        self,
+        method: str,
+        url: str,
+        retry_after: Optional[float]
+    ) -> None:
+        """Feed back a 429 response"""
+        self.get_bucket(method, url).on_rate_limited(retry_after)
+    
+    def current_rates(self) -> Dict[str, float]:
+        """Current rate of every bucket, keyed by bucket name"""
+        with self._lock:
+            buckets = list(self._buckets.values())
+        return {bucket.name: bucket.rate for bucket in buckets}
@@ -0,0 +1,257 @@
+"""
+Poll Scheduler and Sync Trigger for the Email Sync Daemon
+
+In daemon mode every mailing list is polled on its own schedule. A sync
+that posts new messages puts the list back on its base interval, and every
+quiet (or failed) sync multiplies the interval by a backoff factor up to a
+maximum, so busy lists are polled often and dormant ones rarely. A trigger,
+for example an archive notification sent to the local HTTP endpoint, makes
+a list (or every list) due at once and wakes the scheduler; a trigger that
+arrives while the list is syncing runs it again right afterwards.
+"""
+
+import hmac
+import json
+import time
+import threading
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from urllib.parse import unquote
+
+
+class ListSchedule:
+    """Polling state of one mailing list"""
+    def __init__(self, base_interval: float, max_interval: float):
+        self.base_interval = base_interval
+        self.max_interval = max(base_interval, max_interval)
+        self.interval = base_interval
+        self.next_due = time.monotonic()  # First sync right away
+        self.running = False
+        self.triggered = False
+        self.last_synced: Optional[str] = None
+        self.last_posted = 0
+        self.last_success: Optional[bool] = None
+    
+    def to_dict(self, now: float) -> Dict[str, Any]:
+        return {
+            "interval_seconds": round(self.interval, 1),
+            "next_sync_in_seconds": (
+                None if self.running
+                else round(max(0.0, self.next_due - now), 1)
+            ),
+            "running": self.running,
+            "last_synced": self.last_synced,
+            "last_posted": self.last_posted,
+            "last_success": self.last_success
+        }
+
+
+class PollScheduler:
+    """
+    Per-list poll schedule with backoff on quiet lists.
+    Safe to share between threads.
+    """
+    def __init__(self, backoff_factor: float = 2.0):
+        self.backoff_factor = backoff_factor
+        self._lists: Dict[str, ListSchedule] = {}
+        self._condition = threading.Condition()
+        self._stopped = False
+    
+    def add_list(
+        self,
+        name: str,
+        base_interval: float,
+        max_interval: float
+    ) -> None:
+        with self._condition:
+            self._lists[name] = ListSchedule(base_interval, max_interval)
+            self._condition.notify_all()
+    
+    def wait_due(self) -> List[str]:
+        """
+        Block until at least one idle list is due and return the due
+        lists, marked as running. Returns an empty list once stopped.
+        """
+        with self._condition:
+            while not self._stopped:
+                now = time.monotonic()
+                idle = [
+                    (name, schedule)
+                    for name, schedule in self._lists.items()
+                    if not schedule.running
+                ]
+                due = [
+                    name for name, schedule in idle
+                    if schedule.next_due <= now
+                ]
+                if due:
+                    for name in due:
+                        self._lists[name].running = True
+                    return due
+                
+                # Wake up periodically so signals are handled promptly
+                timeout = min(
+                    [schedule.next_due - now for _, schedule in idle],
+                    default=None
+                )
+                self._condition.wait(
+                    1.0 if timeout is None else min(timeout, 1.0)
+                )
+            return []
+    
+    def complete(self, name: str, posted_count: int, success: bool) -> float:
+        """
+        Reschedule a list after a sync. Returns the seconds until its
+        next sync.
+        """
+        with self._condition:
+            schedule = self._lists[name]
+            now = time.monotonic()
+            schedule.running = False
+            schedule.last_synced = datetime.now().isoformat()
+            schedule.last_posted = posted_count
+            schedule.last_success = success
+            
+            if success and posted_count:
+                schedule.interval = schedule.base_interval
+            else:
+                schedule.interval = min(
+                    schedule.max_interval,
+                    schedule.interval * self.backoff_factor
+                )
+            
+            if schedule.triggered:
+                schedule.triggered = False
+                schedule.next_due = now
+            else:
+                schedule.next_due = now + schedule.interval
+            self._condition.notify_all()
+            return schedule.next_due - now
+    
+    def trigger(self, name: Optional[str] = None) -> bool:
+        """
+        Make one list (every list if name is None) due now.
+        Returns False if the list is unknown.
+        """
+        with self._condition:
+            if name is not None and name not in self._lists:
+                return False
+            
+            names = [name] if name is not None else list(self._lists)
+            now = time.monotonic()
+            for list_name in names:
+                schedule = self._lists[list_name]
+                if schedule.running:
+                    schedule.triggered = True
+                else:
+                    schedule.next_due = now
+            self._condition.notify_all()
+            return True
+    
+    def stop(self) -> None:
+        """Make wait_due() return; running syncs are not interrupted"""
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+    
+    def status(self) -> Dict[str, Dict[str, Any]]:
+        with self._condition:
+            now = time.monotonic()
+            return {
+                name: schedule.to_dict(now)
+                for name, schedule in sorted(self._lists.items())
+            }
+
+
+class TriggerHandler(BaseHTTPRequestHandler):
+    """
+    POST /sync          sync every list now
+    POST /sync/<name>   sync one list now (URL-encoded display name)
+    GET  /status        schedule of every list as JSON
+    """
+    server: "TriggerServer"
+    
+    def log_message(self, format: str, *args: Any) -> None:
+        pass  # Triggers are logged by the daemon
+    
+    def _send_json(self, status: int, data: Any) -> None:
+        body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def _authorized(self) -> bool:
+        token = self.server.token
+        if not token:
+            return True
+        supplied = self.headers.get("X-Sync-Token", "")
+        return hmac.compare_digest(supplied.encode(), token.encode())
+    
+    def do_GET(self) -> None:
+        if not self._authorized():
+            self._send_json(403, {"error": "invalid token"})
+        elif self.path.rstrip("/") == "/status":
+            self._send_json(200, self.server.scheduler.status())
+        else:
+            self._send_json(404, {"error": "not found"})
+    
+    def do_POST(self) -> None:
+        # Notification bodies are not needed, but must be consumed
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+        
+        if not self._authorized():
+            self._send_json(403, {"error": "invalid token"})
+            return
+        
+        path = self.path.split("?", 1)[0].rstrip("/")
+        if path == "/sync":
+            name = None
+        elif path.startswith("/sync/"):
+            name = unquote(path[len("/sync/"):])
+        else:
+            self._send_json(404, {"error": "not found"})
+            return
+        
+        if not self.server.scheduler.trigger(name):
+            self._send_json(404, {"error": f"unknown list: {name}"})
+            return
+        if self.server.on_trigger:
+            self.server.on_trigger(name)
+        self._send_json(202, {"triggered": name or "all"})
+
+
+class TriggerServer(ThreadingHTTPServer):
+    """Local HTTP endpoint that triggers immediate syncs"""
+    daemon_threads = True
+    
+    def __init__(
+        self,
+        scheduler: PollScheduler,
+        host: str = "127.0.0.1",
+        port: int = 8765,
+        token: str = "",
+        on_trigger=None
+    ):
+        super().__init__((host, port), TriggerHandler)
+        self.scheduler = scheduler
+        self.token = token
+        self.on_trigger = on_trigger  # Called with the list name or None
+        self._thread: Optional[threading.Thread] = None
+    
+    def start(self) -> "TriggerServer":
+        self._thread = threading.Thread(
+            target=self.serve_forever,
+            name="sync-trigger",
+            daemon=True
+        )
+        self._thread.start()
+        return self
+    
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
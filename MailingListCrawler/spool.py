@@ -0,0 +1,132 @@
+"""
+Durable Message Spool for Failed Bundles
+
+Each mailing list has one SQLite spool file holding the messages whose POST
+failed. Appends of a whole bundle happen in a single transaction (one fsync
+per bundle in WAL mode), every message is acknowledged individually once it
+reaches the API, and acknowledged rows are compacted away. Replay is one
+sequential scan in spool order and message-hash lookups use the primary
+key index. Messages are stored already encoded in the ingest API format,
+so replaying them needs no transformation.
+"""
+
+import sqlite3
+from datetime import datetime
+from typing import Iterator, List, Tuple
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS messages (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    message_id_hash TEXT NOT NULL UNIQUE,
+    payload BLOB NOT NULL,
+    spooled_at TEXT NOT NULL,
+    acked_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_messages_pending
+    ON messages (acked_at, seq);
+"""
+
+
+class MessageSpool:
+    """Append-only spool of messages waiting to be posted for one list"""
+    def __init__(self, path: str):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=FULL")
+        self.connection.executescript(SCHEMA)
+    
+    def __enter__(self) -> "MessageSpool":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+    
+    def close(self) -> None:
+        """Close the underlying database connection"""
+        self.connection.close()
+    
+    def append(self, messages: List[Tuple[str, bytes]]) -> int:
+        """
+        Durably append (message_id_hash, encoded message) pairs in one
+        transaction. A message that is already spooled is replaced and
+        marked pending again. Returns the number of messages written.
+        """
+        now = datetime.now().isoformat()
+        rows = [
+            (message_id_hash, payload, now)
+            for message_id_hash, payload in messages
+        ]
+        
+        with self.connection:
+            self.connection.executemany(
+                "INSERT INTO messages "
+                "(message_id_hash, payload, spooled_at) "
+                "VALUES (?, ?, ?) "
+                "ON CONFLICT (message_id_hash) DO UPDATE SET "
+                "payload = excluded.payload, "
+                "spooled_at = excluded.spooled_at, "
+                "acked_at = NULL",
+                rows
+            )
+        return len(rows)
+    
+    def contains(self, message_id_hash: str) -> bool:
+        """Check whether a message is in the spool (pending or acked)"""
+        row = self.connection.execute(
+            "SELECT 1 FROM messages WHERE message_id_hash = ?",
+            (message_id_hash,)
+        ).fetchone()
+        return row is not None
+    
+    def pending_count(self) -> int:
+        """Number of messages not yet acknowledged"""
+        row = self.connection.execute(
+            "SELECT COUNT(*) FROM messages WHERE acked_at IS NULL"
+        ).fetchone()
+        return row[0]
+    
+    def iter_pending(
+        self,
+        batch_size: int
+    ) -> Iterator[List[Tuple[int, str, bytes]]]:
+        """
+        Yield pending messages in spool order as batches of
+        (seq, message_id_hash, encoded message) tuples.
+        Safe to ack batches while iterating.
+        """
+        last_seq = 0
+        while True:
+            rows = self.connection.execute(
+                "SELECT seq, message_id_hash, payload "
+                "FROM messages "
+                "WHERE acked_at IS NULL AND seq > ? "
+                "ORDER BY seq LIMIT ?",
+                (last_seq, batch_size)
+            ).fetchall()
+            if not rows:
+                return
+            last_seq = rows[-1][0]
+            yield rows
+    
+    def ack(self, seqs: List[int]) -> None:
+        """Mark messages as successfully posted"""
+        now = datetime.now().isoformat()
+        with self.connection:
+            self.connection.executemany(
+                "UPDATE messages SET acked_at = ? WHERE seq = ?",
+                [(now, seq) for seq in seqs]
+            )
+    
+    def compact(self) -> int:
+        """
+        Remove acknowledged messages and shrink the write-ahead log.
+        Returns the number of rows removed.
+        """
+        with self.connection:
+            removed = self.connection.execute(
+                "DELETE FROM messages WHERE acked_at IS NOT NULL"
+            ).rowcount
+        self.connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        return removed
@@ -4,8 +4,8 @@ import asyncio
 import threading
 
 from src.bot import SlackBot, event_app, handler, RAGClient
-from src.database import DatabaseService
-from src.services import SlackDatabaseService, logger
+from src.database import DatabaseService, close_database_service
+from src.services import SlackDatabaseService, close_event_queue, logger
 from config.settings import Settings
 
 
@@ -26,6 +26,7 @@ async def main():
 
     # Initialize database service
     db_service = DatabaseService()
+    await db_service.connect()
     slack_db_service = SlackDatabaseService(slack_bot, db_service)
     rag_client = RAGClient()
 
@@ -41,7 +42,8 @@ async def main():
     try:
 
         logger.info("Available commands:")
-        logger.info("  sync_all - Sync all data to database")
+        logger.info("  sync_all - Sync new data to database")
+        logger.info("  sync_all --full - Sync all data to database")
         logger.info("  rag_start - Start sending messages to RAG (100 per batch)")
         logger.info("  rag_stop - Stop sending messages to RAG")
         logger.info("  rag_progress - Check RAG sending progress")
@@ -62,6 +64,10 @@ async def main():
                     await slack_db_service.sync_all_users()
                     await slack_db_service.sync_all_data()
 
+                elif user_input == "sync_all --full":
+                    await slack_db_service.sync_all_users()
+                    await slack_db_service.sync_all_data(full=True)
+
                 elif user_input == "rag_start":
                     rag_client.start_sending()
                     logger.info(
@@ -83,6 +89,17 @@ async def main():
     except Exception as e:
         logger.error(f"Error in main: {e}")
     finally:
+        # The event queue and its database service live on the socket loop;
+        # write the queued events before disconnecting
+        try:
+            asyncio.run_coroutine_threadsafe(
+                close_event_queue(), loop_socket
+            ).result(timeout=60)
+            asyncio.run_coroutine_threadsafe(
+                close_database_service(), loop_socket
+            ).result(timeout=10)
+        except Exception as e:
+            logger.error(f"Error closing event database service: {e}")
         if db_service:
             logger.info("Disconnecting from database")
             await db_service.disconnect()
@@ -9,3 +9,15 @@ class Settings:
     SLACK_APP_TOKEN = os.getenv("SLACK_APP_TOKEN", "")
     RAG_BASIC_URL = os.getenv("RAG_BASIC_URL", "")
     RAG_API_KEY = os.getenv("RAG_API_KEY", "")
+    DATABASE_POOL_SIZE = int(os.getenv("DATABASE_POOL_SIZE", "10"))
+    DATABASE_POOL_TIMEOUT = int(os.getenv("DATABASE_POOL_TIMEOUT", "10"))
+    DATABASE_HEALTH_CHECK_INTERVAL = float(
+        os.getenv("DATABASE_HEALTH_CHECK_INTERVAL", "30")
+    )
+    DATABASE_BULK_CHUNK_SIZE = int(os.getenv("DATABASE_BULK_CHUNK_SIZE", "250"))
+    SLACK_MAX_RETRIES = int(os.getenv("SLACK_MAX_RETRIES", "3"))
+    SYNC_CHANNEL_CONCURRENCY = int(os.getenv("SYNC_CHANNEL_CONCURRENCY", "4"))
+    SYNC_THREAD_LOOKBACK_DAYS = float(os.getenv("SYNC_THREAD_LOOKBACK_DAYS", "7"))
+    EVENT_FLUSH_INTERVAL = float(os.getenv("EVENT_FLUSH_INTERVAL", "0.5"))
+    EVENT_BATCH_SIZE = int(os.getenv("EVENT_BATCH_SIZE", "500"))
+    EVENT_QUEUE_SIZE = int(os.getenv("EVENT_QUEUE_SIZE", "10000"))
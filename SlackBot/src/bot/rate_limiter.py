@@ -0,0 +1,94 @@
+import time
+import asyncio
+import threading
+from typing import Dict, Optional
+
+# Requests per minute allowed by each Slack Web API rate limit tier
+TIER_LIMITS = {1: 1, 2: 20, 3: 50, 4: 100}
+
+# Tier of the Web API methods the bot calls; others default to DEFAULT_TIER
+METHOD_TIERS = {
+    "conversations.history": 3,
+    "conversations.replies": 3,
+    "conversations.info": 3,
+    "conversations.list": 2,
+    "conversations.open": 3,
+    "chat.postMessage": 4,
+    "users.list": 2,
+    "users.info": 4,
+    "users.profile.get": 4,
+    "users.lookupByEmail": 3,
+    "files.info": 4,
+}
+DEFAULT_TIER = 3
+
+# Request priorities: live event handling goes before background syncs
+LIVE = 0
+BACKGROUND = 1
+
+
+class SlackRequestScheduler:
+    """
+    Central scheduler of Slack Web API calls.
+
+    Calls of each method are spaced so the method stays within its tier,
+    shared by every caller, since Slack limits each method per workspace.
+    A live call takes the method's next free slot ahead of any waiting
+    background call, so event handling never queues behind a bulk sync.
+    A 429 response pauses the method for its Retry-After delay.
+
+    The state is guarded by a thread lock and waiting is done with
+    asyncio.sleep, so one scheduler can be shared by SlackBot instances
+    on different event loops.
+    """
+
+    def __init__(self, tier_limits: Optional[Dict[int, float]] = None):
+        self.tier_limits = tier_limits or TIER_LIMITS
+        self._next_slot: Dict[str, float] = {}
+        self._live_waiting: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def interval(self, method: str) -> float:
+        """Seconds between two calls of a method."""
+        tier = METHOD_TIERS.get(method, DEFAULT_TIER)
+        return 60.0 / self.tier_limits[tier]
+
+    def _reserve(self, method: str, priority: int) -> float:
+        """Take the method's next slot if it is free; else return the wait."""
+        now = time.monotonic()
+        slot = self._next_slot.get(method, now)
+        if priority == BACKGROUND and self._live_waiting.get(method):
+            # Let the waiting live calls go first
+            return max(slot - now, 0.0) + self.interval(method)
+        if slot > now:
+            return slot - now
+        self._next_slot[method] = now + self.interval(method)
+        return 0.0
+
+    async def acquire(self, method: str, priority: int = BACKGROUND) -> float:
+        """Wait for a slot of the method and return the seconds waited."""
+        started = time.monotonic()
+        if priority == LIVE:
+            with self._lock:
+                self._live_waiting[method] = self._live_waiting.get(method, 0) + 1
+        try:
+            while True:
+                with self._lock:
+                    wait = self._reserve(method, priority)
+                if not wait:
+                    return time.monotonic() - started
+                await asyncio.sleep(wait)
+        finally:
+            if priority == LIVE:
+                with self._lock:
+                    self._live_waiting[method] -= 1
+
+    def on_rate_limited(self, method: str, retry_after: float) -> None:
+        """Pause a method after a 429 response."""
+        with self._lock:
+            resume = time.monotonic() + retry_after
+            self._next_slot[method] = max(self._next_slot.get(method, 0.0), resume)
+
+
+# Shared by every SlackBot unless one is given its own scheduler
+default_scheduler = SlackRequestScheduler()
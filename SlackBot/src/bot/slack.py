@@ -1,25 +1,76 @@
-from slack_sdk import WebClient
 from slack_sdk.errors import SlackApiError
+from slack_sdk.web.async_client import AsyncWebClient
 from slack_sdk.socket_mode import SocketModeClient
 from slack_sdk.socket_mode.request import SocketModeRequest
 from slack_sdk.socket_mode.response import SocketModeResponse
 from config.settings import Settings
+from src.bot.rate_limiter import BACKGROUND, SlackRequestScheduler, default_scheduler
 from src.services import handle_errors, logger
 
 import requests
+import asyncio
 import os
 
 from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional
 
 
 class SlackBot:
-    def __init__(self, token: str, channel_id: str = ""):
+    def __init__(
+        self,
+        token: str,
+        channel_id: str = "",
+        priority: int = BACKGROUND,
+        scheduler: Optional[SlackRequestScheduler] = None,
+    ):
+        """
+        Initialize the Slack bot.
+
+        Args:
+            token: Bot token.
+            channel_id: Default channel of the channel methods.
+            priority: Scheduler priority of this bot's calls (LIVE for the
+                event handlers, BACKGROUND for syncs).
+            scheduler: Request scheduler; bots share one by default so that
+                live and background calls are scheduled together.
+        """
         self.token = token
-        self.web_client = WebClient(token=token)
+        self.web_client = AsyncWebClient(token=token)
         self.channel_id = channel_id
+        self.priority = priority
+        self.scheduler = scheduler or default_scheduler
+
+    async def _call(
+        self, method: str, http_verb: str = "GET", **kwargs
+    ) -> Dict[str, Any]:
+        """
+        Call a Web API method through the request scheduler; returns the data.
+
+        Only rate limited (429) calls are retried: the method is paused for
+        every caller for its Retry-After delay and the call is retried up
+        to SLACK_MAX_RETRIES times. Any other SlackApiError is raised at
+        once.
+        """
+        for attempt in range(Settings.SLACK_MAX_RETRIES + 1):
+            await self.scheduler.acquire(method, self.priority)
+            try:
+                if http_verb == "GET":
+                    response = await self.web_client.api_call(
+                        method, http_verb="GET", params=kwargs
+                    )
+                else:
+                    response = await self.web_client.api_call(method, json=kwargs)
+                return response.data
+            except SlackApiError as e:
+                rate_limited = e.response.status_code == 429
+                if not rate_limited or attempt == Settings.SLACK_MAX_RETRIES:
+                    raise
+                retry_after = float(e.response.headers.get("Retry-After", 1))
+                logger.warning(f"{method} rate limited, retrying in {retry_after}s")
+                self.scheduler.on_rate_limited(method, retry_after)
 
     @handle_errors(default_return=[], log_prefix="Message Data ")
-    def _get_message_data(self, message_ts: str, data_type: str):
+    async def _get_message_data(self, message_ts: str, data_type: str):
         """
         Generic method to get message data with error handling.
 
@@ -30,14 +81,18 @@ class SlackBot:
         Returns:
             List of data or empty list on error
         """
-        response = self.web_client.conversations_history(
-            channel=self.channel_id, latest=message_ts, limit=1, inclusive=True
+        data = await self._call(
+            "conversations.history",
+            channel=self.channel_id,
+            latest=message_ts,
+            limit=1,
+            inclusive=True,
         )
-        if response.data["messages"]:
+        if data["messages"]:
             if data_type == "message":
-                return response.data["messages"][0]
+                return data["messages"][0]
             else:
-                return response.data["messages"][0].get(data_type, [])
+                return data["messages"][0].get(data_type, [])
         else:
             logger.error(
                 f"No messages found for message {message_ts} in channel {self.channel_id}"
@@ -55,68 +110,68 @@ class SlackBot:
     def set_token(self, token: str):
         """Set the token."""
         self.token = token
-        self.web_client = WebClient(token=self.token)
+        self.web_client = AsyncWebClient(token=self.token)
 
-    def get_reactions(self, message_ts: str):
+    async def get_reactions(self, message_ts: str):
         """Get reactions for a specific message."""
-        return self._get_message_data(message_ts, "reactions")
+        return await self._get_message_data(message_ts, "reactions")
 
-    def get_files(self, message_ts: str):
+    async def get_files(self, message_ts: str):
         """Get files for a specific message."""
-        return self._get_message_data(message_ts, "files")
+        return await self._get_message_data(message_ts, "files")
 
     @handle_errors(default_return=[], log_prefix="Thread by Root ")
-    def get_thread_by_root_message(self, root_message_ts: str):
+    async def get_thread_by_root_message(self, root_message_ts: str):
         """Get thread messages by root message timestamp."""
         try:
-            response = self.web_client.conversations_replies(
-                channel=self.channel_id, ts=root_message_ts
+            data = await self._call(
+                "conversations.replies", channel=self.channel_id, ts=root_message_ts
             )
-            return response.data.get("messages", [])
+            return data.get("messages", [])
         except Exception as e:
             logger.error(f"Error getting thread by root message {root_message_ts}: {e}")
             return []
 
-    def get_message(self, message_ts: str):
+    async def get_message(self, message_ts: str):
         """Get a specific message."""
-        return self._get_message_data(message_ts, "message")
+        return await self._get_message_data(message_ts, "message")
 
     @handle_errors(default_return=None, log_prefix="User Info ")
-    def get_user_info(self, user_id: str):
+    async def get_user_info(self, user_id: str):
         """Get user information by user ID."""
         try:
-            response = self.web_client.users_info(user=user_id)
-            return response.data.get("user", {})
+            data = await self._call("users.info", user=user_id)
+            return data.get("user", {})
         except Exception as e:
             logger.error(f"Error getting user info for {user_id}: {e}")
             return None
 
     @handle_errors(default_return=[], log_prefix="All Users ")
-    def get_all_users(self):
+    async def get_all_users(self):
         """Get all users in the workspace."""
         try:
-            response = self.web_client.users_list()
-            return response.data.get("members", [])
+            data = await self._call("users.list")
+            return data.get("members", [])
         except Exception as e:
             logger.error(f"Error getting all users: {e}")
             return []
 
     @handle_errors(default_return=[], log_prefix="User Profile ")
-    def get_user_profile(self, user_id: str):
+    async def get_user_profile(self, user_id: str):
         """Get user profile information."""
         try:
-            response = self.web_client.users_profile_get(user=user_id)
-            return response.data.get("profile", {})
+            data = await self._call("users.profile.get", user=user_id)
+            return data.get("profile", {})
         except Exception as e:
             logger.error(f"Error getting user profile for {user_id}: {e}")
             return {}
 
     @handle_errors(default_return=[], log_prefix="User Lookup ")
-    def lookup_user_by_email(self, email: str):
+    async def lookup_user_by_email(self, email: str):
         """Look up user by email address."""
         try:
-            response = self.web_client.users_lookupByEmail(email=email)
-            return response.data.get("user", {})
+            data = await self._call("users.lookupByEmail", email=email)
+            return data.get("user", {})
         except Exception as e:
             logger.error(f"Error looking up user by email {email}: {e}")
             return None
@@ -130,53 +185,102 @@ class SlackBot:
         return None
 
     @handle_errors(default_return=[], log_prefix="History ")
-    def get_all_history(self):
-        """Get all message history from a channel."""
-        all_messages = []
-        cursor = None
+    async def get_all_history(self, channel_id: Optional[str] = None):
+        """
+        Get all message history from a channel as one list.
 
+        Holds the whole history in memory; use iter_history_pages to
+        process large channels page by page.
+        """
+        return [
+            message
+            async for page in self.iter_history_pages(channel_id or self.channel_id)
+            for message in page
+        ]
+
+    async def iter_history_pages(
+        self,
+        channel_id: str,
+        oldest: Optional[str] = None,
+        known_threads: Optional[Dict[str, str]] = None,
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Yield the message history of a channel page by page.
+
+        Each conversations.history page is yielded as fetched, followed by
+        the reply pages of the threads it starts, so a thread parent is
+        always yielded before its replies. Only one API response is held at
+        a time. The channel is passed explicitly, so pages of several
+        channels can be fetched concurrently.
+
+        Args:
+            channel_id: Channel to read.
+            oldest: Only fetch messages after this ts.
+            known_threads: latest_reply of threads already stored, by
+                thread ts; replies of threads whose latest_reply is
+                unchanged are not fetched again.
+        """
+        known_threads = known_threads or {}
+        history_cursor = None
         while True:
-            response = self.web_client.conversations_history(
-                channel=self.channel_id, limit=1000, cursor=cursor
+            data = await self._call(
+                "conversations.history",
+                channel=channel_id,
+                limit=1000,
+                cursor=history_cursor,
+                oldest=oldest,
             )
 
-            messages = response.data.get("messages", [])
-            for message in messages:
-                if message.get("subtype") == "thread_broadcast":
-                    continue
-                all_messages.append(message)
-                if message.get("thread_ts"):
-                    cursor = None
-                    while True:
-                        replies_response = self.web_client.conversations_replies(
-                            channel=self.channel_id,
-                            ts=message["thread_ts"],
-                            cursor=cursor,
-                        )
-                        replies = replies_response.data.get("messages", [])
-                        all_messages.extend(replies)
-                        if not replies_response.data.get("has_more", False):
-                            break
-                        cursor = replies_response.data.get("response_metadata", {}).get(
-                            "next_cursor"
-                        )
-                        if not cursor:
-                            break
-
-            if not response.data.get("has_more", False):
-                break
+            page = [
+                message
+                for message in data.get("messages", [])
+                if message.get("subtype") != "thread_broadcast"
+            ]
+            yield page
 
-            cursor = response.data.get("response_metadata", {}).get("next_cursor")
-            if not cursor:
+            for message in page:
+                thread_ts = message.get("thread_ts")
+                latest_reply = message.get("latest_reply")
+                if thread_ts and known_threads.get(thread_ts) != latest_reply:
+                    async for replies in self.iter_replies_pages(channel_id, thread_ts):
+                        yield replies
+
+            if not data.get("has_more", False):
+                break
+            history_cursor = data.get("response_metadata", {}).get("next_cursor")
+            if not history_cursor:
                 break
 
-        return all_messages
+    async def iter_replies_pages(
+        self, channel_id: str, thread_ts: str
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Yield the replies of a thread page by page, without the parent."""
+        replies_cursor = None
+        while True:
+            data = await self._call(
+                "conversations.replies",
+                channel=channel_id,
+                ts=thread_ts,
+                limit=1000,
+                cursor=replies_cursor,
+            )
+            yield [
+                message
+                for message in data.get("messages", [])
+                if message.get("ts") != thread_ts
+            ]
+
+            if not data.get("has_more", False):
+                break
+            replies_cursor = data.get("response_metadata", {}).get("next_cursor")
+            if not replies_cursor:
+                break
 
     @handle_errors(default_return=None, log_prefix="Download ")
-    def download_file(self, file_id: str, output_path: str = ""):
+    async def download_file(self, file_id: str, output_path: str = ""):
         """Download a file from Slack."""
-        response = self.web_client.files_info(file=file_id)
-        file_info = response["file"]
+        data = await self._call("files.info", file=file_id)
+        file_info = data["file"]
         file_url = file_info["url_private"]
         headers = {
             "Authorization": f"Bearer {Settings.SLACK_BOT_TOKEN}",
@@ -191,55 +295,75 @@ class SlackBot:
                 + "_"
                 + file_info["name"]
             )
+        await asyncio.to_thread(self._download, file_url, headers, output_name)
+        logger.info(
+            f"File '{file_id}' {file_info['name']} ({file_info['size']} bytes) downloaded successfully to '{output_name}'."
+        )
+        return output_name
+
+    @staticmethod
+    def _download(file_url: str, headers: Dict[str, str], output_name: str):
+        """Stream a file to disk (blocking, run in a worker thread)."""
         with requests.get(file_url, headers=headers, stream=True) as r:
             r.raise_for_status()  # Raise an exception for bad status codes
             with open(output_name, "wb") as f:
                 for chunk in r.iter_content(chunk_size=8192):
                     f.write(chunk)
-        logger.info(
-            f"File '{file_id}' {file_info['name']} ({file_info['size']} bytes) downloaded successfully to '{output_name}'."
-        )
-        return output_name
 
     @handle_errors(default_return=None, log_prefix="Channel Info ")
-    def get_channel_info(self):
-        """Get channel information."""
-        response = self.web_client.conversations_info(channel=self.channel_id)
-        return response.data.get("channel", {})
+    async def get_channel_info(self, channel_id: Optional[str] = None):
+        """Get channel information (of the current channel by default)."""
+        data = await self._call(
+            "conversations.info", channel=channel_id or self.channel_id
+        )
+        return data.get("channel", {})
+
+    @handle_errors(default_return=None, log_prefix="Open Conversation ")
+    async def open_conversation(self, users: str):
+        """Open a direct message with one or more users (comma-separated)."""
+        data = await self._call("conversations.open", http_verb="POST", users=users)
+        return data.get("channel", {})
+
+    @handle_errors(default_return=None, log_prefix="Post Message ")
+    async def post_message(self, channel_id: str, text: str):
+        """Post a message to a channel."""
+        return await self._call(
+            "chat.postMessage", http_verb="POST", channel=channel_id, text=text
+        )
 
     @handle_errors(default_return=[], log_prefix="All Channels ")
-    def get_all_channels(self):
+    async def get_all_channels(self):
         """Get all channels in the workspace."""
         try:
-            public_channels = self.get_all_channels(types="public_channel")
-            direct_channels = self.get_all_channels(types="im")
-            group_direct_channels = self.get_all_channels(types="mpim")
+            public_channels = await self.get_all_channels(types="public_channel")
+            direct_channels = await self.get_all_channels(types="im")
+            group_direct_channels = await self.get_all_channels(types="mpim")
             return public_channels + direct_channels + group_direct_channels
         except Exception as e:
             logger.error(f"Error getting all channels: {e}")
             return []
 
-    def get_direct_channels(self):
+    async def get_direct_channels(self):
         """Get all direct channels in the workspace."""
         try:
-            response = self.web_client.conversations_list(types="im")
-            return response.data.get("channels", [])
+            data = await self._call("conversations.list", types="im")
+            return data.get("channels", [])
         except Exception as e:
             logger.error(f"Error getting all direct channels: {e}")
             return []
 
     @handle_errors(default_return=[], log_prefix="Public Channels ")
-    def get_all_channels(self, types: str = "public_channel"):
+    async def get_all_channels(self, types: str = "public_channel"):
         """Get all public channels in the workspace."""
         all_channels = []
         cursor = None
         while True:
-            response = self.web_client.conversations_list(cursor=cursor, types=types)
-            channels = response.data.get("channels", [])
+            data = await self._call("conversations.list", cursor=cursor, types=types)
+            channels = data.get("channels", [])
             all_channels.extend(channels)
-            if not response.data.get("has_more", False):
+            if not data.get("has_more", False):
                 break
-            cursor = response.data.get("response_metadata", {}).get("next_cursor")
+            cursor = data.get("response_metadata", {}).get("next_cursor")
             if not cursor:
                 break
         return all_channels
@@ -1,18 +1,21 @@
 from slack_bolt.async_app import AsyncApp
 from slack_bolt.adapter.socket_mode.async_handler import AsyncSocketModeHandler
-from slack_sdk import WebClient
 
+from src.bot.rate_limiter import LIVE
+from src.bot.slack import SlackBot
 from src.services import handle_event
 from config.settings import Settings
 
 event_app = AsyncApp(token=Settings.SLACK_BOT_TOKEN)
 handler = AsyncSocketModeHandler
-client = WebClient(token=Settings.SLACK_BOT_TOKEN)
+# Live priority: event handling goes ahead of background syncs sharing the
+# Slack request scheduler
+slack_bot = SlackBot(token=Settings.SLACK_BOT_TOKEN, priority=LIVE)
 
 
 @event_app.event("app_mention")
 async def handle_app_mention_events(event, say):
-    content = await handle_event(event, client)
+    content = await handle_event(event, slack_bot)
     await say(content)
 
 
@@ -24,16 +27,16 @@ async def handle_app_mention_events(event, say):
 @event_app.event("member_left_channel")
 @event_app.event("user_change")
 async def handle_events(event, say):
-    await handle_event(event, client)
+    await handle_event(event, slack_bot)
 
 
 @event_app.command("/hi")
 async def handle_some_command(ack, body, say):
-    response = client.conversations_open(users=["U1234567890"])
-    dm_channel = response["channel"]["id"]
+    channel = await slack_bot.open_conversation("U1234567890")
+    dm_channel = channel["id"]
 
     # Step 2: Send message in DM
-    client.chat_postMessage(
-        channel=dm_channel,
-        text="Hey 👋 this is a private DM with the bot!",  # TODO: Add logic to handle command
+    await slack_bot.post_message(
+        dm_channel,
+        "Hey 👋 this is a private DM with the bot!",  # TODO: Add logic to handle command
     )
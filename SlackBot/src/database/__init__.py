@@ -1,3 +1,7 @@
-from .database_service import DatabaseService
+from .database_service import (
+    DatabaseService,
+    get_database_service,
+    close_database_service,
+)
 
-__all__ = ["DatabaseService"]
+__all__ = ["DatabaseService", "get_database_service", "close_database_service"]
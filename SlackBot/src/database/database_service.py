@@ -1,83 +1,200 @@
-from datetime import datetime
-from typing import List, Dict, Optional, Any
-from prisma import Prisma
-from prisma.models import Message, User, Reaction, File, Channel
-
+import os
+import copy
+import time
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from typing import Iterable, Iterator, List, Dict, Optional, Any, Set
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+from prisma import Json, Prisma
+from prisma.models import Message, User, Reaction, File, Channel, ChannelSyncState
+
+from config.settings import Settings
 from src.services import logger
 
 
+def get_pooled_database_url(url: str, pool_size: int, pool_timeout: int) -> str:
+    """
+    Add the Prisma connection pool parameters to a PostgreSQL URL.
+
+    Parameters already present in the URL take precedence.
+    """
+    parts = urlsplit(url)
+    query = dict(parse_qsl(parts.query))
+    query.setdefault("connection_limit", str(pool_size))
+    query.setdefault("pool_timeout", str(pool_timeout))
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
 class DatabaseService:
-    def __init__(self):
-        self.prisma = Prisma()
+    def __init__(
+        self,
+        pool_size: Optional[int] = None,
+        pool_timeout: Optional[int] = None,
+        health_check_interval: Optional[float] = None,
+    ):
+        """
+        Initialize the database service.
+
+        Args:
+            pool_size: Maximum connections of the Prisma query engine pool.
+            pool_timeout: Seconds a query waits for a free connection.
+            health_check_interval: Minimum seconds between health checks.
+        """
+        self.pool_size = pool_size or Settings.DATABASE_POOL_SIZE
+        self.pool_timeout = pool_timeout or Settings.DATABASE_POOL_TIMEOUT
+        self.health_check_interval = (
+            health_check_interval
+            if health_check_interval is not None
+            else Settings.DATABASE_HEALTH_CHECK_INTERVAL
+        )
+        self.bulk_chunk_size = Settings.DATABASE_BULK_CHUNK_SIZE
+        self._last_health_check = 0.0
+        self._lock = asyncio.Lock()
+        # Set on the transaction-bound copies made by transaction()
+        self.raise_errors = False
+
+        database_url = os.getenv("DATABASE_URL")
+        if database_url:
+            self.prisma = Prisma(
+                datasource={
+                    "url": get_pooled_database_url(
+                        database_url, self.pool_size, self.pool_timeout
+                    )
+                }
+            )
+        else:
+            self.prisma = Prisma()
 
     async def connect(self):
-        """Connect to the database."""
-        await self.prisma.connect()
-        logger.info("Connected to PostgreSQL database")
+        """Connect to the database (no-op if already connected)."""
+        async with self._lock:
+            if self.prisma.is_connected():
+                return
+            await self.prisma.connect()
+            self._last_health_check = time.monotonic()
+            logger.info(
+                f"Connected to PostgreSQL database (pool size {self.pool_size})"
+            )
 
     async def disconnect(self):
         """Disconnect from the database."""
-        await self.prisma.disconnect()
-        logger.info("Disconnected from PostgreSQL database")
+        async with self._lock:
+            if not self.prisma.is_connected():
+                return
+            await self.prisma.disconnect()
+            logger.info("Disconnected from PostgreSQL database")
+
+    async def health_check(self) -> bool:
+        """Check that the database answers a trivial query."""
+        try:
+            await self.prisma.query_raw("SELECT 1")
+            self._last_health_check = time.monotonic()
+            return True
+        except Exception as e:
+            logger.warning(f"Database health check failed: {e}")
+            return False
+
+    async def ensure_connected(self):
+        """
+        Connect if needed and, at most once per health check interval,
+        verify the connection and reconnect if it is no longer usable.
+        """
+        if not self.prisma.is_connected():
+            await self.connect()
+            return
+        if time.monotonic() - self._last_health_check < self.health_check_interval:
+            return
+        if await self.health_check():
+            return
+
+        logger.info("Reconnecting to PostgreSQL database")
+        async with self._lock:
+            try:
+                if self.prisma.is_connected():
+                    await self.prisma.disconnect()
+            except Exception as e:
+                logger.warning(f"Error closing stale database connection: {e}")
+        await self.connect()
+
+    @asynccontextmanager
+    async def transaction(self, timeout: float = 30):
+        """
+        Run writes in one interactive transaction.
+
+        Yields a copy of this service bound to the transaction. Its write
+        methods raise errors instead of logging them, so a failed write
+        rolls back the whole transaction and reaches the caller.
+        """
+        async with self.prisma.tx(timeout=timedelta(seconds=timeout)) as tx:
+            service = copy.copy(self)
+            service.prisma = tx
+            service.raise_errors = True
+            yield service
 
     # User Operations
+    @staticmethod
+    def _user_data(user_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Map a Slack user to User columns."""
+        # Extract profile data
+        profile = user_data.get("profile", {})
+
+        return {
+            "id": user_data["id"],
+            "name": user_data.get("name"),
+            "email": profile.get("email"),
+            "realName": profile.get("real_name"),
+            "displayName": profile.get("display_name"),
+            "realNameNormalized": profile.get("real_name_normalized"),
+            "displayNameNormalized": profile.get("display_name_normalized"),
+            "firstName": profile.get("first_name"),
+            "lastName": profile.get("last_name"),
+            "title": profile.get("title"),
+            "phone": profile.get("phone"),
+            "skype": profile.get("skype"),
+            "color": user_data.get("color"),
+            "avatarHash": profile.get("avatar_hash"),
+            "isBot": user_data.get("is_bot", False),
+            "isDeleted": user_data.get("deleted", False),
+            "isAppUser": user_data.get("is_app_user", False),
+            "isEmailConfirmed": user_data.get("is_email_confirmed", False),
+            "isAdmin": user_data.get("is_admin", False),
+            "isOwner": user_data.get("is_owner", False),
+            "isPrimaryOwner": user_data.get("is_primary_owner", False),
+            "isRestricted": user_data.get("is_restricted", False),
+            "isUltraRestricted": user_data.get("is_ultra_restricted", False),
+            "isCustomImage": profile.get("is_custom_image", False),
+            "alwaysActive": profile.get("always_active", False),
+            "whoCanShareContactCard": user_data.get("who_can_share_contact_card"),
+            "teamId": user_data.get("team_id"),
+            "timezone": user_data.get("tz"),
+            "timezoneLabel": user_data.get("tz_label"),
+            "timezoneOffset": user_data.get("tz_offset"),
+            "updated": (
+                datetime.fromtimestamp(user_data.get("updated", 0) / 1000)
+                if user_data.get("updated")
+                else None
+            ),
+            "image24": profile.get("image_24"),
+            "image32": profile.get("image_32"),
+            "image48": profile.get("image_48"),
+            "image72": profile.get("image_72"),
+            "image192": profile.get("image_192"),
+            "image512": profile.get("image_512"),
+            "image1024": profile.get("image_1024"),
+            "imageOriginal": profile.get("image_original"),
+            "statusText": profile.get("status_text"),
+            "statusTextCanonical": profile.get("status_text_canonical"),
+            "statusEmoji": profile.get("status_emoji"),
+            "statusExpiration": profile.get("status_expiration"),
+            "botId": profile.get("bot_id"),
+            "apiAppId": profile.get("api_app_id"),
+        }
+
     async def create_user(self, user_data: Dict[str, Any]) -> User:
         """Create or update a user."""
         try:
-            # Extract profile data
-            profile = user_data.get("profile", {})
-
-            data = {
-                "id": user_data["id"],
-                "name": user_data.get("name"),
-                "email": profile.get("email"),
-                "realName": profile.get("real_name"),
-                "displayName": profile.get("display_name"),
-                "realNameNormalized": profile.get("real_name_normalized"),
-                "displayNameNormalized": profile.get("display_name_normalized"),
-                "firstName": profile.get("first_name"),
-                "lastName": profile.get("last_name"),
-                "title": profile.get("title"),
-                "phone": profile.get("phone"),
-                "skype": profile.get("skype"),
-                "color": user_data.get("color"),
-                "avatarHash": profile.get("avatar_hash"),
-                "isBot": user_data.get("is_bot", False),
-                "isDeleted": user_data.get("deleted", False),
-                "isAppUser": user_data.get("is_app_user", False),
-                "isEmailConfirmed": user_data.get("is_email_confirmed", False),
-                "isAdmin": user_data.get("is_admin", False),
-                "isOwner": user_data.get("is_owner", False),
-                "isPrimaryOwner": user_data.get("is_primary_owner", False),
-                "isRestricted": user_data.get("is_restricted", False),
-                "isUltraRestricted": user_data.get("is_ultra_restricted", False),
-                "isCustomImage": profile.get("is_custom_image", False),
-                "alwaysActive": profile.get("always_active", False),
-                "whoCanShareContactCard": user_data.get("who_can_share_contact_card"),
-                "teamId": user_data.get("team_id"),
-                "timezone": user_data.get("tz"),
-                "timezoneLabel": user_data.get("tz_label"),
-                "timezoneOffset": user_data.get("tz_offset"),
-                "updated": (
-                    datetime.fromtimestamp(user_data.get("updated", 0) / 1000)
-                    if user_data.get("updated")
-                    else None
-                ),
-                "image24": profile.get("image_24"),
-                "image32": profile.get("image_32"),
-                "image48": profile.get("image_48"),
-                "image72": profile.get("image_72"),
-                "image192": profile.get("image_192"),
-                "image512": profile.get("image_512"),
-                "image1024": profile.get("image_1024"),
-                "imageOriginal": profile.get("image_original"),
-                "statusText": profile.get("status_text"),
-                "statusTextCanonical": profile.get("status_text_canonical"),
-                "statusEmoji": profile.get("status_emoji"),
-                "statusExpiration": profile.get("status_expiration"),
-                "botId": profile.get("bot_id"),
-                "apiAppId": profile.get("api_app_id"),
-            }
+            data = self._user_data(user_data)
 
             existing_user = await self.prisma.user.find_unique(
                 where={"id": user_data["id"]}
@@ -92,6 +209,8 @@ class DatabaseService:
             logger.info(f"User {user.id} created/updated successfully")
             return user
         except Exception as e:
+            if self.raise_errors:
+                raise
             logger.error(f"Error creating user {user_data.get('id')}: {e}")
 
     async def get_user(self, user_id: str) -> Optional[User]:
@@ -111,56 +230,61 @@ class DatabaseService:
             return []
 
     # Channel Operations
+    @staticmethod
+    def _channel_data(channel_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Map a Slack channel to Channel columns."""
+        # Extract purpose and topic data
+        purpose = channel_data.get("purpose", {})
+        topic = channel_data.get("topic", {})
+
+        created = (
+            datetime.fromtimestamp(channel_data.get("created"))
+            if channel_data.get("created")
+            else None
+        )
+        updated = (
+            datetime.fromtimestamp(channel_data.get("updated") / 1000)
+            if channel_data.get("updated")
+            else None
+        )
+
+        return {
+            "id": channel_data["id"],
+            "name": channel_data.get("name", ""),
+            "nameNormalized": channel_data.get("name_normalized"),
+            "created": created,
+            "updated": updated,
+            "creator": channel_data.get("creator"),
+            "isPrivate": channel_data.get("is_private", False),
+            "isArchived": channel_data.get("is_archived", False),
+            "isGeneral": channel_data.get("is_general", False),
+            "isMember": channel_data.get("is_member", False),
+            "isChannel": channel_data.get("is_channel", False),
+            "isGroup": channel_data.get("is_group", False),
+            "isIm": channel_data.get("is_im", False),
+            "isMpim": channel_data.get("is_mpim", False),
+            "isShared": channel_data.get("is_shared", False),
+            "isExtShared": channel_data.get("is_ext_shared", False),
+            "isOrgShared": channel_data.get("is_org_shared", False),
+            "isPendingExtShared": channel_data.get("is_pending_ext_shared", False),
+            "unlinked": channel_data.get("unlinked", 0),
+            "contextTeamId": channel_data.get("context_team_id"),
+            "sharedTeamIds": channel_data.get("shared_team_ids", []),
+            "pendingShared": channel_data.get("pending_shared", []),
+            "pendingConnectedTeamIds": channel_data.get(
+                "pending_connected_team_ids", []
+            ),
+            "parentConversation": channel_data.get("parent_conversation"),
+            "lastRead": channel_data.get("last_read"),
+            "topic": topic.get("value") if topic else None,
+            "purpose": purpose.get("value") if purpose else None,
+            "previousNames": channel_data.get("previous_names", []),
+        }
+
     async def create_channel(self, channel_data: Dict[str, Any]) -> Channel:
         """Create or update a channel."""
         try:
-            # Extract purpose and topic data
-            purpose = channel_data.get("purpose", {})
-            topic = channel_data.get("topic", {})
-
-            created = (
-                datetime.fromtimestamp(channel_data.get("created"))
-                if channel_data.get("created")
-                else None
-            )
-            updated = (
-                datetime.fromtimestamp(channel_data.get("updated") / 1000)
-                if channel_data.get("updated")
-                else None
-            )
-
-            data = {
-                "id": channel_data["id"],
-                "name": channel_data.get("name", ""),
-                "nameNormalized": channel_data.get("name_normalized"),
-                "created": created,
-                "updated": updated,
-                "creator": channel_data.get("creator"),
-                "isPrivate": channel_data.get("is_private", False),
-                "isArchived": channel_data.get("is_archived", False),
-                "isGeneral": channel_data.get("is_general", False),
-                "isMember": channel_data.get("is_member", False),
-                "isChannel": channel_data.get("is_channel", False),
-                "isGroup": channel_data.get("is_group", False),
-                "isIm": channel_data.get("is_im", False),
-                "isMpim": channel_data.get("is_mpim", False),
-                "isShared": channel_data.get("is_shared", False),
-                "isExtShared": channel_data.get("is_ext_shared", False),
-                "isOrgShared": channel_data.get("is_org_shared", False),
-                "isPendingExtShared": channel_data.get("is_pending_ext_shared", False),
-                "unlinked": channel_data.get("unlinked", 0),
-                "contextTeamId": channel_data.get("context_team_id"),
-                "sharedTeamIds": channel_data.get("shared_team_ids", []),
-                "pendingShared": channel_data.get("pending_shared", []),
-                "pendingConnectedTeamIds": channel_data.get(
-                    "pending_connected_team_ids", []
-                ),
-                "parentConversation": channel_data.get("parent_conversation"),
-                "lastRead": channel_data.get("last_read"),
-                "topic": topic.get("value") if topic else None,
-                "purpose": purpose.get("value") if purpose else None,
-                "previousNames": channel_data.get("previous_names", []),
-            }
+            data = self._channel_data(channel_data)
 
             existing_channel = await self.prisma.channel.find_unique(
                 where={"id": channel_data["id"]}
@@ -175,6 +299,8 @@ class DatabaseService:
             logger.info(f"Channel {channel.id} created/updated successfully")
             return "Channel created/updated successfully"
         except Exception as e:
+            if self.raise_errors:
+                raise
             logger.error(f"Error creating channel {channel_data.get('id')}: {e}")
 
     async def get_channel(self, channel_id: str) -> Optional[Channel]:
@@ -194,47 +320,54 @@ class DatabaseService:
             return []
 
     # Message Operations
+    @staticmethod
+    def _message_data(
+        message_data: Dict[str, Any], channel_id: Optional[str]
+    ) -> Dict[str, Any]:
+        """Map a Slack message to Message columns."""
+        # Convert timestamp to datetime
+        timestamp = datetime.fromtimestamp(float(message_data["ts"]))
+        return {
+            "id": message_data["ts"],
+            "clientMsgId": message_data.get("client_msg_id"),
+            "channelId": message_data.get("channel", channel_id),
+            "userId": message_data.get("user", ""),
+            "text": message_data.get("text"),
+            "timestamp": timestamp,
+            "type": message_data.get("type", "message"),
+            "subtype": message_data.get("subtype"),
+            "isEdited": bool(message_data.get("edited")),
+            "editedAt": (
+                message_data.get("edited", {}).get("ts")
+                if message_data.get("edited")
+                else None
+            ),
+            "editedBy": (
+                message_data.get("edited", {}).get("user")
+                if message_data.get("edited")
+                else None
+            ),
+            "threadTs": (
+                message_data.get("thread_ts")
+                if message_data.get("thread_ts", None) != message_data.get("ts")
+                else None
+            ),
+            "replyCount": message_data.get("reply_count", 0),
+            "replyUsersCount": message_data.get("reply_users_count", 0),
+            "isLocked": message_data.get("is_locked", False),
+            "subscribed": message_data.get("subscribed", False),
+            "botId": message_data.get("bot_id"),
+            "appId": message_data.get("app_id"),
+            "team": message_data.get("team"),
+            "isEmbed": False,
+        }
+
     async def create_message(
         self, message_data: Dict[str, Any], channel_id: str
     ) -> Message:
         """Create or update a message."""
         try:
-            # Convert timestamp to datetime
-            timestamp = datetime.fromtimestamp(float(message_data["ts"]))
-            data = {
-                "id": message_data["ts"],
-                "clientMsgId": message_data.get("client_msg_id"),
-                "channelId": message_data.get("channel", channel_id),
-                "userId": message_data.get("user", ""),
-                "text": message_data.get("text"),
-                "timestamp": timestamp,
-                "type": message_data.get("type", "message"),
-                "subtype": message_data.get("subtype"),
-                "isEdited": bool(message_data.get("edited")),
-                "editedAt": (
-                    message_data.get("edited", {}).get("ts")
-                    if message_data.get("edited")
-                    else None
-                ),
-                "editedBy": (
-                    message_data.get("edited", {}).get("user")
-                    if message_data.get("edited")
-                    else None
-                ),
-                "threadTs": (
-                    message_data.get("thread_ts")
-                    if message_data.get("thread_ts", None) != message_data.get("ts")
-                    else None
-                ),
-                "replyCount": message_data.get("reply_count", 0),
-                "replyUsersCount": message_data.get("reply_users_count", 0),
-                "isLocked": message_data.get("is_locked", False),
-                "subscribed": message_data.get("subscribed", False),
-                "botId": message_data.get("bot_id"),
-                "appId": message_data.get("app_id"),
-                "team": message_data.get("team"),
-                "isEmbed": False,
-            }
+            data = self._message_data(message_data, channel_id)
 
             existing_message = await self.prisma.message.find_unique(
                 where={"id": message_data["ts"]}
@@ -259,15 +392,20 @@ class DatabaseService:
             logger.info(f"Message {message.id} created/updated successfully")
             return message
         except Exception as e:
+            if self.raise_errors:
+                raise
             logger.error(f"Error creating message {message_data.get('ts')}: {e}")
 
     async def update_message(self, message_id: str, message_data: Dict[str, Any]):
         """Update a message."""
         try:
-            return await self.prisma.message.update(
+            # update_many, so updating an unknown message is a no-op
+            return await self.prisma.message.update_many(
                 where={"id": message_id}, data=message_data
             )
         except Exception as e:
+            if self.raise_errors:
+                raise
             logger.error(f"Error updating message {message_id}: {e}")
             return None
 
@@ -316,10 +454,13 @@ class DatabaseService:
     async def delete_message(self, message_id: str):
         """Delete a message."""
         try:
-            await self.prisma.message.update(
+            # update_many, so deleting an unknown message is a no-op
+            await self.prisma.message.update_many(
                 where={"id": message_id}, data={"isDeleted": True, "isEmbed": True}
             )
         except Exception as e:
+            if self.raise_errors:
+                raise
             logger.error(f"Error deleting message {message_id}: {e}")
 
     async def get_channel_messages(
@@ -366,44 +507,173 @@ class DatabaseService:
             return []
 
     # Bulk Operations
+    def _chunks(self, rows: List[Any]) -> Iterator[List[Any]]:
+        """Split rows into chunks of bulk_chunk_size."""
+        for start in range(0, len(rows), self.bulk_chunk_size):
+            yield rows[start : start + self.bulk_chunk_size]
+
+    async def existing_keys(
+        self, model: str, key: str, values: Iterable[Any]
+    ) -> Set[Any]:
+        """Return which of the values are stored as the key of a model."""
+        records = await getattr(self.prisma, model).find_many(
+            where={key: {"in": list(set(values))}}
+        )
+        return {getattr(record, key) for record in records}
+
+    async def _bulk_upsert(
+        self, model: str, key: str, rows: List[Dict[str, Any]]
+    ) -> None:
+        """
+        Insert or update rows of a model in three round trips.
+
+        Finds which keys exist, inserts the new rows with one create_many
+        and updates the existing ones in one batch (a single transaction).
+        If two rows share a key, the last one wins.
+        """
+        rows = list({row[key]: row for row in rows}.values())
+        actions = getattr(self.prisma, model)
+        existing = await self.existing_keys(model, key, [row[key] for row in rows])
+
+        new_rows = [row for row in rows if row[key] not in existing]
+        if new_rows:
+            await actions.create_many(data=new_rows, skip_duplicates=True)
+
+        updated_rows = [row for row in rows if row[key] in existing]
+        if updated_rows:
+            async with self.prisma.batch_() as batcher:
+                for row in updated_rows:
+                    getattr(batcher, model).update(where={key: row[key]}, data=row)
+
     async def bulk_create_users(self, users_data: List[Dict[str, Any]]) -> int:
         """Bulk create/update users."""
         created_count = 0
-        for user_data in users_data:
+        for chunk in self._chunks(users_data):
             try:
-                await self.create_user(user_data)
-                created_count += 1
+                await self._bulk_upsert(
+                    "user", "id", [self._user_data(user) for user in chunk]
+                )
+                created_count += len(chunk)
             except Exception as e:
-                logger.error(f"Error creating user {user_data.get('id')}: {e}")
+                if self.raise_errors:
+                    raise
+                logger.warning(
+                    f"Bulk upsert of {len(chunk)} users failed, "
+                    f"writing them one by one: {e}"
+                )
+                for user_data in chunk:
+                    if await self.create_user(user_data):
+                        created_count += 1
         logger.info(f"Created/updated {created_count} users")
         return created_count
 
     async def bulk_create_messages(
-        self, messages_data: List[Dict[str, Any]], channel_id: str
+        self, messages_data: List[Dict[str, Any]], channel_id: Optional[str] = None
     ) -> int:
-        """Bulk create/update messages."""
+        """
+        Bulk create/update messages with their reactions and files.
+
+        Messages are written oldest first, so thread parents are stored
+        before their replies.
+        """
+        messages_data = sorted(messages_data, key=lambda message: float(message["ts"]))
         created_count = 0
-        for message_data in messages_data:
+        for chunk in self._chunks(messages_data):
             try:
-                await self.create_message(message_data, channel_id)
-                created_count += 1
+                await self._bulk_upsert(
+                    "message",
+                    "id",
+                    [self._message_data(message, channel_id) for message in chunk],
+                )
             except Exception as e:
-                logger.error(f"Error creating message {message_data.get('ts')}: {e}")
+                if self.raise_errors:
+                    raise
+                logger.warning(
+                    f"Bulk upsert of {len(chunk)} messages failed, "
+                    f"writing them one by one: {e}"
+                )
+                for message_data in chunk:
+                    if await self.create_message(message_data, channel_id):
+                        created_count += 1
+                continue
+
+            created_count += len(chunk)
+            await self._bulk_create_reactions(chunk)
+            await self._bulk_create_files(chunk)
         logger.info(f"Created/updated {created_count} messages")
         return created_count
 
     async def bulk_create_channels(self, channels_data: List[Dict[str, Any]]) -> int:
         """Bulk create/update channels."""
         created_count = 0
-        for channel_data in channels_data:
+        for chunk in self._chunks(channels_data):
             try:
-                await self.create_channel(channel_data)
-                created_count += 1
+                await self._bulk_upsert(
+                    "channel",
+                    "id",
+                    [self._channel_data(channel) for channel in chunk],
+                )
+                created_count += len(chunk)
             except Exception as e:
-                logger.error(f"Error creating channel {channel_data.get('id')}: {e}")
+                if self.raise_errors:
+                    raise
+                logger.warning(
+                    f"Bulk upsert of {len(chunk)} channels failed, "
+                    f"writing them one by one: {e}"
+                )
+                for channel_data in chunk:
+                    if await self.create_channel(channel_data):
+                        created_count += 1
         logger.info(f"Created/updated {created_count} channels")
         return created_count
 
+    async def _bulk_create_reactions(self, messages_data: List[Dict[str, Any]]):
+        """Create the reactions of stored messages, skipping existing ones."""
+        rows = [
+            {"name": reaction["name"], "userId": user, "messageId": message["ts"]}
+            for message in messages_data
+            for reaction in message.get("reactions", [])
+            for user in reaction["users"]
+        ]
+        if not rows:
+            return
+        try:
+            await self.prisma.reaction.create_many(data=rows, skip_duplicates=True)
+        except Exception as e:
+            if self.raise_errors:
+                raise
+            logger.warning(
+                f"Bulk insert of {len(rows)} reactions failed, "
+                f"writing them message by message: {e}"
+            )
+            for message in messages_data:
+                if message.get("reactions"):
+                    await self._create_reactions(message["ts"], message["reactions"])
+
+    async def _bulk_create_files(self, messages_data: List[Dict[str, Any]]):
+        """Create or update the files of stored messages."""
+        rows = [
+            self._file_data(file_data, message["ts"], message.get("user", ""))
+            for message in messages_data
+            for file_data in message.get("files", [])
+        ]
+        if not rows:
+            return
+        try:
+            await self._bulk_upsert("file", "slackFileId", rows)
+        except Exception as e:
+            if self.raise_errors:
+                raise
+            logger.warning(
+                f"Bulk upsert of {len(rows)} files failed, "
+                f"writing them message by message: {e}"
+            )
+            for message in messages_data:
+                if message.get("files"):
+                    await self._create_files(
+                        message["ts"], message["files"], message.get("user", "")
+                    )
+
     # Helper Methods
     async def _create_reactions(
         self, message_id: str, reactions_data: List[Dict[str, Any]]
@@ -432,6 +702,8 @@ class DatabaseService:
                         await self.prisma.reaction.create(data=data)
 
         except Exception as e:
+            if self.raise_errors:
+                raise
             logger.error(f"Error creating reactions for message {message_id}: {e}")
 
     async def _delete_reactions(
@@ -441,82 +713,90 @@ class DatabaseService:
         try:
             for reaction_data in reactions_data:
                 for user in reaction_data["users"]:
-                    await self.prisma.reaction.delete(
+                    # delete_many, so removing an unknown reaction is a no-op
+                    await self.prisma.reaction.delete_many(
                         where={
-                            "messageId_userId_name": {
-                                "messageId": message_id,
-                                "userId": user,
-                                "name": reaction_data["name"],
-                            }
+                            "messageId": message_id,
+                            "userId": user,
+                            "name": reaction_data["name"],
                         }
                     )
 
         except Exception as e:
+            if self.raise_errors:
+                raise
             logger.error(f"Error deleting reactions for message {message_id}: {e}")
 
+    @staticmethod
+    def _file_data(
+        file_data: Dict[str, Any], message_id: str, user_id: str
+    ) -> Dict[str, Any]:
+        """Map a Slack file to File columns."""
+        return {
+            "slackFileId": file_data["id"],
+            "name": file_data.get("name", ""),
+            "title": file_data.get("title"),
+            "mimetype": file_data.get("mimetype"),
+            "filetype": file_data.get("filetype"),
+            "prettyType": file_data.get("pretty_type"),
+            "size": file_data.get("size"),
+            "mode": file_data.get("mode"),
+            "isExternal": file_data.get("is_external", False),
+            "externalType": file_data.get("external_type"),
+            "isPublic": file_data.get("is_public", False),
+            "publicUrlShared": file_data.get("public_url_shared", False),
+            "displayAsBot": file_data.get("display_as_bot", False),
+            "username": file_data.get("username"),
+            "urlPrivate": file_data.get("url_private"),
+            "urlPrivateDownload": file_data.get("url_private_download"),
+            "permalink": file_data.get("permalink"),
+            "permalinkPublic": file_data.get("permalink_public"),
+            "editLink": file_data.get("edit_link"),
+            "preview": file_data.get("preview"),
+            "previewHighlight": file_data.get("preview_highlight"),
+            "lines": file_data.get("lines"),
+            "linesMore": file_data.get("lines_more"),
+            "previewIsTruncated": file_data.get("preview_is_truncated", False),
+            "isStarred": file_data.get("is_starred", False),
+            "skippedShares": file_data.get("skipped_shares", False),
+            "hasRichPreview": file_data.get("has_rich_preview", False),
+            "fileAccess": file_data.get("file_access"),
+            "thumb64": file_data.get("thumb_64"),
+            "thumb80": file_data.get("thumb_80"),
+            "thumb360": file_data.get("thumb_360"),
+            "thumb360W": file_data.get("thumb_360_w"),
+            "thumb360H": file_data.get("thumb_360_h"),
+            "thumb480": file_data.get("thumb_480"),
+            "thumb480W": file_data.get("thumb_480_w"),
+            "thumb480H": file_data.get("thumb_480_h"),
+            "thumb160": file_data.get("thumb_160"),
+            "thumb720": file_data.get("thumb_720"),
+            "thumb720W": file_data.get("thumb_720_w"),
+            "thumb720H": file_data.get("thumb_720_h"),
+            "thumb800": file_data.get("thumb_800"),
+            "thumb800W": file_data.get("thumb_800_w"),
+            "thumb800H": file_data.get("thumb_800_h"),
+            "thumb960": file_data.get("thumb_960"),
+            "thumb960W": file_data.get("thumb_960_w"),
+            "thumb960H": file_data.get("thumb_960_h"),
+            "thumb1024": file_data.get("thumb_1024"),
+            "thumb1024W": file_data.get("thumb_1024_w"),
+            "thumb1024H": file_data.get("thumb_1024_h"),
+            "thumbTiny": file_data.get("thumb_tiny"),
+            "originalW": file_data.get("original_w"),
+            "originalH": file_data.get("original_h"),
+            "messageId": message_id,
+            "userId": user_id,
+            "userTeam": file_data.get("user_team"),
+        }
+
     async def _create_files(
         self, message_id: str, files_data: List[Dict[str, Any]], user_id: str
     ):
         """Create files for a message."""
         try:
             for file_data in files_data:
-                data = {
-                    "slackFileId": file_data["id"],
-                    "name": file_data.get("name", ""),
-                    "title": file_data.get("title"),
-                    "mimetype": file_data.get("mimetype"),
-                    "filetype": file_data.get("filetype"),
-                    "prettyType": file_data.get("pretty_type"),
-                    "size": file_data.get("size"),
-                    "mode": file_data.get("mode"),
-                    "isExternal": file_data.get("is_external", False),
-                    "externalType": file_data.get("external_type"),
-                    "isPublic": file_data.get("is_public", False),
-                    "publicUrlShared": file_data.get("public_url_shared", False),
-                    "displayAsBot": file_data.get("display_as_bot", False),
-                    "username": file_data.get("username"),
-                    "urlPrivate": file_data.get("url_private"),
-                    "urlPrivateDownload": file_data.get("url_private_download"),
-                    "permalink": file_data.get("permalink"),
-                    "permalinkPublic": file_data.get("permalink_public"),
-                    "editLink": file_data.get("edit_link"),
-                    "preview": file_data.get("preview"),
-                    "previewHighlight": file_data.get("preview_highlight"),
-                    "lines": file_data.get("lines"),
-                    "linesMore": file_data.get("lines_more"),
-                    "previewIsTruncated": file_data.get("preview_is_truncated", False),
-                    "isStarred": file_data.get("is_starred", False),
-                    "skippedShares": file_data.get("skipped_shares", False),
-                    "hasRichPreview": file_data.get("has_rich_preview", False),
-                    "fileAccess": file_data.get("file_access"),
-                    "thumb64": file_data.get("thumb_64"),
-                    "thumb80": file_data.get("thumb_80"),
-                    "thumb360": file_data.get("thumb_360"),
-                    "thumb360W": file_data.get("thumb_360_w"),
-                    "thumb360H": file_data.get("thumb_360_h"),
-                    "thumb480": file_data.get("thumb_480"),
-                    "thumb480W": file_data.get("thumb_480_w"),
-                    "thumb480H": file_data.get("thumb_480_h"),
-                    "thumb160": file_data.get("thumb_160"),
-                    "thumb720": file_data.get("thumb_720"),
-                    "thumb720W": file_data.get("thumb_720_w"),
-                    "thumb720H": file_data.get("thumb_720_h"),
-                    "thumb800": file_data.get("thumb_800"),
-                    "thumb800W": file_data.get("thumb_800_w"),
-                    "thumb800H": file_data.get("thumb_800_h"),
-                    "thumb960": file_data.get("thumb_960"),
-                    "thumb960W": file_data.get("thumb_960_w"),
-                    "thumb960H": file_data.get("thumb_960_h"),
-                    "thumb1024": file_data.get("thumb_1024"),
-                    "thumb1024W": file_data.get("thumb_1024_w"),
-                    "thumb1024H": file_data.get("thumb_1024_h"),
-                    "thumbTiny": file_data.get("thumb_tiny"),
-                    "originalW": file_data.get("original_w"),
-                    "originalH": file_data.get("original_h"),
-                    "messageId": message_id,
-                    "userId": user_id,
-                    "userTeam": file_data.get("user_team"),
-                }
+                data = self._file_data(file_data, message_id, user_id)
                 existing_file = await self.prisma.file.find_unique(
                     where={"slackFileId": file_data["id"]}
                 )
@@ -527,8 +807,42 @@ class DatabaseService:
                 else:
                     await self.prisma.file.create(data=data)
         except Exception as e:
+            if self.raise_errors:
+                raise
             logger.error(f"Error creating files for message {message_id}: {e}")
 
+    # Sync State Operations
+    async def get_channel_sync_state(
+        self, channel_id: str
+    ) -> Optional[ChannelSyncState]:
+        """Get the incremental sync state of a channel."""
+        try:
+            return await self.prisma.channelsyncstate.find_unique(
+                where={"channelId": channel_id}
+            )
+        except Exception as e:
+            logger.error(f"Error getting sync state of channel {channel_id}: {e}")
+            return None
+
+    async def save_channel_sync_state(
+        self, channel_id: str, latest_ts: Optional[str], threads: Dict[str, str]
+    ):
+        """Save the incremental sync state of a channel."""
+        try:
+            data = {
+                "latestTs": latest_ts,
+                "threads": Json(threads),
+                "lastSyncedAt": datetime.now(),
+            }
+            await self.prisma.channelsyncstate.upsert(
+                where={"channelId": channel_id},
+                data={"create": {"channelId": channel_id, **data}, "update": data},
+            )
+        except Exception as e:
+            if self.raise_errors:
+                raise
+            logger.error(f"Error saving sync state of channel {channel_id}: {e}")
+
     # Search and Filter Operations
     async def search_messages(
         self, query: str, channel_id: Optional[str] = None
@@ -571,3 +885,29 @@ class DatabaseService:
         except Exception as e:
             logger.error(f"Error getting distinct channel IDs: {e}")
             return []
+
+
+# Shared service for the socket mode event handlers. Prisma clients are bound
+# to the event loop they were connected on, so it is created lazily on the
+# event handlers' loop and must be closed on that loop as well.
+_shared_service: Optional[DatabaseService] = None
+_shared_lock = asyncio.Lock()
+
+
+async def get_database_service() -> DatabaseService:
+    """Return the shared, connected database service."""
+    global _shared_service
+    async with _shared_lock:
+        if _shared_service is None:
+            _shared_service = DatabaseService()
+        await _shared_service.ensure_connected()
+        return _shared_service
+
+
+async def close_database_service():
+    """Disconnect the shared database service, if it was created."""
+    global _shared_service
+    if _shared_service is None:
+        return
+    service, _shared_service = _shared_service, None
+    await service.disconnect()
@@ -1,9 +1,13 @@
 from .common import handle_errors, logger, get_message_url
 from .slack_database_service import SlackDatabaseService
 from .event_handler import handle_event
+from .event_queue import EventIngestionQueue, get_event_queue, close_event_queue
 
 __all__ = [
     "handle_event",
+    "EventIngestionQueue",
+    "get_event_queue",
+    "close_event_queue",
     "handle_errors",
     "SlackDatabaseService",
     "logger",
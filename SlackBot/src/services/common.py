@@ -1,4 +1,5 @@
 from functools import wraps
+import inspect
 import logging
 import sys
 
@@ -14,6 +15,7 @@ logger.addHandler(console_handler)
 def handle_errors(default_return=None, log_prefix=""):
     """
     Decorator to handle common error patterns in Slack API calls.
+    Works on both plain and async functions.
 
     Args:
         default_return: Value to return on error
@@ -21,6 +23,18 @@ def handle_errors(default_return=None, log_prefix=""):
     """
 
     def decorator(func):
+        if inspect.iscoroutinefunction(func):
+
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                try:
+                    return await func(*args, **kwargs)
+                except Exception as e:
+                    logger.error(f"{log_prefix}Error in {func.__name__}: {e}")
+                    return default_return
+
+            return async_wrapper
+
         @wraps(func)
         def wrapper(*args, **kwargs):
             try:
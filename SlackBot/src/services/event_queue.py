@@ -0,0 +1,293 @@
+import asyncio
+from typing import Any, Dict, Optional, Tuple, TYPE_CHECKING
+
+from config.settings import Settings
+from src.database import DatabaseService, get_database_service
+from src.services.common import logger
+
+if TYPE_CHECKING:
+    from src.bot import SlackBot
+
+# Reaction key: (message ts, user ID, reaction name)
+ReactionKey = Tuple[str, str, str]
+
+USER_EVENTS = (
+    "team_join",
+    "user_change",
+    "member_joined_channel",
+    "member_left_channel",
+)
+
+
+class EventBatch:
+    """Database writes of a window of Slack events, coalesced."""
+
+    def __init__(self):
+        self.event_count = 0
+        self.users: Dict[str, Dict[str, Any]] = {}
+        # Channels whose info is fetched from Slack before the batch is written
+        self.channels: Dict[str, "SlackBot"] = {}
+        self.messages: Dict[str, Tuple[Dict[str, Any], str]] = {}
+        self.edits: Dict[str, Dict[str, Any]] = {}
+        self.deletes: Dict[str, None] = {}
+        # True for a reaction to add, False for one to remove
+        self.reactions: Dict[ReactionKey, bool] = {}
+
+    def add(self, event: Dict[str, Any], slack_bot: "SlackBot") -> None:
+        """Fold one event into the batch."""
+        self.event_count += 1
+        event_type = event.get("type")
+
+        if event_type == "message":
+            self._add_message(event, slack_bot)
+
+        elif event_type in ("reaction_added", "reaction_removed"):
+            key = (
+                event.get("item").get("ts"),
+                event.get("user"),
+                event.get("reaction"),
+            )
+            added = event_type == "reaction_added"
+            # An add followed by a remove (or the reverse) cancels out
+            if self.reactions.get(key, added) != added:
+                del self.reactions[key]
+            else:
+                self.reactions[key] = added
+
+        elif event_type in USER_EVENTS:
+            user = event.get("user")
+            if isinstance(user, dict):
+                self.users[user["id"]] = user
+            else:
+                logger.debug(f"Ignoring {event_type} event without a user profile")
+
+        else:
+            logger.debug(f"Unhandled event: {event_type}")
+
+    def _add_message(self, event: Dict[str, Any], slack_bot: "SlackBot") -> None:
+        if event.get("channel_type") in ("im", "mpim"):
+            if event.get("channel_type") == "im":
+                channel = event.get("channel")
+            else:
+                channel = event.get("channel_id")
+            self.channels[channel] = slack_bot
+            self.messages[event.get("ts")] = (event, channel)
+            logger.info(
+                f"[{channel}] {event.get('user')}: {event.get('text')} "
+                f"({event.get('ts')})"
+            )
+
+        elif "subtype" not in event:
+            channel = event.get("channel")
+            self.messages[event.get("ts")] = (event, channel)
+            logger.info(
+                f"[{channel}] {event.get('user')}: {event.get('text')} "
+                f"({event.get('ts')})"
+            )
+
+        elif event.get("subtype") == "message_deleted":
+            ts = event.get("previous_message").get("ts")
+            self.deletes[ts] = None
+            logger.info(f"Message deleted: {ts}")
+
+        elif event.get("subtype") == "message_changed":
+            message = event.get("message")
+            # Every edit carries the full text, so the latest one wins
+            self.edits[message.get("ts")] = {
+                "isEdited": True,
+                "editedAt": message.get("edited", {}).get("ts", None),
+                "editedBy": message.get("edited", {}).get("user", None),
+                "text": message.get("text"),
+                "isEmbed": False,
+            }
+            logger.info(f"Message changed: {message.get('ts')}")
+
+    async def fetch_channels(self) -> Dict[str, Dict[str, Any]]:
+        """Fetch the info of the batch's DM channels from Slack."""
+        channel_data = {}
+        for channel, slack_bot in self.channels.items():
+            data = await slack_bot.get_channel_info(channel)
+            if data:
+                channel_data[channel] = data
+        return channel_data
+
+    async def write(
+        self, database_service: DatabaseService, channel_data: Dict[str, Any]
+    ) -> None:
+        """Write the batch; users and channels first for the foreign keys."""
+        for user in self.users.values():
+            await database_service.create_user(user)
+        for channel in channel_data.values():
+            await database_service.create_channel(channel)
+        for event, channel in self.messages.values():
+            await database_service.create_message(event, channel)
+        for ts, message_data in self.edits.items():
+            await database_service.update_message(ts, message_data)
+        for ts in self.deletes:
+            await database_service.delete_message(ts)
+
+        # Reactions to messages or by users that are not stored would fail
+        # their foreign keys and roll back the whole batch, so skip them
+        new_reactions = [key for key, added in self.reactions.items() if added]
+        stored_messages, stored_users = set(), set()
+        if new_reactions:
+            stored_messages = await database_service.existing_keys(
+                "message", "id", [ts for ts, _, _ in new_reactions]
+            )
+            stored_users = await database_service.existing_keys(
+                "user", "id", [user for _, user, _ in new_reactions]
+            )
+        for (ts, user, name), added in self.reactions.items():
+            if added and (ts not in stored_messages or user not in stored_users):
+                logger.debug(f"Skipping reaction {name} of {user} to {ts}: not stored")
+                continue
+            reactions_data = [{"name": name, "users": [user], "messageId": ts}]
+            if added:
+                await database_service._create_reactions(ts, reactions_data)
+            else:
+                await database_service._delete_reactions(ts, reactions_data)
+
+    def __len__(self) -> int:
+        return (
+            len(self.users)
+            + len(self.channels)
+            + len(self.messages)
+            + len(self.edits)
+            + len(self.deletes)
+            + len(self.reactions)
+        )
+
+
+class EventIngestionQueue:
+    """
+    Write-behind queue between the Slack event handlers and the database.
+
+    Handlers only enqueue events, so they return at once. A worker task
+    collects events for up to flush_interval seconds (or max_batch_size
+    events), coalesces them into an EventBatch and writes the batch in one
+    transaction. If the transaction fails, the batch is written again
+    without one so that a single bad write only loses itself.
+    """
+
+    def __init__(
+        self,
+        flush_interval: Optional[float] = None,
+        max_batch_size: Optional[int] = None,
+        max_queue_size: Optional[int] = None,
+    ):
+        self.flush_interval = (
+            flush_interval
+            if flush_interval is not None
+            else Settings.EVENT_FLUSH_INTERVAL
+        )
+        self.max_batch_size = max_batch_size or Settings.EVENT_BATCH_SIZE
+        self._queue: asyncio.Queue = asyncio.Queue(
+            max_queue_size or Settings.EVENT_QUEUE_SIZE
+        )
+        self._worker: Optional[asyncio.Task] = None
+        self._closing = False
+
+    def start(self) -> "EventIngestionQueue":
+        """Start the worker task on the running event loop."""
+        if self._worker is None:
+            self._worker = asyncio.create_task(self._run())
+            self._worker.add_done_callback(self._on_worker_done)
+        return self
+
+    def _on_worker_done(self, worker: asyncio.Task) -> None:
+        """Log a worker that died and start a new one, so events keep flowing."""
+        if worker.cancelled() or worker.exception() is None:
+            return
+        logger.error(f"Event queue worker died: {worker.exception()!r}")
+        if worker is self._worker and not self._closing:
+            self._worker = None
+            self.start()
+            logger.info("Event queue worker restarted")
+
+    async def put(self, event: Dict[str, Any], slack_bot: "SlackBot") -> None:
+        """Enqueue an event; waits only while the queue is full."""
+        await self._queue.put((event, slack_bot))
+
+    async def close(self) -> None:
+        """Write every queued event and stop the worker."""
+        if self._worker is None:
+            return
+        self._closing = True
+        await self._queue.put(None)
+        await self._worker
+        self._worker = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            item = await self._queue.get()
+            if item is None:
+                break
+
+            batch = EventBatch()
+            self._add(batch, item)
+            deadline = loop.time() + self.flush_interval
+            while batch.event_count < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                self._add(batch, item)
+
+            try:
+                await self._flush(batch)
+            except Exception as e:
+                logger.error(f"Error writing {batch.event_count} events: {e}")
+
+    @staticmethod
+    def _add(batch: EventBatch, item: Tuple[Dict[str, Any], "SlackBot"]) -> None:
+        """Add an event to the batch, dropping it if it is malformed."""
+        try:
+            batch.add(*item)
+        except Exception as e:
+            event = item[0]
+            logger.error(f"Dropping malformed {event.get('type')} event: {e}")
+
+    async def _flush(self, batch: EventBatch) -> None:
+        if not len(batch):
+            return
+        database_service = await get_database_service()
+        channel_data = await batch.fetch_channels()
+        try:
+            async with database_service.transaction() as transaction:
+                await batch.write(transaction, channel_data)
+        except Exception as e:
+            logger.warning(
+                f"Batched write of {batch.event_count} events failed, "
+                f"writing them one by one: {e}"
+            )
+            await batch.write(database_service, channel_data)
+        logger.debug(f"Wrote {len(batch)} changes from {batch.event_count} events")
+
+
+# Shared queue of the socket mode event handlers, created on their loop
+_event_queue: Optional[EventIngestionQueue] = None
+
+
+def get_event_queue() -> EventIngestionQueue:
+    """Return the shared event queue, starting it on first use."""
+    global _event_queue
+    if _event_queue is None:
+        _event_queue = EventIngestionQueue().start()
+    return _event_queue
+
+
+async def close_event_queue() -> None:
+    """Write the queued events and stop the shared event queue."""
+    global _event_queue
+    if _event_queue is None:
+        return
+    queue, _event_queue = _event_queue, None
+    await queue.close()
@@ -1,5 +1,8 @@
+import time
+import asyncio
 from typing import List, Dict, Any, Optional, TYPE_CHECKING, Tuple
 
+from config.settings import Settings
 from src.services import logger
 import json
 
@@ -23,48 +26,129 @@ class SlackDatabaseService:
     async def sync_all_users(self):
         """Sync all users into the database."""
         try:
-            users_data = self.slack_bot.get_all_users()
+            users_data = await self.slack_bot.get_all_users()
             await self.db_service.bulk_create_users(users_data)
         except Exception as e:
             logger.error(f"Error syncing all users: {e}")
 
-    async def sync_all_data(self) -> Dict[str, int]:
-        """Sync all Slack data to database."""
+    async def sync_all_data(
+        self, max_concurrency: Optional[int] = None, full: bool = False
+    ) -> Dict[str, int]:
+        """
+        Sync all Slack data to database.
+
+        Up to max_concurrency channels (SYNC_CHANNEL_CONCURRENCY by default)
+        are synced at once; their Slack calls share the bot's request
+        scheduler. Channels are synced incrementally
+        unless full is set. Returns the number of messages stored per
+        channel ID.
+        """
         try:
-            channels = self.slack_bot.get_all_channels()
-            for channel in channels:
-                channel_id = channel.get("id")
-                logger.info(f"Starting data sync for channel {channel_id}")
-
-                # Set channel for bot
-                self.slack_bot.set_channel_id(channel_id)
-
-                # Get channel info
-                logger.info("Fetching channel info...")
-                channel_data = self.slack_bot.get_channel_info()
-                channel_create_result = await self.db_service.create_channel(
-                    channel_data
-                )
-
-                logger.info(f"Created channel: {channel_create_result}")
-
-                # Get all messages
-                logger.info("Fetching all messages...")
-                messages_data = self.slack_bot.get_all_history()
-
-                logger.info(f"Sync completed for channel {channel_id}")
+            channels = await self.slack_bot.get_all_channels()
+            semaphore = asyncio.Semaphore(
+                max_concurrency or Settings.SYNC_CHANNEL_CONCURRENCY
+            )
+
+            async def sync(channel_id: str) -> int:
+                async with semaphore:
+                    return await self.sync_channel(channel_id, full)
+
+            channel_ids = [channel.get("id") for channel in channels]
+            counts = await asyncio.gather(
+                *(sync(channel_id) for channel_id in channel_ids)
+            )
+            logger.info(
+                f"Synced {sum(counts)} messages from {len(channel_ids)} channels"
+            )
+            return dict(zip(channel_ids, counts))
 
         except Exception as e:
             logger.error(f"Error syncing data: {e}")
+            return {}
+
+    async def sync_channel(self, channel_id: str, full: bool = False) -> int:
+        """
+        Sync a channel and its history, storing each page as it arrives.
+
+        Uses no shared channel state, so channels can be synced concurrently.
+        After a first full sync, only messages newer than the channel's
+        high-water mark are fetched, plus the last SYNC_THREAD_LOOKBACK_DAYS
+        days of top-level messages to find threads with new replies; the
+        replies of a thread are fetched again only if its latest_reply
+        changed. The sync state is saved once the whole channel is stored;
+        if any message failed to store, it is kept as it was, so the next
+        sync fetches the failed messages again.
+        """
+        try:
+            logger.info(f"Starting data sync for channel {channel_id}")
+            channel_data = await self.slack_bot.get_channel_info(channel_id)
+            await self.db_service.create_channel(channel_data)
+
+            lookback_start = time.time() - Settings.SYNC_THREAD_LOOKBACK_DAYS * 86400
+            state = None
+            if not full:
+                state = await self.db_service.get_channel_sync_state(channel_id)
+
+            oldest = None
+            latest_ts = None
+            known_threads = {}
+            if state and state.latestTs:
+                latest_ts = state.latestTs
+                oldest = f"{min(float(latest_ts), lookback_start):.6f}"
+                known_threads = dict(state.threads or {})
+                logger.info(f"Syncing channel {channel_id} after {oldest}")
+
+            messages_count = 0
+            failed_count = 0
+            threads = {}
+            async for page in self.slack_bot.iter_history_pages(
+                channel_id, oldest=oldest, known_threads=known_threads
+            ):
+                stored_count = await self.db_service.bulk_create_messages(
+                    page, channel_id
+                )
+                messages_count += stored_count
+                failed_count += len(page) - stored_count
+
+                for message in page:
+                    thread_ts = message.get("thread_ts")
+                    if thread_ts and thread_ts != message["ts"]:
+                        continue  # Replies do not move the high-water mark
+                    if latest_ts is None or float(message["ts"]) > float(latest_ts):
+                        latest_ts = message["ts"]
+                    # Only threads inside the lookback window are checked again
+                    if thread_ts and float(thread_ts) >= lookback_start:
+                        threads[thread_ts] = message.get("latest_reply")
+
+            if failed_count:
+                logger.warning(
+                    f"{failed_count} messages of channel {channel_id} were not "
+                    f"stored, keeping its previous sync state"
+                )
+            else:
+                await self.db_service.save_channel_sync_state(
+                    channel_id, latest_ts, threads
+                )
+
+            logger.info(
+                f"Sync completed for channel {channel_id}: {messages_count} messages"
+            )
+            return messages_count
+        except Exception as e:
+            logger.error(f"Error syncing channel {channel_id}: {e}")
+            return 0
 
     async def sync_channel_messages(self, channel_id: str) -> int:
         """Sync messages from a specific channel."""
         try:
             logger.info(f"Syncing messages from channel {channel_id}")
-            self.slack_bot.set_channel_id(channel_id)
 
-            messages_data = self.slack_bot.get_all_history()
-            messages_count = await self.db_service.bulk_create_messages(messages_data)
+            # Store each page as soon as it is fetched
+            messages_count = 0
+            async for page in self.slack_bot.iter_history_pages(channel_id):
+                messages_count += await self.db_service.bulk_create_messages(
+                    page, channel_id
+                )
 
             logger.info(f"Synced {messages_count} messages from channel {channel_id}")
             return messages_count
@@ -76,7 +160,9 @@ class SlackDatabaseService:
         try:
             logger.info(f"Syncing thread messages {thread_ts}")
 
-            thread_messages = self.slack_bot.get_thread_by_root_message(thread_ts)
+            thread_messages = await self.slack_bot.get_thread_by_root_message(
+                thread_ts
+            )
             messages_count = await self.db_service.bulk_create_messages(thread_messages)
 
             logger.info(f"Synced {messages_count} thread messages")
@@ -89,7 +175,7 @@ class SlackDatabaseService:
         try:
             logger.info("Syncing all users...")
 
-            users_data = self.slack_bot.get_all_users()
+            users_data = await self.slack_bot.get_all_users()
             users_count = await self.db_service.bulk_create_users(users_data)
 
             logger.info(f"Synced {users_count} users")
@@ -333,18 +419,10 @@ class SlackDatabaseService:
     async def get_direct_messages(self) -> Tuple[int, int]:
         """Get direct messages from database."""
         try:
-            dm_channels = self.slack_bot.get_direct_channels()
+            dm_channels = await self.slack_bot.get_direct_channels()
             msg_count = 0
             for channel in dm_channels:
-                self.slack_bot.set_channel_id(channel.get("id"))
-                channel_data = self.slack_bot.get_channel_info()
-                await self.db_service.create_channel(channel_data)
-                history = self.slack_bot.get_all_history()
-
-                result = await self.db_service.bulk_create_messages(
-                    history, channel_data.get("id")
-                )
-                msg_count += result
+                msg_count += await self.sync_channel(channel.get("id"))
             return len(dm_channels), msg_count
 
         except Exception as e: